@@ -13,8 +13,13 @@
 
 __all__ = ['__version__']
 
+import time
+
 import pbr.version
 
+# The earliest time we can observe, for the --timing-report breakdown
+START_TIME = time.time()
+
 version_info = pbr.version.VersionInfo('python-openstackclient')
 try:
     __version__ = version_info.version_string()
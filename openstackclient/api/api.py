@@ -13,15 +13,34 @@
 
 """Base API Library"""
 
-import simplejson as json
+import threading
 
 from keystoneauth1 import exceptions as ks_exceptions
 from keystoneauth1 import session as ks_session
 from osc_lib import exceptions
+import simplejson as json
 
+from openstackclient.common import transport
 from openstackclient.i18n import _
 
 
+_default_session = None
+_default_session_lock = threading.Lock()
+
+
+def _get_default_session():
+    """Return the session used by APIs created without one
+
+    It is created once so its connections are reused across calls.
+    """
+    global _default_session
+    with _default_session_lock:
+        if _default_session is None:
+            _default_session = ks_session.Session()
+            transport.configure_session(_default_session)
+    return _default_session
+
+
 class KeystoneSession(object):
     """Wrapper for the Keystone Session
 
@@ -72,7 +91,7 @@ class KeystoneSession(object):
         if not session:
             session = self.session
         if not session:
-            session = ks_session.Session()
+            session = _get_default_session()
 
         if self.endpoint:
             if url:
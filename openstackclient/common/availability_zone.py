@@ -21,6 +21,7 @@ from osc_lib.command import command
 from osc_lib import utils
 import six
 
+from openstackclient.common import cache
 from openstackclient.i18n import _
 
 
@@ -119,6 +120,18 @@ class ListAvailabilityZone(command.Lister):
         return parser
 
     def _get_compute_availability_zones(self, parsed_args):
+        if not parsed_args.long:
+            # The zones change rarely, unlike the service states shown
+            # with --long, so only the short list is cached
+            return cache.get_or_fetch(
+                self.app.client_manager.resource_cache,
+                'availability_zone',
+                'compute',
+                lambda: self._list_compute_availability_zones(parsed_args),
+            )
+        return self._list_compute_availability_zones(parsed_args)
+
+    def _list_compute_availability_zones(self, parsed_args):
         compute_client = self.app.client_manager.compute
         try:
             data = compute_client.availability_zones.list()
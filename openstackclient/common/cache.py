@@ -0,0 +1,189 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""On-disk cache of resources that rarely change"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+
+from osc_lib import utils
+
+
+LOG = logging.getLogger(__name__)
+
+
+class ResourceCache(object):
+    """Keep near-static resources on disk between invocations
+
+    Entries are stored in one JSON file per resource type, in a directory
+    per cloud, region and project.  They expire after the number of seconds
+    set for their resource type in the ``cache: expiration:`` section of
+    ``clouds.yaml``; resource types without an expiration are not cached.
+
+    :param path: the cache directory
+    :param scope: a tuple identifying the cloud, region and project
+    :param expiration: a dict of resource type to seconds
+    """
+
+    def __init__(self, path, scope, expiration):
+        self.scope = tuple(scope)
+        digest = hashlib.sha256(
+            json.dumps(list(self.scope)).encode('utf-8')).hexdigest()
+        self.path = os.path.join(path, 'openstackclient', digest)
+        self.expiration = dict(
+            (resource, float(seconds))
+            for resource, seconds in expiration.items()
+        )
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def enabled(self, resource):
+        return self.expiration.get(resource, 0) > 0
+
+    def _file(self, resource):
+        return os.path.join(self.path, '%s.json' % resource)
+
+    def _load(self, resource):
+        if resource not in self._entries:
+            try:
+                with open(self._file(resource)) as f:
+                    self._entries[resource] = json.load(f)
+            except (IOError, OSError, ValueError):
+                self._entries[resource] = {}
+        return self._entries[resource]
+
+    def _save(self, resource, entries):
+        try:
+            if not os.path.isdir(self.path):
+                os.makedirs(self.path, 0o700)
+            # Replace the file in one step so a concurrent invocation
+            # never reads a partial file
+            fd, tmp = tempfile.mkstemp(dir=self.path)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(entries, f)
+            os.rename(tmp, self._file(resource))
+        except (IOError, OSError) as e:
+            LOG.debug("Unable to write the %s cache: %s", resource, e)
+
+    def get(self, resource, key):
+        """Return the cached data, None if missing or expired"""
+        if not self.enabled(resource):
+            return None
+        with self._lock:
+            entry = self._load(resource).get(key)
+        if entry and time.time() - entry['time'] < self.expiration[resource]:
+            return entry['data']
+        return None
+
+    def set(self, resource, keys, data):
+        """Cache JSON serializable data under one or more keys"""
+        if not self.enabled(resource):
+            return
+        now = time.time()
+        with self._lock:
+            entries = self._load(resource)
+            for key in list(entries):
+                if now - entries[key]['time'] >= self.expiration[resource]:
+                    del entries[key]
+            for key in keys:
+                entries[key] = {'time': now, 'data': data}
+            self._save(resource, entries)
+
+
+class CachedResource(dict):
+    """A cached resource of a manager without a resource class"""
+
+    def __getattr__(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+def _to_info(res):
+    info = getattr(res, '_info', None)
+    if info is None:
+        # Image API v2 resources are dicts
+        info = dict(res)
+    return info
+
+
+def _from_info(manager, info):
+    resource_class = getattr(manager, 'resource_class', None)
+    if resource_class is not None:
+        return resource_class(manager, info, loaded=True)
+    return CachedResource(info)
+
+
+def get_or_fetch(resource_cache, resource, key, fetch_f):
+    """Return cached JSON serializable data, or fetch and cache it
+
+    :param resource_cache: a ResourceCache or None
+    :param resource: the resource type, which sets the expiration
+    :param key: the key of the data
+    :param fetch_f: a function without arguments returning the data
+    """
+    if resource_cache is None or not resource_cache.enabled(resource):
+        return fetch_f()
+    # Keep the keys apart from the names and IDs of single resources
+    key = 'data:%s' % key
+    data = resource_cache.get(resource, key)
+    if data is None:
+        data = fetch_f()
+        resource_cache.set(resource, [key], data)
+    return data
+
+
+def get_resource(resource_cache, resource, manager, res_id):
+    """Get a resource by ID, from the cache if possible
+
+    :param resource_cache: a ResourceCache or None
+    :param resource: the resource type, which sets the expiration
+    :param manager: the manager from which we can get the resource
+    :param res_id: the resource ID
+    """
+    if resource_cache is None or not resource_cache.enabled(resource):
+        return manager.get(res_id)
+    info = resource_cache.get(resource, 'resource:%s' % res_id)
+    if info is not None:
+        return _from_info(manager, info)
+    res = manager.get(res_id)
+    resource_cache.set(resource, ['resource:%s' % res_id], _to_info(res))
+    return res
+
+
+def find_resource(resource_cache, resource, manager, name_or_id):
+    """Find a resource by name or ID, from the cache if possible
+
+    :param resource_cache: a ResourceCache or None
+    :param resource: the resource type, which sets the expiration
+    :param manager: the manager from which we can find the resource
+    :param name_or_id: the resource name or ID
+    """
+    if resource_cache is None or not resource_cache.enabled(resource):
+        return utils.find_resource(manager, name_or_id)
+    info = resource_cache.get(resource, 'resource:%s' % name_or_id)
+    if info is not None:
+        return _from_info(manager, info)
+    res = utils.find_resource(manager, name_or_id)
+    resource_cache.set(
+        resource,
+        ['resource:%s' % name_or_id, 'resource:%s' % res.id],
+        _to_info(res),
+    )
+    return res
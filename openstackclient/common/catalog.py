@@ -0,0 +1,139 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Indexed view of the service catalog"""
+
+from keystoneauth1 import exceptions as ks_exceptions
+
+
+def _normalize_interface(interface):
+    """Return the short form of an interface name: public, internal, admin"""
+    if interface and interface.endswith('URL'):
+        interface = interface[:-len('URL')]
+    return interface
+
+
+def _get_endpoint_region(endpoint):
+    return endpoint.get('region_id') or endpoint.get('region')
+
+
+def _get_endpoint_urls(endpoint):
+    """Yield (interface, url) pairs from a v2 or v3 catalog endpoint"""
+    if 'interface' in endpoint:
+        # v3 catalog: one endpoint per interface
+        yield endpoint['interface'], endpoint.get('url')
+    else:
+        # v2 catalog: one endpoint carrying a URL for each interface
+        for key, url in endpoint.items():
+            if key.endswith('URL'):
+                yield _normalize_interface(key), url
+
+
+class CatalogIndex(object):
+    """Service catalog lookups without rescanning the raw catalog
+
+    The raw catalog in ``auth_ref.service_catalog`` is a list of services,
+    each holding a list of endpoints, and every ``url_for()`` call walks all
+    of them.  This index is built once per auth_ref and keys the endpoint
+    URLs by (service type, interface, region) so endpoint selection for any
+    region is a dict lookup.  Catalog order is preserved, so the URL chosen
+    for a lookup is the same one keystoneauth would select.
+
+    :param service_catalog: a keystoneauth ``ServiceCatalog``
+    """
+
+    def __init__(self, service_catalog):
+        self.service_catalog = service_catalog
+        self.catalog = list(service_catalog.catalog or [])
+
+        self._urls = {}
+        self._services = {}
+        self.service_types = set()
+        self.regions = set()
+
+        for service in self.catalog:
+            service_type = service.get('type')
+
+            # First match in catalog order wins for both name and type
+            for key in (service.get('name'), service_type):
+                if key is not None:
+                    self._services.setdefault(key, service)
+
+            if service_type is None:
+                continue
+            self.service_types.add(service_type)
+
+            for endpoint in service.get('endpoints', []):
+                region = _get_endpoint_region(endpoint)
+                if region:
+                    self.regions.add(region)
+                for interface, url in _get_endpoint_urls(endpoint):
+                    self._urls.setdefault(
+                        (service_type, interface, region), []).append(url)
+                    # Region-less lookups see every region in catalog order
+                    self._urls.setdefault(
+                        (service_type, interface, None), []).append(url)
+
+    def __len__(self):
+        return len(self.catalog)
+
+    def find_service(self, name_or_type):
+        """Return the first service whose name or type matches
+
+        :param name_or_type: the service name or service type
+        :returns: the raw catalog entry for the service, or None
+        """
+        return self._services.get(name_or_type)
+
+    def get_urls(self, service_type, interface='public', region_name=None):
+        """Return the endpoint URLs for a service type
+
+        :param service_type: the service type, e.g. ``compute``
+        :param interface: ``public``, ``internal`` or ``admin``; the v2 style
+                          ``publicURL`` form is also accepted
+        :param region_name: restrict the URLs to a region
+        :returns: a tuple of URLs in catalog order
+        """
+        key = (service_type, _normalize_interface(interface), region_name)
+        return tuple(self._urls.get(key, ()))
+
+    def url_for(self, service_type, interface='public', region_name=None):
+        """Return the first endpoint URL for a service type
+
+        Raises the same keystoneauth exceptions as
+        ``ServiceCatalog.url_for()`` when the catalog is empty or has no
+        matching endpoint.
+        """
+        if not self.catalog:
+            raise ks_exceptions.EmptyCatalog('The service catalog is empty.')
+
+        urls = self.get_urls(
+            service_type,
+            interface=interface,
+            region_name=region_name,
+        )
+        if urls:
+            return urls[0]
+
+        if region_name:
+            msg = ('%(interface)s endpoint for %(service_type)s service '
+                   'in %(region_name)s region not found' %
+                   {'interface': interface,
+                    'service_type': service_type,
+                    'region_name': region_name})
+        else:
+            msg = ('%(interface)s endpoint for %(service_type)s service '
+                   'not found' %
+                   {'interface': interface,
+                    'service_type': service_type})
+        raise ks_exceptions.EndpointNotFound(msg)
@@ -15,6 +15,7 @@
 
 """Manage access to the clients, including authenticating when needed."""
 
+import copy
 import logging
 import pkg_resources
 import sys
@@ -22,6 +23,11 @@ import sys
 from osc_lib import clientmanager
 from osc_lib import shell
 
+from openstackclient.common import cache
+from openstackclient.common import catalog
+from openstackclient.common import latency
+from openstackclient.common import transport
+
 
 LOG = logging.getLogger(__name__)
 
@@ -62,6 +68,13 @@ class ClientManager(clientmanager.ClientManager):
         # store original auth_type
         self._original_auth_type = cli_options.auth_type
 
+        self._catalog_index = None
+        self._resource_cache = None
+
+        # A latency.Profile to record HTTP requests in, set by the shell
+        # for --timing-report
+        self.latency_profile = None
+
     def setup_auth(self):
         """Set up authentication"""
 
@@ -83,7 +96,20 @@ class ClientManager(clientmanager.ClientManager):
             except TypeError as e:
                 self._fallback_load_auth_plugin(e)
 
-        return super(ClientManager, self).setup_auth()
+        ret = super(ClientManager, self).setup_auth()
+
+        # Every API client is built on this session so they all share its
+        # connection pools
+        options = transport.get_options(self._cli_options.config)
+        # The timing adapter cannot wrap a custom adapter, the requests are
+        # then left out of the report
+        if (self.latency_profile is not None and
+                'http_adapter' not in options):
+            latency.instrument_session(
+                self.session, self.latency_profile, **options)
+        else:
+            transport.configure_session(self.session, **options)
+        return ret
 
     def _fallback_load_auth_plugin(self, e):
         # NOTES(RuiChen): Hack to avoid auth plugins choking on data they don't
@@ -103,6 +129,122 @@ class ClientManager(clientmanager.ClientManager):
         else:
             raise e
 
+    @property
+    def catalog_index(self):
+        """Index of the service catalog, built once per auth_ref
+
+        Returns None if there is no service catalog, i.e. when using
+        token/endpoint authentication.
+        """
+
+        # Trigger authentication necessary to discover endpoints
+        auth_ref = self.auth_ref
+        if not auth_ref or not auth_ref.service_catalog:
+            return None
+        if (self._catalog_index is None or
+                self._catalog_index.service_catalog is not
+                auth_ref.service_catalog):
+            self._catalog_index = catalog.CatalogIndex(
+                auth_ref.service_catalog,
+            )
+        return self._catalog_index
+
+    @property
+    def resource_cache(self):
+        """On-disk cache of near-static resources
+
+        Returns None unless an expiration is set for at least one resource
+        type in the ``cache`` section of the cloud configuration.
+        """
+
+        expiration = self._cli_options.get_cache_expiration()
+        if not expiration:
+            return None
+        # Token/endpoint authentication has no auth_ref, its entries are
+        # kept per cloud and region only
+        scope = (
+            self._cli_options.name,
+            self.region_name,
+            getattr(self.auth_ref, 'project_id', None),
+        )
+        if (self._resource_cache is None or
+                self._resource_cache.scope != scope):
+            self._resource_cache = cache.ResourceCache(
+                self._cli_options.get_cache_path(),
+                scope,
+                expiration,
+            )
+        return self._resource_cache
+
+    def is_service_available(self, service_type):
+        """Check if a service type is in the current Service Catalog
+
+        The service is only available when it has an endpoint for the
+        region and interface of this ClientManager.
+        """
+
+        index = self.catalog_index
+        if index is None:
+            return super(ClientManager, self).is_service_available(
+                service_type,
+            )
+        return bool(index.get_urls(
+            service_type,
+            interface=self.interface or 'public',
+            region_name=self.region_name,
+        ))
+
+    def get_endpoint_for_service_type(self, service_type, region_name=None,
+                                      interface='public'):
+        """Return the endpoint URL for the service type."""
+
+        index = self.catalog_index
+        if index is None:
+            return super(ClientManager, self).get_endpoint_for_service_type(
+                service_type,
+                region_name=region_name,
+                interface=interface,
+            )
+        return index.url_for(
+            service_type,
+            interface=interface or 'public',
+            region_name=region_name,
+        )
+
+    @classmethod
+    def isolated_class(cls):
+        """Return a subclass that keeps its own API client handles
+
+        ClientCache stores the client handle on the descriptor, which lives
+        on the class, so every instance of a class shares the same clients.
+        Instances of the returned subclass get fresh descriptors, which is
+        needed when several ClientManagers are used at once.
+        """
+
+        caches = {}
+        for klass in reversed(cls.__mro__):
+            for name, attr in vars(klass).items():
+                if isinstance(attr, clientmanager.ClientCache):
+                    caches[name] = clientmanager.ClientCache(attr.factory)
+        return type(cls.__name__, (cls,), caches)
+
+    def for_region(self, region_name):
+        """Return a copy of this ClientManager for another region
+
+        The copy shares the session, auth plugin and auth_ref, so no
+        additional authentication is done, but builds its own API clients
+        for the requested region.
+        """
+
+        # Authenticate here so every copy shares the same auth_ref
+        self.auth_ref
+
+        region_manager = copy.copy(self)
+        region_manager.__class__ = type(self).isolated_class()
+        region_manager.region_name = region_name
+        region_manager._region_name = region_name
+        return region_manager
+
     def is_network_endpoint_enabled(self):
         """Check if the network endpoint is enabled"""
 
@@ -0,0 +1,192 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Run the API calls of a command concurrently"""
+
+import collections
+import logging
+
+from concurrent import futures
+from keystoneauth1 import exceptions as ks_exceptions
+from osc_lib import exceptions
+import six
+
+from openstackclient.i18n import _
+
+
+LOG = logging.getLogger(__name__)
+
+# Matches the default connection pool size of a requests Session
+DEFAULT_MAX_WORKERS = 10
+
+
+def resolve_all(lookups, max_workers=DEFAULT_MAX_WORKERS):
+    """Run independent lookups concurrently
+
+    Every lookup runs to completion so all the failures are reported
+    together rather than one per invocation.
+
+    :param lookups: an ordered dict of key to a function without arguments
+                    returning the resource
+    :param max_workers: upper bound of concurrent lookups
+    :returns: a dict of key to the result of its lookup
+    :raises: the exception of the lookup when only one failed, a
+             CommandError listing every failure when several failed
+    """
+    if not lookups:
+        return {}
+
+    workers = max(1, min(len(lookups), max_workers))
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        results = collections.OrderedDict(
+            (key, executor.submit(lookup)) for key, lookup in lookups.items()
+        )
+
+    resolved = {}
+    errors = []
+    for key, result in results.items():
+        try:
+            resolved[key] = result.result()
+        except Exception as e:
+            errors.append(e)
+
+    if len(errors) == 1:
+        raise errors[0]
+    if errors:
+        msg = _("%(count)s lookups failed:\n%(errors)s")
+        raise exceptions.CommandError(msg % {
+            'count': len(errors),
+            'errors': '\n'.join(six.text_type(e) for e in errors),
+        })
+    return resolved
+
+
+class TargetApp(object):
+    """Present the App to a command with a different ClientManager
+
+    Commands reach their API clients through ``self.app.client_manager``;
+    this proxy lets one command class run against several ClientManagers
+    at once while everything else still comes from the real App.
+    """
+
+    def __init__(self, app, client_manager):
+        self._app = app
+        self.client_manager = client_manager
+
+    def __getattr__(self, name):
+        return getattr(self._app, name)
+
+
+def _take_action(cmd, parsed_args):
+    columns, data = cmd.take_action(parsed_args)
+    # Consume the rows here so the API calls made while iterating
+    # run in the worker thread too
+    return columns, list(data)
+
+
+def take_action(cmd, parsed_args, targets, label,
+                ignore_missing=False, max_workers=DEFAULT_MAX_WORKERS):
+    """Run a Lister's take_action() concurrently for each target
+
+    :param cmd: the Lister command instance to fan out
+    :param parsed_args: the parsed arguments of the command
+    :param targets: a list of (name, get_client_manager) tuples, where
+                    get_client_manager is called in the worker thread and
+                    returns the ClientManager for the target
+    :param label: heading of the column holding the target name
+    :param ignore_missing: skip targets without an endpoint for the
+                           service instead of reporting them as failures
+    :param max_workers: upper bound of concurrent targets
+    :returns: a tuple of (columns, data, failures) where rows are in target
+              order and failures is a list of the names of failed targets
+    """
+
+    def _run(target):
+        name, get_client_manager = target
+        target_cmd = type(cmd)(
+            TargetApp(cmd.app, get_client_manager()),
+            cmd.app_args,
+            cmd_name=cmd.cmd_name,
+        )
+        return _take_action(target_cmd, parsed_args)
+
+    workers = max(1, min(len(targets), max_workers))
+    with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        results = [executor.submit(_run, t) for t in targets]
+
+    columns = None
+    data = []
+    failures = []
+    for (name, _get_client_manager), result in zip(targets, results):
+        try:
+            target_columns, target_data = result.result()
+        except Exception as e:
+            if (ignore_missing and
+                    isinstance(e, ks_exceptions.EndpointNotFound)):
+                LOG.debug("Skipping %s %s: %s", label, name, e)
+                continue
+            failures.append(name)
+            LOG.error(_("%(label)s %(name)s: %(e)s"),
+                      {'label': label, 'name': name, 'e': e})
+            continue
+        if columns is None:
+            columns = (label,) + tuple(target_columns)
+        data.extend((name,) + tuple(row) for row in target_data)
+
+    return (columns or (label,)), data, failures
+
+
+def fan_out(cmd, targets, label, ignore_missing=False,
+            max_workers=DEFAULT_MAX_WORKERS):
+    """Make a Lister command run against several targets
+
+    Replaces ``take_action()`` and ``run()`` on the command instance so the
+    normal cliff output handling formats the merged rows.  ``run()`` returns
+    1 when any target failed, after the rows of the others are displayed.
+
+    :param cmd: the Lister command instance to fan out
+    :param targets: a list of (name, get_client_manager) tuples, see
+                    :func:`take_action`
+    :param label: heading of the column holding the target name
+    """
+
+    failures = []
+    run = cmd.run
+
+    def _fan_out_take_action(parsed_args):
+        columns, data, failed = take_action(
+            cmd,
+            parsed_args,
+            targets,
+            label,
+            ignore_missing=ignore_missing,
+            max_workers=max_workers,
+        )
+        failures.extend(failed)
+        return columns, data
+
+    def _fan_out_run(parsed_args):
+        ret = run(parsed_args)
+        if failures:
+            LOG.error(_("%(label)s failures (%(failed)s of %(total)s): "
+                        "%(names)s"),
+                      {'label': label,
+                       'failed': len(failures),
+                       'total': len(targets),
+                       'names': ', '.join(failures)})
+            return 1
+        return ret
+
+    cmd.take_action = _fan_out_take_action
+    cmd.run = _fan_out_run
+    return cmd
@@ -0,0 +1,238 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Latency breakdown of a single command invocation"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+
+from requests.packages.urllib3 import connection
+from requests.packages.urllib3 import connectionpool
+
+from openstackclient.common import transport
+
+
+REPORT_FORMATS = ('json', 'chrome')
+
+# Connection timings of the request in flight on each thread
+_local = threading.local()
+
+
+class Profile(object):
+    """Collect the timed phases and HTTP requests of one command
+
+    A span is a dict with a name, a category, a start time in seconds since
+    the epoch, a duration in seconds and a dict of extra args.  Phases of the
+    command use the ``phase`` category, HTTP requests use ``http``.
+
+    :param start: the time the process started doing work, defaults to now
+    """
+
+    def __init__(self, start=None):
+        self.start = start if start is not None else time.time()
+        self.spans = []
+        self._lock = threading.Lock()
+
+    def add(self, name, category, start, duration, **args):
+        """Record a span"""
+        span = {
+            'name': name,
+            'category': category,
+            'start': start,
+            'duration': duration,
+            'thread': threading.current_thread().name,
+            'args': args,
+        }
+        with self._lock:
+            self.spans.append(span)
+        return span
+
+    @contextlib.contextmanager
+    def span(self, name, category='phase', **args):
+        """Time the body of a with statement as a span"""
+        start = time.time()
+        try:
+            yield
+        finally:
+            self.add(name, category, start, time.time() - start, **args)
+
+    def summary(self):
+        """Return the total seconds spent per phase and in HTTP requests
+
+        :returns: a list of (name, seconds) tuples in the order the phases
+                  first occurred, followed by ``http`` and ``total``
+        """
+        totals = {}
+        order = []
+        http = 0.0
+        end = self.start
+        for span in self.spans:
+            end = max(end, span['start'] + span['duration'])
+            if span['category'] == 'http':
+                http += span['duration']
+                continue
+            if span['name'] not in totals:
+                order.append(span['name'])
+                totals[span['name']] = 0.0
+            totals[span['name']] += span['duration']
+        return ([(name, totals[name]) for name in order] +
+                [('http', http), ('total', end - self.start)])
+
+    def to_dict(self):
+        """Return the profile with times relative to the start"""
+        return {
+            'summary': dict(self.summary()),
+            'spans': [
+                dict(span, start=span['start'] - self.start)
+                for span in self.spans
+            ],
+        }
+
+    def to_chrome_trace(self):
+        """Return the profile in the Chrome trace event format
+
+        The result can be loaded into chrome://tracing or any other viewer
+        for the Trace Event Format.
+        """
+        pid = os.getpid()
+        events = []
+        for span in self.spans:
+            events.append({
+                'name': span['name'],
+                'cat': span['category'],
+                'ph': 'X',
+                'ts': int((span['start'] - self.start) * 1e6),
+                'dur': int(span['duration'] * 1e6),
+                'pid': pid,
+                'tid': span['thread'],
+                'args': span['args'],
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write(self, stream, report_format='json'):
+        """Write the profile to a file-like object"""
+        if report_format == 'chrome':
+            data = self.to_chrome_trace()
+        else:
+            data = self.to_dict()
+        json.dump(data, stream, indent=2, sort_keys=True)
+        stream.write('\n')
+
+
+def _add_connection_time(key, start):
+    timings = getattr(_local, 'timings', None)
+    if timings is not None:
+        timings[key] = timings.get(key, 0.0) + time.time() - start
+
+
+class _TimedHTTPConnection(connection.HTTPConnection):
+
+    def _new_conn(self):
+        start = time.time()
+        try:
+            return super(_TimedHTTPConnection, self)._new_conn()
+        finally:
+            _add_connection_time('connect', start)
+
+
+class _TimedHTTPSConnection(connection.HTTPSConnection):
+
+    def _new_conn(self):
+        start = time.time()
+        try:
+            return super(_TimedHTTPSConnection, self)._new_conn()
+        finally:
+            _add_connection_time('connect', start)
+
+    def connect(self):
+        # connect() opens the socket with _new_conn() then does the TLS
+        # handshake, the handshake time is the difference
+        start = time.time()
+        try:
+            return super(_TimedHTTPSConnection, self).connect()
+        finally:
+            _add_connection_time('secure_connect', start)
+
+
+class _TimedHTTPConnectionPool(connectionpool.HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+
+class _TimedHTTPSConnectionPool(connectionpool.HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+
+class TimingAdapter(transport.TransportAdapter):
+    """A requests transport adapter recording each request in a Profile
+
+    Each request is recorded as an ``http`` span whose args break the
+    duration down into ``connect``, ``tls``, ``ttfb`` (sending the request
+    and waiting for the response headers) and ``transfer`` (reading the
+    body) seconds.  ``connect`` and ``tls`` are zero when a pooled
+    connection is reused.
+    """
+
+    def __init__(self, profile, *args, **kwargs):
+        self.profile = profile
+        super(TimingAdapter, self).__init__(*args, **kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super(TimingAdapter, self).init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool,
+        }
+
+    def send(self, request, stream=False, **kwargs):
+        _local.timings = timings = {}
+        start = time.time()
+        try:
+            resp = super(TimingAdapter, self).send(
+                request, stream=stream, **kwargs)
+            headers_received = time.time()
+            if not stream:
+                # requests reads the body right after send() returns,
+                # read it here so the transfer can be timed
+                resp.content
+            end = time.time()
+        finally:
+            _local.timings = None
+
+        connect = timings.get('connect', 0.0)
+        tls = 0.0
+        if 'secure_connect' in timings:
+            tls = max(0.0, timings['secure_connect'] - connect)
+        self.profile.add(
+            '%s %s' % (request.method, request.url),
+            'http',
+            start,
+            end - start,
+            status=resp.status_code,
+            connect=connect,
+            tls=tls,
+            ttfb=max(0.0, headers_received - start - connect - tls),
+            transfer=end - headers_received,
+        )
+        return resp
+
+
+def instrument_session(session, profile, **kwargs):
+    """Record the requests of a keystoneauth Session in a Profile
+
+    :param kwargs: the TransportAdapter options of the session
+    """
+    return transport.configure_session(
+        session, adapter=TimingAdapter(profile, **kwargs))
@@ -0,0 +1,169 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""HTTP transport shared by all the API clients"""
+
+import socket
+
+from keystoneauth1 import session as ks_session
+from oslo_utils import importutils
+from osc_lib import exceptions
+from requests.packages.urllib3.util import retry
+
+from openstackclient.i18n import _
+
+
+# requests keeps up to 10 connections per host, which is also the default
+# number of concurrent API calls of a command
+DEFAULT_POOL_MAXSIZE = 10
+# requests keeps the pools of up to 10 hosts
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_MAX_RETRIES = 0
+DEFAULT_RETRY_BACKOFF = 0.5
+
+
+class TransportAdapter(ks_session.TCPKeepAliveAdapter):
+    """A requests transport adapter with a configurable connection pool
+
+    :param keepalive: set TCP keep-alive on the connections, as keystoneauth
+                      does by default
+    :param pool_connections: the number of hosts to keep a pool for
+    :param pool_maxsize: the number of connections kept open per host
+    :param max_retries: retries of a request that failed to connect; a
+                        request that reached the server is never retried
+    :param retry_backoff: backoff factor of the retries, the n-th retry
+                          waits retry_backoff * 2 ** (n - 1) seconds
+    """
+
+    def __init__(self, keepalive=True,
+                 pool_connections=DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize=DEFAULT_POOL_MAXSIZE,
+                 max_retries=DEFAULT_MAX_RETRIES,
+                 retry_backoff=DEFAULT_RETRY_BACKOFF,
+                 **kwargs):
+        self.keepalive = keepalive
+        if max_retries:
+            max_retries = retry.Retry(
+                total=max_retries,
+                connect=max_retries,
+                read=False,
+                backoff_factor=retry_backoff,
+            )
+        super(TransportAdapter, self).__init__(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            max_retries=max_retries,
+            **kwargs
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        if not self.keepalive and 'socket_options' not in kwargs:
+            # Keep Nagle's algorithm off, like requests does
+            kwargs['socket_options'] = [
+                (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1),
+            ]
+        super(TransportAdapter, self).init_poolmanager(*args, **kwargs)
+
+
+def _get_number(config, key, default, convert=int, minimum=1):
+    value = config.get(key)
+    if value is None or value == '':
+        return default
+    try:
+        value = convert(value)
+    except (TypeError, ValueError):
+        value = None
+    if value is None or value < minimum:
+        msg = _("%(key)s must be a number of at least %(minimum)s, "
+                "not %(value)s")
+        raise exceptions.CommandError(msg % {
+            'key': key,
+            'minimum': minimum,
+            'value': config.get(key),
+        })
+    return value
+
+
+def _get_bool(config, key, default):
+    value = config.get(key)
+    if value is None or value == '':
+        return default
+    if isinstance(value, bool):
+        return value
+    return str(value).lower() in ('1', 'true', 'yes', 'on')
+
+
+def get_options(config):
+    """Return the transport options set in a cloud configuration
+
+    The ``--os-pool-maxsize`` style command line options are merged into
+    the configuration of the cloud, so they override ``clouds.yaml``.
+
+    :param config: the ``config`` dict of a CloudConfig, which holds the
+                   keys of the cloud in ``clouds.yaml``
+    :returns: a dict of keyword arguments for :func:`build_adapter`
+    """
+    options = {
+        'keepalive': _get_bool(config, 'keepalive', True),
+        'pool_connections': _get_number(
+            config, 'pool_connections', DEFAULT_POOL_CONNECTIONS),
+        'pool_maxsize': _get_number(
+            config, 'pool_maxsize', DEFAULT_POOL_MAXSIZE),
+        'max_retries': _get_number(
+            config, 'max_retries', DEFAULT_MAX_RETRIES, minimum=0),
+        'retry_backoff': _get_number(
+            config, 'retry_backoff', DEFAULT_RETRY_BACKOFF,
+            convert=float, minimum=0),
+    }
+    if config.get('http_adapter'):
+        options['http_adapter'] = config['http_adapter']
+    return options
+
+
+def build_adapter(http_adapter=None, **kwargs):
+    """Return the transport adapter to mount on a session
+
+    :param http_adapter: the dotted path of a requests transport adapter
+                         class to use instead of TransportAdapter, e.g. an
+                         HTTP/2 adapter; it is called without arguments so
+                         the other options do not apply to it
+    :param kwargs: the options of TransportAdapter
+    """
+    if not http_adapter:
+        return TransportAdapter(**kwargs)
+    try:
+        adapter_class = importutils.import_class(http_adapter)
+    except (ImportError, ValueError) as e:
+        msg = _("Unable to load the HTTP adapter %(adapter)s: %(e)s")
+        raise exceptions.CommandError(msg % {
+            'adapter': http_adapter,
+            'e': e,
+        })
+    return adapter_class()
+
+
+def configure_session(session, adapter=None, **kwargs):
+    """Mount a transport adapter on a keystoneauth Session
+
+    Every API client built on the session, and every session sharing its
+    requests session, then draws from the same connection pools.
+
+    :param session: a keystoneauth Session
+    :param adapter: the adapter to mount, built by :func:`build_adapter`
+                    from kwargs by default
+    """
+    if adapter is None:
+        adapter = build_adapter(**kwargs)
+    for prefix in ('https://', 'http://'):
+        session.session.mount(prefix, adapter)
+    return adapter
@@ -0,0 +1,256 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Wait for many resources to reach a terminal state at once"""
+
+import collections
+import logging
+import random
+import time
+
+
+LOG = logging.getLogger(__name__)
+
+DEFAULT_SLEEP_TIME = 2
+DEFAULT_MAX_SLEEP_TIME = 20
+DEFAULT_BACKOFF = 1.5
+
+
+class Waiter(object):
+    """Track the status of several resources with one poll loop
+
+    Each tick lists the resources with ``list_f`` when more than one is
+    pending, so N resources cost one API call instead of N.  A pending
+    resource missing from the listing (another project, a later page, or
+    deleted) is fetched on its own with ``get_f``.  With a single pending
+    resource, or without ``list_f``, only ``get_f`` is used.
+
+    The poll interval starts at ``sleep_time`` and grows by ``backoff`` up
+    to ``max_sleep_time`` while nothing changes, it resets as soon as a
+    status or progress changes.  Each sleep is jittered so concurrent
+    waiters do not poll in lock step.
+
+    :param get_f: a function that takes a single id argument and returns the
+        resource
+    :param list_f: a function without arguments returning the resources,
+        used to poll several resources at once
+    :param status_field: the status attribute of the resource
+    :param success_status: a list of status strings for successful completion
+    :param error_status: a list of status strings for error
+    :param delete: wait for the resources to be deleted; a ``get_f`` that
+        raises an exception named in ``exception_name`` marks the success
+    :param exception_name: a list of exception names for the deleted case
+    :param sleep_time: initial wait between polls (seconds)
+    :param max_sleep_time: longest wait between polls (seconds)
+    :param backoff: factor applied to the wait after a poll without change
+    :param timeout: give up and fail the pending resources after this long
+        (seconds), None waits forever
+    :param callback: called per sleep cycle with the average progress of
+        the resources, finished resources count as 100
+    :param on_done: called with (res_id, success, resource) as each
+        resource reaches a terminal state, resource is None when deleted
+    """
+
+    def __init__(self, get_f, list_f=None, status_field='status',
+                 success_status=('active',), error_status=('error',),
+                 delete=False, exception_name=('NotFound',),
+                 sleep_time=DEFAULT_SLEEP_TIME,
+                 max_sleep_time=DEFAULT_MAX_SLEEP_TIME,
+                 backoff=DEFAULT_BACKOFF, timeout=None, callback=None,
+                 on_done=None):
+        self.get_f = get_f
+        self.list_f = list_f
+        self.status_field = status_field
+        self.success_status = success_status
+        self.error_status = error_status
+        self.delete = delete
+        self.exception_name = exception_name
+        self.sleep_time = sleep_time
+        self.max_sleep_time = max(sleep_time, max_sleep_time)
+        self.backoff = backoff
+        self.timeout = timeout
+        self.callback = callback
+        self.on_done = on_done
+
+        # res_id -> (status, progress) seen at the last poll
+        self.pending = collections.OrderedDict()
+        # res_id -> True on success, False on error or timeout
+        self.results = collections.OrderedDict()
+
+    def add(self, res_id):
+        """Start tracking a resource"""
+        if res_id not in self.results:
+            self.pending.setdefault(res_id, None)
+
+    def _finish(self, res_id, success, resource):
+        self.pending.pop(res_id, None)
+        self.results[res_id] = success
+        if self.on_done:
+            self.on_done(res_id, success, resource)
+
+    def _get(self, res_id):
+        try:
+            return self.get_f(res_id)
+        except Exception as ex:
+            if self.delete and type(ex).__name__ in self.exception_name:
+                return None
+            raise
+
+    def _fetch(self):
+        """Return a dict of the pending resources by id, None if deleted"""
+        resources = {}
+        if self.list_f and len(self.pending) > 1:
+            for res in self.list_f():
+                if res.id in self.pending:
+                    resources[res.id] = res
+        for res_id in self.pending:
+            if res_id not in resources:
+                resources[res_id] = self._get(res_id)
+        return resources
+
+    def poll(self):
+        """Poll the pending resources once
+
+        :rtype: True if any resource changed status or progress
+        """
+        changed = False
+        for res_id, res in self._fetch().items():
+            if res is None:
+                self._finish(res_id, True, None)
+                changed = True
+                continue
+
+            status = (getattr(res, self.status_field, '') or '').lower()
+            progress = getattr(res, 'progress', None) or 0
+            if status in self.error_status:
+                self._finish(res_id, False, res)
+                changed = True
+            elif not self.delete and status in self.success_status:
+                self._finish(res_id, True, res)
+                changed = True
+            elif self.pending[res_id] != (status, progress):
+                # The first poll of a resource does not count as a change
+                changed = changed or self.pending[res_id] is not None
+                self.pending[res_id] = (status, progress)
+        return changed
+
+    def progress(self):
+        """Return the average progress of all tracked resources"""
+        total = len(self.pending) + len(self.results)
+        if not total:
+            return 100
+        done = 100 * len(self.results)
+        running = sum(p[1] for p in self.pending.values() if p)
+        return int((done + running) / total)
+
+    def wait(self):
+        """Poll until every tracked resource reached a terminal state
+
+        :rtype: an ordered dict of res_id to True on success, False if the
+            resource has gone to error state or the timeout has been reached
+        """
+        interval = self.sleep_time
+        total_time = 0
+        while True:
+            if self.poll():
+                interval = self.sleep_time
+            else:
+                interval = min(self.max_sleep_time, interval * self.backoff)
+            if not self.pending:
+                break
+            if self.timeout is not None and total_time >= self.timeout:
+                for res_id in list(self.pending):
+                    LOG.debug("Timed out waiting for %s", res_id)
+                    self._finish(res_id, False, None)
+                break
+            if self.callback:
+                self.callback(self.progress())
+            sleep = random.uniform(interval / 2.0, interval)
+            time.sleep(sleep)
+            total_time += sleep
+        return self.results
+
+
+def _as_list(res_ids):
+    if isinstance(res_ids, (list, tuple, set)):
+        return list(res_ids)
+    return [res_ids]
+
+
+def wait_for_status(status_f, res_ids, list_f=None, status_field='status',
+                    success_status=('active',), error_status=('error',),
+                    sleep_time=DEFAULT_SLEEP_TIME, timeout=None,
+                    callback=None):
+    """Wait for status change on resources during a long-running operation
+
+    :param status_f: a status function that takes a single id argument
+    :param res_ids: the resource id, or list of ids, to watch
+    :param list_f: a function listing the resources, see :class:`Waiter`
+    :param status_field: the status attribute in the returned resource object
+    :param success_status: a list of status strings for successful completion
+    :param error_status: a list of status strings for error
+    :param sleep_time: initial wait between polls (seconds)
+    :param timeout: check until this long (seconds), None waits forever
+    :param callback: called per sleep cycle, useful to display progress
+    :rtype: True if every resource reached a success status
+    """
+    waiter = Waiter(
+        status_f,
+        list_f=list_f,
+        status_field=status_field,
+        success_status=success_status,
+        error_status=error_status,
+        sleep_time=sleep_time,
+        timeout=timeout,
+        callback=callback,
+    )
+    for res_id in _as_list(res_ids):
+        waiter.add(res_id)
+    return all(waiter.wait().values())
+
+
+def wait_for_delete(manager, res_ids, status_field='status',
+                    error_status=('error',), exception_name=('NotFound',),
+                    sleep_time=DEFAULT_SLEEP_TIME, timeout=300,
+                    callback=None):
+    """Wait for resource deletion
+
+    Several resources are polled with ``manager.list()``.
+
+    :param manager: the manager from which we can get the resources
+    :param res_ids: the resource id, or list of ids, to watch
+    :param status_field: the status attribute in the returned resource object,
+        this is used to check for error states while the resource is being
+        deleted
+    :param error_status: a list of status strings for error
+    :param exception_name: a list of exception strings for deleted case
+    :param sleep_time: initial wait between polls (seconds)
+    :param timeout: check until this long (seconds)
+    :param callback: called per sleep cycle, useful to display progress
+    :rtype: True if every resource was deleted, False if one has gone to
+        error state or the timeout has been reached
+    """
+    waiter = Waiter(
+        manager.get,
+        list_f=manager.list,
+        status_field=status_field,
+        error_status=error_status,
+        delete=True,
+        exception_name=exception_name,
+        sleep_time=sleep_time,
+        timeout=timeout,
+        callback=callback,
+    )
+    for res_id in _as_list(res_ids):
+        waiter.add(res_id)
+    return all(waiter.wait().values())
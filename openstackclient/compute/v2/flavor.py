@@ -16,19 +16,26 @@
 """Flavor action implementations"""
 
 import logging
+import weakref
 
+from concurrent import futures
 from osc_lib.cli import parseractions
 from osc_lib.command import command
 from osc_lib import exceptions
 from osc_lib import utils
 import six
 
+from openstackclient.common import fanout
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 
 
 LOG = logging.getLogger(__name__)
 
+# Flavor extra specs by flavor ID, per compute client, for the life of the
+# process.  The commands changing them drop the cached copy.
+_extra_specs_cache = weakref.WeakKeyDictionary()
+
 
 def _find_flavor(compute_client, flavor):
     try:
@@ -48,6 +55,42 @@ def _find_flavor(compute_client, flavor):
             raise
 
 
+def _get_extra_specs(compute_client, flavors,
+                     max_workers=fanout.DEFAULT_MAX_WORKERS):
+    """Return the extra specs of several flavors
+
+    Extra specs embedded in the flavors (compute API microversion 2.61 and
+    later) are used as they are, the others are fetched concurrently.
+
+    :param compute_client: a compute client instance
+    :param flavors: a list of Flavor resources
+    :param max_workers: upper bound of concurrent requests
+    :rtype: a dict of flavor ID to extra specs
+    """
+    cache = _extra_specs_cache.setdefault(compute_client, {})
+    missing = []
+    for f in flavors:
+        # Use _info, the attribute of a Flavor that is not loaded would
+        # fetch the whole flavor
+        if 'extra_specs' in f._info:
+            cache[f.id] = f._info['extra_specs']
+        elif f.id not in cache:
+            missing.append(f)
+
+    if missing:
+        workers = max(1, min(len(missing), max_workers))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            extra_specs = executor.map(lambda f: f.get_keys(), missing)
+            for f, specs in zip(missing, extra_specs):
+                cache[f.id] = specs
+
+    return dict((f.id, cache[f.id]) for f in flavors)
+
+
+def _forget_extra_specs(compute_client, flavor):
+    _extra_specs_cache.get(compute_client, {}).pop(flavor.id, None)
+
+
 class CreateFlavor(command.ShowOne):
     _description = _("Create new flavor")
 
@@ -290,8 +333,9 @@ class ListFlavor(command.Lister):
                 "RXTX Factor",
                 "Properties",
             )
+            extra_specs = _get_extra_specs(compute_client, data)
             for f in data:
-                f.properties = f.get_keys()
+                f.properties = extra_specs[f.id]
 
         column_headers = columns
 
@@ -341,6 +385,7 @@ class SetFlavor(command.Command):
         identity_client = self.app.client_manager.identity
 
         flavor = _find_flavor(compute_client, parsed_args.flavor)
+        _forget_extra_specs(compute_client, flavor)
 
         result = 0
         key_list = []
@@ -456,6 +501,7 @@ class UnsetFlavor(command.Command):
         identity_client = self.app.client_manager.identity
 
         flavor = _find_flavor(compute_client, parsed_args.flavor)
+        _forget_extra_specs(compute_client, flavor)
 
         result = 0
         if parsed_args.property:
@@ -15,16 +15,101 @@
 
 """Hypervisor action implementations"""
 
+import functools
 import re
+import weakref
 
+from concurrent import futures
 from novaclient import exceptions as nova_exceptions
 from osc_lib.command import command
 from osc_lib import utils
 import six
 
+from openstackclient.common import fanout
 from openstackclient.i18n import _
 
 
+# Host to aggregate names index, built once per compute client so a batch
+# of hypervisor commands run in the same process lists the aggregates once
+_aggregate_index = weakref.WeakKeyDictionary()
+
+
+def _get_aggregate_index(compute_client):
+    if compute_client not in _aggregate_index:
+        index = {}
+        for aggregate in compute_client.aggregates.list():
+            for host in aggregate.hosts:
+                index.setdefault(host, []).append(aggregate.name)
+        _aggregate_index[compute_client] = index
+    return _aggregate_index[compute_client]
+
+
+def _get_aggregates(index, host):
+    """Return the names of the aggregates a service host is a member of"""
+    # Hypervisors in nova cells are prefixed by "<cell>@"
+    if "@" in host:
+        cell, service_host = host.split('@', 1)
+    else:
+        cell = None
+        service_host = host
+
+    member_of = index.get(service_host, [])
+    if cell:
+        # The host aggregates are also prefixed by "<cell>@"
+        member_of = [name for name in member_of if cell in name]
+    return list(member_of)
+
+
+def _get_uptime(compute_client, hypervisor_id):
+    """Return the uptime fields of a hypervisor, empty if not supported"""
+    try:
+        uptime = compute_client.hypervisors.uptime(hypervisor_id)._info
+    except nova_exceptions.HTTPNotImplemented:
+        return {}
+
+    # Extract data from uptime value
+    # format: 0 up 0,  0 users,  load average: 0, 0, 0
+    # example: 17:37:14 up  2:33,  3 users,
+    #          load average: 0.33, 0.36, 0.34
+    m = re.match(
+        "\s*(.+)\sup\s+(.+),\s+(.+)\susers?,\s+load average:\s(.+)",
+        uptime['uptime'])
+    if not m:
+        return {}
+    return {
+        "host_time": m.group(1),
+        "uptime": m.group(2),
+        "users": m.group(3),
+        "load_average": m.group(4),
+    }
+
+
+def _get_row(compute_client, columns, with_uptime, index, hypervisor):
+    row = utils.get_item_properties(hypervisor, columns)
+    # Read _info, a missing attribute would make the resource get itself
+    info = hypervisor._info
+    if with_uptime:
+        uptime = _get_uptime(compute_client, info['id'])
+        row += (uptime.get('uptime', ''), uptime.get('load_average', ''))
+    if index is not None:
+        if 'service' not in info:
+            # Search results only have the ID and hostname
+            info = compute_client.hypervisors.get(info['id'])._info
+        row += (utils.format_list(
+            _get_aggregates(index, info['service']['host'])),)
+    return row
+
+
+def _get_rows(compute_client, hypervisors, columns, with_uptime, index,
+              max_workers=fanout.DEFAULT_MAX_WORKERS):
+    """Yield the rows of the hypervisors, in order, as they are ready"""
+    get_row = functools.partial(
+        _get_row, compute_client, columns, with_uptime, index)
+    with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        for row in executor.map(get_row, hypervisors):
+            yield row
+
+
 class ListHypervisor(command.Lister):
     _description = _("List hypervisors")
 
@@ -40,6 +125,16 @@ class ListHypervisor(command.Lister):
             action='store_true',
             help=_("List additional fields in output")
         )
+        parser.add_argument(
+            '--with-uptime',
+            action='store_true',
+            help=_("Include the uptime and load average of each hypervisor")
+        )
+        parser.add_argument(
+            '--with-aggregates',
+            action='store_true',
+            help=_("Include the host aggregates of each hypervisor")
+        )
         return parser
 
     def take_action(self, parsed_args):
@@ -59,10 +154,22 @@ class ListHypervisor(command.Lister):
         else:
             data = compute_client.hypervisors.list()
 
-        return (columns,
-                (utils.get_item_properties(
-                    s, columns,
-                ) for s in data))
+        if not (parsed_args.with_uptime or parsed_args.with_aggregates):
+            return (columns,
+                    (utils.get_item_properties(
+                        s, columns,
+                    ) for s in data))
+
+        index = None
+        if parsed_args.with_aggregates:
+            index = _get_aggregate_index(compute_client)
+        rows = _get_rows(compute_client, data, columns,
+                         parsed_args.with_uptime, index)
+        if parsed_args.with_uptime:
+            columns += ("Uptime", "Load Average")
+        if parsed_args.with_aggregates:
+            columns += ("Aggregates",)
+        return (columns, rows)
 
 
 class ShowHypervisor(command.ShowOne):
@@ -79,48 +186,32 @@ class ShowHypervisor(command.ShowOne):
 
     def take_action(self, parsed_args):
         compute_client = self.app.client_manager.compute
-        hypervisor = utils.find_resource(compute_client.hypervisors,
-                                         parsed_args.hypervisor)._info.copy()
-
-        aggregates = compute_client.aggregates.list()
-        hypervisor["aggregates"] = list()
-        if aggregates:
-            # Hypervisors in nova cells are prefixed by "<cell>@"
-            if "@" in hypervisor['service']['host']:
-                cell, service_host = hypervisor['service']['host'].split('@',
-                                                                         1)
-            else:
-                cell = None
-                service_host = hypervisor['service']['host']
-
-            if cell:
-                # The host aggregates are also prefixed by "<cell>@"
-                member_of = [aggregate.name
-                             for aggregate in aggregates
-                             if cell in aggregate.name and
-                             service_host in aggregate.hosts]
-            else:
-                member_of = [aggregate.name
-                             for aggregate in aggregates
-                             if service_host in aggregate.hosts]
-            hypervisor["aggregates"] = member_of
-
-        try:
-            uptime = compute_client.hypervisors.uptime(hypervisor['id'])._info
-            # Extract data from uptime value
-            # format: 0 up 0,  0 users,  load average: 0, 0, 0
-            # example: 17:37:14 up  2:33,  3 users,
-            #          load average: 0.33, 0.36, 0.34
-            m = re.match(
-                "\s*(.+)\sup\s+(.+),\s+(.+)\susers?,\s+load average:\s(.+)",
-                uptime['uptime'])
-            if m:
-                hypervisor["host_time"] = m.group(1)
-                hypervisor["uptime"] = m.group(2)
-                hypervisor["users"] = m.group(3)
-                hypervisor["load_average"] = m.group(4)
-        except nova_exceptions.HTTPNotImplemented:
-            pass
+
+        with futures.ThreadPoolExecutor(max_workers=3) as executor:
+            index = executor.submit(_get_aggregate_index, compute_client)
+            # Hypervisor IDs are integers, when given one the uptime does
+            # not have to wait for the hypervisor
+            uptime = None
+            if parsed_args.hypervisor.isdigit():
+                uptime = executor.submit(
+                    _get_uptime, compute_client, parsed_args.hypervisor)
+
+            hypervisor = utils.find_resource(
+                compute_client.hypervisors,
+                parsed_args.hypervisor,
+            )._info.copy()
+
+            if (uptime is None or
+                    six.text_type(hypervisor['id']) != parsed_args.hypervisor):
+                # The argument was a name
+                if uptime is not None:
+                    uptime.cancel()
+                uptime = executor.submit(
+                    _get_uptime, compute_client, hypervisor['id'])
+
+        hypervisor["aggregates"] = _get_aggregates(
+            index.result(), hypervisor['service']['host'])
+        hypervisor.update(uptime.result())
 
         hypervisor["service_id"] = hypervisor["service"]["id"]
         hypervisor["service_host"] = hypervisor["service"]["host"]
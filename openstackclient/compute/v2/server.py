@@ -16,12 +16,17 @@
 """Compute v2 Server action implementations"""
 
 import argparse
+import collections
+import functools
 import getpass
 import io
 import logging
 import os
+import re
 import sys
+import weakref
 
+from concurrent import futures
 from osc_lib.cli import parseractions
 from osc_lib.command import command
 from osc_lib import exceptions
@@ -34,6 +39,9 @@ try:
 except ImportError:
     from novaclient.v1_1 import servers
 
+from openstackclient.common import cache
+from openstackclient.common import fanout
+from openstackclient.common import waiter
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 
@@ -114,36 +122,75 @@ def _get_ip_address(addresses, address_type, ip_address_family):
         )
 
 
-def _prep_server_detail(compute_client, image_client, server):
+# Flavors cannot be changed once created, so they are looked up once per
+# compute client for the life of the process
+_flavor_cache = weakref.WeakKeyDictionary()
+
+
+def _get_flavor(compute_client, flavor_id, resource_cache=None):
+    flavors = _flavor_cache.setdefault(compute_client, {})
+    if flavor_id not in flavors:
+        flavors[flavor_id] = cache.get_resource(
+            resource_cache, 'flavor', compute_client.flavors, flavor_id)
+    return flavors[flavor_id]
+
+
+def _prep_server_detail(compute_client, image_client, server, refresh=True,
+                        resource_cache=None):
     """Prepare the detailed server dict for printing
 
     :param compute_client: a compute client instance
+    :param image_client: an image client instance
     :param server: a Server resource
+    :param refresh: get the server again, set to False when the server
+                    resource was just fetched
+    :param resource_cache: a ResourceCache to look up the image and flavor
+                           in, if any
     :rtype: a dict of server details
     """
     info = server._info.copy()
 
-    server = utils.find_resource(compute_client.servers, info['id'])
-    info.update(server._info)
+    if refresh:
+        server = compute_client.servers.get(info['id'])
+        info.update(server._info)
 
-    # Convert the image blob to a name
+    # The image and flavor are looked up by ID at the same time
     image_info = info.get('image', {})
+    image_id = image_info.get('id', '') if image_info else ''
+    flavor_id = info.get('flavor', {}).get('id', '')
+    image = None
+    with futures.ThreadPoolExecutor(max_workers=2) as executor:
+        if image_id:
+            image = executor.submit(
+                cache.get_resource,
+                resource_cache,
+                'image',
+                image_client.images,
+                image_id,
+            )
+        flavor = executor.submit(
+            _get_flavor, compute_client, flavor_id, resource_cache)
+
+    # Convert the image blob to a name
     if image_info:
-        image_id = image_info.get('id', '')
-        try:
-            image = utils.find_resource(image_client.images, image_id)
-            info['image'] = "%s (%s)" % (image.name, image_id)
-        except Exception:
-            info['image'] = image_id
+        info['image'] = image_id
+        # An image without an ID is not looked up
+        if image is not None:
+            try:
+                image = image.result()
+            except Exception as e:
+                LOG.debug("Unable to get image %s: %s", image_id, e)
+            else:
+                info['image'] = "%s (%s)" % (image.name, image_id)
 
     # Convert the flavor blob to a name
-    flavor_info = info.get('flavor', {})
-    flavor_id = flavor_info.get('id', '')
+    info['flavor'] = flavor_id
     try:
-        flavor = utils.find_resource(compute_client.flavors, flavor_id)
+        flavor = flavor.result()
+    except Exception as e:
+        LOG.debug("Unable to get flavor %s: %s", flavor_id, e)
+    else:
         info['flavor'] = "%s (%s)" % (flavor.name, flavor_id)
-    except Exception:
-        info['flavor'] = flavor_id
 
     if 'os-extended-volumes:volumes_attached' in info:
         info.update(
@@ -183,6 +230,43 @@ def _prep_server_detail(compute_client, image_client, server):
     return info
 
 
+def _find_reservation_servers(compute_client, server, server_name):
+    """Find all the servers booted by a multiple create request
+
+    Nova only returns the first server of the reservation.  The others are
+    listed by reservation ID when the compute API exposes it to the user,
+    otherwise by the name, image and flavor of the first server among the
+    servers changed since it was created.
+
+    :param compute_client: a compute client instance
+    :param server: the Server resource returned by the create request
+    :param server_name: the name the servers were booted with
+    :rtype: a tuple of the search options listing the servers and the list
+            of servers, the first server first
+    """
+    server = compute_client.servers.get(server.id)
+    reservation_id = getattr(server, 'OS-EXT-SRV-ATTR:reservation_id', None)
+    if reservation_id:
+        search_opts = {'reservation_id': reservation_id}
+    else:
+        search_opts = {
+            'name': '^%s' % re.escape(server_name),
+            'changes-since': server.created,
+        }
+
+    servers = [server]
+    for s in compute_client.servers.list(search_opts=search_opts):
+        if s.id == server.id:
+            continue
+        if not reservation_id and (
+                s.created < server.created or
+                s.image != server.image or
+                s.flavor.get('id') != server.flavor.get('id')):
+            continue
+        servers.append(s)
+    return search_opts, servers
+
+
 def _show_progress(progress):
     if progress:
         sys.stdout.write('\rProgress: %s' % progress)
@@ -456,29 +540,159 @@ class CreateServer(command.ShowOne):
         compute_client = self.app.client_manager.compute
         volume_client = self.app.client_manager.volume
         image_client = self.app.client_manager.image
+        resource_cache = self.app.client_manager.resource_cache
+
+        if parsed_args.min > parsed_args.max:
+            msg = _("min instances should be <= max instances")
+            raise exceptions.CommandError(msg)
+        if parsed_args.min < 1:
+            msg = _("min instances should be > 0")
+            raise exceptions.CommandError(msg)
+        if parsed_args.max < 1:
+            msg = _("max instances should be > 0")
+            raise exceptions.CommandError(msg)
 
-        # Lookup parsed_args.image
-        image = None
+        # Check the syntax of every option first, then look up all the
+        # resources they name at once
+        lookups = collections.OrderedDict()
         if parsed_args.image:
-            image = utils.find_resource(
+            lookups['image'] = functools.partial(
+                cache.find_resource,
+                resource_cache,
+                'image',
                 image_client.images,
                 parsed_args.image,
             )
-
-        # Lookup parsed_args.volume
-        volume = None
         if parsed_args.volume:
-            volume = utils.find_resource(
+            lookups['volume'] = functools.partial(
+                utils.find_resource,
                 volume_client.volumes,
                 parsed_args.volume,
-            ).id
+            )
+        lookups['flavor'] = functools.partial(
+            cache.find_resource,
+            resource_cache,
+            'flavor',
+            compute_client.flavors,
+            parsed_args.flavor,
+        )
 
-        # Lookup parsed_args.flavor
-        flavor = utils.find_resource(compute_client.flavors,
-                                     parsed_args.flavor)
+        block_device_mappings = []
+        for dev_map in parsed_args.block_device_mapping:
+            dev_name, dev_map = dev_map.split('=', 1)
+            if not dev_map:
+                continue
+            dev_map = dev_map.split(':')
+            if not dev_map[0]:
+                msg = _("Volume name or ID must be specified if "
+                        "--block-device-mapping is specified")
+                raise exceptions.CommandError(msg)
+            mapping = {'device_name': dev_name}
+            # Block device mapping v1 compatibility
+            if len(dev_map) > 1 and dev_map[1] in ('volume', 'snapshot'):
+                mapping['source_type'] = dev_map[1]
+            else:
+                mapping['source_type'] = 'volume'
+            mapping['destination_type'] = 'volume'
+            if len(dev_map) > 2:
+                mapping['volume_size'] = dev_map[2]
+            if len(dev_map) > 3:
+                mapping['delete_on_termination'] = dev_map[3]
+            if mapping['source_type'] == 'snapshot':
+                manager = volume_client.volume_snapshots
+            else:
+                manager = volume_client.volumes
+            lookups[('block_device_mapping', len(block_device_mappings))] = (
+                functools.partial(utils.find_resource, manager, dev_map[0]))
+            block_device_mappings.append(mapping)
+
+        nics = []
+        auto_or_none = False
+        network_endpoint_enabled = None
+        for nic_str in parsed_args.nic:
+            # Handle the special auto/none cases
+            if nic_str in ('auto', 'none'):
+                auto_or_none = True
+                nics.append(nic_str)
+                continue
+
+            nic_info = {"net-id": "", "v4-fixed-ip": "",
+                        "v6-fixed-ip": "", "port-id": ""}
+            try:
+                nic_info.update(dict(kv_str.split("=", 1)
+                                for kv_str in nic_str.split(",")))
+            except ValueError:
+                msg = _('Invalid --nic argument %s.') % nic_str
+                raise exceptions.CommandError(msg)
+            if bool(nic_info["net-id"]) == bool(nic_info["port-id"]):
+                msg = _("either net-id or port-id should be specified "
+                        "but not both")
+                raise exceptions.CommandError(msg)
+            if network_endpoint_enabled is None:
+                network_endpoint_enabled = (
+                    self.app.client_manager.is_network_endpoint_enabled())
+            if network_endpoint_enabled:
+                network_client = self.app.client_manager.network
+                if nic_info["net-id"]:
+                    lookup = functools.partial(
+                        network_client.find_network,
+                        nic_info["net-id"],
+                        ignore_missing=False,
+                    )
+                else:
+                    lookup = functools.partial(
+                        network_client.find_port,
+                        nic_info["port-id"],
+                        ignore_missing=False,
+                    )
+            else:
+                if nic_info["port-id"]:
+                    msg = _("can't create server with port specified "
+                            "since network endpoint not enabled")
+                    raise exceptions.CommandError(msg)
+                lookup = functools.partial(
+                    utils.find_resource,
+                    compute_client.networks,
+                    nic_info["net-id"],
+                )
+            lookups[('nic', len(nics))] = lookup
+            nics.append(nic_info)
+
+        if auto_or_none and len(nics) > 1:
+            msg = _('Specifying a --nic of auto or none cannot '
+                    'be used with any other --nic value.')
+            raise exceptions.CommandError(msg)
+
+        resolved = fanout.resolve_all(lookups)
+
+        image = resolved.get('image')
+        volume = resolved['volume'].id if 'volume' in resolved else None
+        flavor = resolved['flavor']
 
         boot_args = [parsed_args.server_name, image, flavor]
 
+        block_device_mapping_v2 = []
+        if volume:
+            block_device_mapping_v2 = [{'uuid': volume,
+                                        'boot_index': '0',
+                                        'source_type': 'volume',
+                                        'destination_type': 'volume'
+                                        }]
+        for i, mapping in enumerate(block_device_mappings):
+            mapping['uuid'] = resolved[('block_device_mapping', i)].id
+            block_device_mapping_v2.append(mapping)
+
+        for i, nic_info in enumerate(nics):
+            if ('nic', i) not in resolved:
+                continue
+            if nic_info["net-id"]:
+                nic_info["net-id"] = resolved[('nic', i)].id
+            else:
+                nic_info["port-id"] = resolved[('nic', i)].id
+
+        if auto_or_none:
+            nics = nics[0]
+
         files = {}
         for f in parsed_args.file:
             dst, src = f.split('=', 1)
@@ -491,16 +705,6 @@ class CreateServer(command.ShowOne):
                            "exception": e}
                 )
 
-        if parsed_args.min > parsed_args.max:
-            msg = _("min instances should be <= max instances")
-            raise exceptions.CommandError(msg)
-        if parsed_args.min < 1:
-            msg = _("min instances should be > 0")
-            raise exceptions.CommandError(msg)
-        if parsed_args.max < 1:
-            msg = _("max instances should be > 0")
-            raise exceptions.CommandError(msg)
-
         userdata = None
         if parsed_args.user_data:
             try:
@@ -512,95 +716,6 @@ class CreateServer(command.ShowOne):
                            "exception": e}
                 )
 
-        block_device_mapping_v2 = []
-        if volume:
-            block_device_mapping_v2 = [{'uuid': volume,
-                                        'boot_index': '0',
-                                        'source_type': 'volume',
-                                        'destination_type': 'volume'
-                                        }]
-        for dev_map in parsed_args.block_device_mapping:
-            dev_name, dev_map = dev_map.split('=', 1)
-            if dev_map:
-                dev_map = dev_map.split(':')
-                if len(dev_map) > 0:
-                    mapping = {
-                        'device_name': dev_name,
-                        'uuid': utils.find_resource(
-                            volume_client.volumes,
-                            dev_map[0],
-                        ).id}
-                    # Block device mapping v1 compatibility
-                    if len(dev_map) > 1 and \
-                            dev_map[1] in ('volume', 'snapshot'):
-                        mapping['source_type'] = dev_map[1]
-                    else:
-                        mapping['source_type'] = 'volume'
-                    mapping['destination_type'] = 'volume'
-                    if len(dev_map) > 2:
-                        mapping['volume_size'] = dev_map[2]
-                    if len(dev_map) > 3:
-                        mapping['delete_on_termination'] = dev_map[3]
-                else:
-                    msg = _("Volume name or ID must be specified if "
-                            "--block-device-mapping is specified")
-                    raise exceptions.CommandError(msg)
-                block_device_mapping_v2.append(mapping)
-
-        nics = []
-        auto_or_none = False
-        for nic_str in parsed_args.nic:
-            # Handle the special auto/none cases
-            if nic_str in ('auto', 'none'):
-                auto_or_none = True
-                nics.append(nic_str)
-            else:
-                nic_info = {"net-id": "", "v4-fixed-ip": "",
-                            "v6-fixed-ip": "", "port-id": ""}
-                try:
-                    nic_info.update(dict(kv_str.split("=", 1)
-                                    for kv_str in nic_str.split(",")))
-                except ValueError:
-                    msg = _('Invalid --nic argument %s.') % nic_str
-                    raise exceptions.CommandError(msg)
-                if bool(nic_info["net-id"]) == bool(nic_info["port-id"]):
-                    msg = _("either net-id or port-id should be specified "
-                            "but not both")
-                    raise exceptions.CommandError(msg)
-                if self.app.client_manager.is_network_endpoint_enabled():
-                    network_client = self.app.client_manager.network
-                    if nic_info["net-id"]:
-                        net = network_client.find_network(
-                            nic_info["net-id"], ignore_missing=False)
-                        nic_info["net-id"] = net.id
-                    if nic_info["port-id"]:
-                        port = network_client.find_port(
-                            nic_info["port-id"], ignore_missing=False)
-                        nic_info["port-id"] = port.id
-                else:
-                    if nic_info["net-id"]:
-                        nic_info["net-id"] = utils.find_resource(
-                            compute_client.networks,
-                            nic_info["net-id"]
-                        ).id
-                    if nic_info["port-id"]:
-                        msg = _("can't create server with port specified "
-                                "since network endpoint not enabled")
-                        raise exceptions.CommandError(msg)
-                nics.append(nic_info)
-
-        if nics:
-            if auto_or_none:
-                if len(nics) > 1:
-                    msg = _('Specifying a --nic of auto or none cannot '
-                            'be used with any other --nic value.')
-                    raise exceptions.CommandError(msg)
-                nics = nics[0]
-        else:
-            # Default to empty list if nothing was specified, let nova side to
-            # decide the default behavior.
-            nics = []
-
         hints = {}
         for hint in parsed_args.hint:
             key, _sep, value = hint.partition('=')
@@ -653,8 +768,10 @@ class CreateServer(command.ShowOne):
             if hasattr(userdata, 'close'):
                 userdata.close()
 
-        if parsed_args.wait:
-            if utils.wait_for_status(
+        if parsed_args.wait and parsed_args.max > 1:
+            self._wait_for_reservation(compute_client, server, parsed_args)
+        elif parsed_args.wait:
+            if waiter.wait_for_status(
                 compute_client.servers.get,
                 server.id,
                 callback=_show_progress,
@@ -666,9 +783,49 @@ class CreateServer(command.ShowOne):
                 sys.stdout.write(_('Error creating server\n'))
                 raise SystemExit
 
-        details = _prep_server_detail(compute_client, image_client, server)
+        details = _prep_server_detail(
+            compute_client,
+            image_client,
+            server,
+            resource_cache=self.app.client_manager.resource_cache,
+        )
         return zip(*sorted(six.iteritems(details)))
 
+    def _wait_for_reservation(self, compute_client, server, parsed_args):
+        """Wait for every server of a multiple create request
+
+        The final status of each server is written as soon as it is known.
+        """
+        search_opts, servers = _find_reservation_servers(
+            compute_client, server, parsed_args.server_name)
+        names = dict((s.id, s.name) for s in servers)
+
+        def _server_done(server_id, success, res):
+            status = getattr(res, 'status', None) or _('timed out')
+            sys.stdout.write('\r%s (%s): %s\n' % (
+                names[server_id], server_id, status))
+
+        server_waiter = waiter.Waiter(
+            compute_client.servers.get,
+            list_f=functools.partial(
+                compute_client.servers.list, search_opts=search_opts),
+            callback=_show_progress,
+            on_done=_server_done,
+        )
+        for s in servers:
+            server_waiter.add(s.id)
+        results = server_waiter.wait()
+
+        failed = [server_id for server_id, ok in results.items() if not ok]
+        if failed:
+            LOG.error(_('Error creating servers (%(failed)s of %(total)s): '
+                        '%(ids)s'),
+                      {'failed': len(failed),
+                       'total': len(servers),
+                       'ids': ', '.join(failed)})
+            sys.stdout.write(_('Error creating server\n'))
+            raise SystemExit
+
 
 class CreateServerDump(command.Command):
     """Create a dump file in server(s)
@@ -718,22 +875,55 @@ class DeleteServer(command.Command):
 
     def take_action(self, parsed_args):
         compute_client = self.app.client_manager.compute
-        for server in parsed_args.server:
+
+        def _delete(server):
             server_obj = utils.find_resource(
                 compute_client.servers, server)
             compute_client.servers.delete(server_obj.id)
-            if parsed_args.wait:
-                if utils.wait_for_delete(
-                    compute_client.servers,
-                    server_obj.id,
-                    callback=_show_progress,
-                ):
-                    sys.stdout.write('\n')
-                else:
-                    LOG.error(_('Error deleting server: %s'),
-                              server_obj.id)
-                    sys.stdout.write(_('Error deleting server\n'))
-                    raise SystemExit
+            return server_obj.id
+
+        # Look up and delete all the servers concurrently
+        workers = max(1, min(len(parsed_args.server),
+                             fanout.DEFAULT_MAX_WORKERS))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            results = [executor.submit(_delete, server)
+                       for server in parsed_args.server]
+
+        ret = 0
+        deleted = collections.OrderedDict()
+        for server, result in zip(parsed_args.server, results):
+            try:
+                deleted[result.result()] = server
+            except Exception as e:
+                LOG.error(_("Failed to delete server with name or ID "
+                            "'%(server)s': %(e)s"),
+                          {'server': server, 'e': e})
+                ret += 1
+
+        if parsed_args.wait and deleted:
+            # Wait for all the deleted servers together
+            server_waiter = waiter.Waiter(
+                compute_client.servers.get,
+                list_f=compute_client.servers.list,
+                delete=True,
+                timeout=300,
+                callback=_show_progress,
+            )
+            for server_id in deleted:
+                server_waiter.add(server_id)
+            for server_id, success in server_waiter.wait().items():
+                if not success:
+                    LOG.error(_("Failed to delete server with name or ID "
+                                "'%(server)s': error status or timed out"),
+                              {'server': deleted[server_id]})
+                    ret += 1
+            sys.stdout.write('\n')
+
+        if ret:
+            total = len(parsed_args.server)
+            msg = (_("%(result)s of %(total)s servers failed "
+                   "to delete.") % {'result': ret, 'total': total})
+            raise exceptions.CommandError(msg)
 
 
 class ListServer(command.Lister):
@@ -849,6 +1039,7 @@ class ListServer(command.Lister):
         compute_client = self.app.client_manager.compute
         identity_client = self.app.client_manager.identity
         image_client = self.app.client_manager.image
+        resource_cache = self.app.client_manager.resource_cache
 
         project_id = None
         if parsed_args.project:
@@ -871,14 +1062,16 @@ class ListServer(command.Lister):
         # flavor name is given, map it to ID.
         flavor_id = None
         if parsed_args.flavor:
-            flavor_id = utils.find_resource(compute_client.flavors,
+            flavor_id = cache.find_resource(resource_cache, 'flavor',
+                                            compute_client.flavors,
                                             parsed_args.flavor).id
 
         # Nova only supports list servers searching by image ID. So if a
         # image name is given, map it to ID.
         image_id = None
         if parsed_args.image:
-            image_id = utils.find_resource(image_client.images,
+            image_id = cache.find_resource(resource_cache, 'image',
+                                           image_client.images,
                                            parsed_args.image).id
 
         search_opts = {
@@ -967,13 +1160,17 @@ class ListServer(command.Lister):
                                            limit=parsed_args.limit)
 
         images = {}
-        # Create a dict that maps image_id to image object.
+        # Create a dict that maps image_id to image name.
         # Needed so that we can display the "Image Name" column.
         # "Image Name" is not crucial, so we swallow any exceptions.
         try:
-            images_list = self.app.client_manager.image.images.list()
-            for i in images_list:
-                images[i.id] = i
+            images = cache.get_or_fetch(
+                resource_cache,
+                'image',
+                'names',
+                lambda: dict(
+                    (i.id, i.name) for i in image_client.images.list()),
+            )
         except Exception:
             pass
 
@@ -981,9 +1178,9 @@ class ListServer(command.Lister):
         # so that we can display "Image Name" and "Image ID" columns.
         for s in data:
             if 'id' in s.image:
-                image = images.get(s.image['id'])
-                if image:
-                    s.image_name = image.name
+                image_name = images.get(s.image['id'])
+                if image_name:
+                    s.image_name = image_name
                 s.image_id = s.image['id']
             else:
                 s.image_name = ''
@@ -1107,7 +1304,7 @@ class MigrateServer(command.Command):
             server.migrate()
 
         if parsed_args.wait:
-            if utils.wait_for_status(
+            if waiter.wait_for_status(
                 compute_client.servers.get,
                 server.id,
                 callback=_show_progress,
@@ -1183,7 +1380,7 @@ class RebootServer(command.Command):
         server.reboot(parsed_args.reboot_type)
 
         if parsed_args.wait:
-            if utils.wait_for_status(
+            if waiter.wait_for_status(
                 compute_client.servers.get,
                 server.id,
                 callback=_show_progress,
@@ -1237,7 +1434,7 @@ class RebuildServer(command.ShowOne):
 
         server = server.rebuild(image, parsed_args.password)
         if parsed_args.wait:
-            if utils.wait_for_status(
+            if waiter.wait_for_status(
                 compute_client.servers.get,
                 server.id,
                 callback=_show_progress,
@@ -1249,7 +1446,12 @@ class RebuildServer(command.ShowOne):
                 sys.stdout.write(_('Error rebuilding server\n'))
                 raise SystemExit
 
-        details = _prep_server_detail(compute_client, image_client, server)
+        details = _prep_server_detail(
+            compute_client,
+            image_client,
+            server,
+            resource_cache=self.app.client_manager.resource_cache,
+        )
         return zip(*sorted(six.iteritems(details)))
 
 
@@ -1445,7 +1647,7 @@ class ResizeServer(command.Command):
             )
             compute_client.servers.resize(server, flavor)
             if parsed_args.wait:
-                if utils.wait_for_status(
+                if waiter.wait_for_status(
                     compute_client.servers.get,
                     server.id,
                     success_status=['active', 'verify_resize'],
@@ -1624,8 +1826,13 @@ class ShowServer(command.ShowOne):
                 sys.stderr.write(_("Error retrieving diagnostics data\n"))
                 return ({}, {})
         else:
-            data = _prep_server_detail(compute_client,
-                                       self.app.client_manager.image, server)
+            data = _prep_server_detail(
+                compute_client,
+                self.app.client_manager.image,
+                server,
+                refresh=False,
+                resource_cache=self.app.client_manager.resource_cache,
+            )
 
         return zip(*sorted(six.iteritems(data)))
 
@@ -24,6 +24,7 @@ from osc_lib import utils
 from oslo_utils import importutils
 import six
 
+from openstackclient.common import waiter
 from openstackclient.i18n import _
 
 
@@ -87,7 +88,7 @@ class CreateServerImage(command.ShowOne):
         )
 
         if parsed_args.wait:
-            if utils.wait_for_status(
+            if waiter.wait_for_status(
                 image_client.images.get,
                 image_id,
                 callback=_show_progress,
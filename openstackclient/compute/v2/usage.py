@@ -15,9 +15,12 @@
 
 """Usage action implementations"""
 
+import collections
 import datetime
 import sys
 
+from concurrent import futures
+from novaclient import api_versions
 from osc_lib.command import command
 from osc_lib import utils
 import six
@@ -25,6 +28,75 @@ import six
 from openstackclient.i18n import _
 
 
+_TOTALS = (
+    'total_memory_mb_usage',
+    'total_vcpus_usage',
+    'total_local_gb_usage',
+)
+
+
+def _merge_usage_list(usages, usage_list):
+    """Add a page of project usages to the totals of each project
+
+    Only the number of servers is kept from the server usages, so a page
+    can be freed as soon as it is merged.  A project may be split across
+    pages when it has more servers than the page size.
+    """
+    for u in usage_list:
+        total = usages.get(u.tenant_id)
+        if total is None:
+            total = usages[u.tenant_id] = dict(
+                [('tenant_id', u.tenant_id), ('server_usages', 0)] +
+                [(key, 0.0) for key in _TOTALS]
+            )
+        total['server_usages'] += len(getattr(u, 'server_usages', []))
+        for key in _TOTALS:
+            total[key] += getattr(u, key, 0.0)
+
+
+def _get_usage_list_marker(usage_list):
+    """Return the ID of the last server of a page, None if empty"""
+    if usage_list:
+        server_usages = getattr(usage_list[-1], 'server_usages', None)
+        if server_usages:
+            return server_usages[-1]['instance_id']
+    return None
+
+
+def _list_usages(compute_client, start, end):
+    """Return the usage totals of every project by project ID
+
+    Since microversion 2.40 the usages are listed page by page, up to the
+    server's page size, so the detailed server usages of the whole range
+    are never held in memory at once.
+    """
+    usages = collections.OrderedDict()
+    if compute_client.api_version < api_versions.APIVersion("2.40"):
+        _merge_usage_list(
+            usages, compute_client.usage.list(start, end, detailed=True))
+        return usages
+
+    marker = None
+    while True:
+        kwargs = {}
+        if marker:
+            kwargs['marker'] = marker
+        usage_list = compute_client.usage.list(
+            start, end, detailed=True, **kwargs)
+        _merge_usage_list(usages, usage_list)
+        marker = _get_usage_list_marker(usage_list)
+        if not marker:
+            return usages
+
+
+def _list_projects(identity_client):
+    try:
+        return dict((p.id, p) for p in identity_client.projects.list())
+    except Exception:
+        # Just forget it if there's any trouble
+        return {}
+
+
 class ListUsage(command.Lister):
     _description = _("List resource usage per project")
 
@@ -84,34 +156,29 @@ class ListUsage(command.Lister):
         else:
             end = now + datetime.timedelta(days=1)
 
-        usage_list = compute_client.usage.list(start, end, detailed=True)
-
-        # Cache the project list
-        project_cache = {}
-        try:
-            for p in self.app.client_manager.identity.projects.list():
-                project_cache[p.id] = p
-        except Exception:
-            # Just forget it if there's any trouble
-            pass
+        # Cache the project list while the usages are listed
+        with futures.ThreadPoolExecutor(max_workers=1) as executor:
+            projects = executor.submit(
+                _list_projects, self.app.client_manager.identity)
+            usages = _list_usages(compute_client, start, end)
+        project_cache = projects.result()
 
-        if parsed_args.formatter == 'table' and len(usage_list) > 0:
+        if parsed_args.formatter == 'table' and len(usages) > 0:
             sys.stdout.write(_("Usage from %(start)s to %(end)s: \n") % {
                 "start": start.strftime(dateformat),
                 "end": end.strftime(dateformat),
             })
 
         return (column_headers,
-                (utils.get_item_properties(
+                (utils.get_dict_properties(
                     s, columns,
                     formatters={
                         'tenant_id': _format_project,
-                        'server_usages': lambda x: len(x),
                         'total_memory_mb_usage': lambda x: float("%.2f" % x),
                         'total_vcpus_usage': lambda x: float("%.2f" % x),
                         'total_local_gb_usage': lambda x: float("%.2f" % x),
                     },
-                ) for s in usage_list))
+                ) for s in usages.values()))
 
 
 class ShowUsage(command.ShowOne):
@@ -15,6 +15,7 @@
 
 """Common identity code"""
 
+from keystoneauth1 import access
 from keystoneclient import exceptions as identity_exc
 from keystoneclient.v3 import domains
 from keystoneclient.v3 import groups
@@ -58,6 +59,36 @@ def find_service(identity_client, name_type_or_id):
         raise exceptions.CommandError(msg % name_type_or_id)
 
 
+def _get_auth_ref_resource(client, resource):
+    """Look up a resource's ID and name in the cached auth_ref
+
+    The session's auth plugin already holds the AccessInfo returned when the
+    token was issued, so the project, domain and user of the token's scope
+    can be read without another round trip to keystone.
+
+    :param client: An identity client
+    :param resource: A resource to look at in the auth_ref, this may be
+                     `domain`, `project_domain`, `user_domain`, `project`,
+                     or `user`.
+
+    :returns: A tuple of (id, name) for the resource, or None if the session
+              has no usable auth_ref.
+    """
+
+    try:
+        auth_ref = client.session.auth.get_access(client.session)
+    except AttributeError:
+        # Plugins such as token_endpoint do not carry an auth_ref
+        return None
+    if not isinstance(auth_ref, access.AccessInfo):
+        return None
+
+    # A domain is looked up as the project domain, like the token does
+    attr = 'project_domain' if resource == 'domain' else resource
+    return (getattr(auth_ref, attr + '_id'),
+            getattr(auth_ref, attr + '_name'))
+
+
 def _get_token_resource(client, resource, parsed_name):
     """Peek into the user's auth token to get resource IDs
 
@@ -66,6 +97,10 @@ def _get_token_resource(client, resource, parsed_name):
     the CLI using names. However, by default, keystone does not allow look up
     by name since it would involve listing all entities. Instead opt to use
     the correct ID (from the token) instead.
+
+    The auth_ref cached by the session is consulted first; the token is only
+    validated against keystone when no auth_ref is available.
+
     :param client: An identity client
     :param resource: A resource to look at in the token, this may be `domain`,
                      `project_domain`, `user_domain`, `project`, or `user`.
@@ -77,6 +112,11 @@ def _get_token_resource(client, resource, parsed_name):
     """
 
     try:
+        obj = _get_auth_ref_resource(client, resource)
+        if obj is not None:
+            obj_id, obj_name = obj
+            return obj_id if obj_name == parsed_name else parsed_name
+
         token = client.auth.client.get_token()
         token_data = client.tokens.get_token_data(token)
         token_dict = token_data['token']
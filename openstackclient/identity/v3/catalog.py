@@ -49,7 +49,7 @@ class ListCatalog(command.Lister):
                 "Only an authorized user may issue a new token."
             )
 
-        data = auth_ref.service_catalog.catalog
+        data = self.app.client_manager.catalog_index.catalog
         columns = ('Name', 'Type', 'Endpoints')
         return (columns,
                 (utils.get_dict_properties(
@@ -82,14 +82,14 @@ class ShowCatalog(command.ShowOne):
             )
 
         data = None
-        for service in auth_ref.service_catalog.catalog:
-            if (service.get('name') == parsed_args.service or
-                    service.get('type') == parsed_args.service):
-                data = dict(service)
-                data['endpoints'] = _format_endpoints(data['endpoints'])
-                if 'links' in data:
-                    data.pop('links')
-                break
+        service = self.app.client_manager.catalog_index.find_service(
+            parsed_args.service,
+        )
+        if service:
+            data = dict(service)
+            data['endpoints'] = _format_endpoints(data['endpoints'])
+            if 'links' in data:
+                data.pop('links')
 
         if not data:
             LOG.error(_('service %s not found\n'), parsed_args.service)
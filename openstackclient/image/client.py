@@ -51,11 +51,16 @@ def make_client(instance):
         interface=instance.interface,
     )
 
+    # Defer client import until we actually need them
+    from glanceclient.common import utils as glance_utils
+
+    # Use the session of the other clients, glanceclient adds the version
+    # to the paths itself
     client = image_client(
-        endpoint,
-        token=instance.auth.get_token(instance.session),
-        cacert=instance.cacert,
-        insecure=not instance.verify,
+        session=instance.session,
+        endpoint_override=glance_utils.strip_version(endpoint)[0],
+        region_name=instance.region_name,
+        interface=instance.interface,
     )
 
     # Create the low-level API
@@ -15,6 +15,7 @@ import logging
 
 from openstack import connection
 from openstack import profile
+from openstack import session
 from osc_lib import utils
 
 from openstackclient.i18n import _
@@ -37,10 +38,16 @@ def make_client(instance):
     prof.set_region(API_NAME, instance.region_name)
     prof.set_version(API_NAME, instance._api_version[API_NAME])
     prof.set_interface(API_NAME, instance.interface)
-    conn = connection.Connection(authenticator=instance.session.auth,
-                                 verify=instance.session.verify,
-                                 cert=instance.session.cert,
-                                 profile=prof)
+    # The SDK needs its own Session class, build it on the requests session
+    # of the other clients so they share the connection pools
+    sdk_session = session.Session(
+        prof,
+        auth=instance.session.auth,
+        verify=instance.session.verify,
+        cert=instance.session.cert,
+        session=instance.session.session,
+    )
+    conn = connection.Connection(session=sdk_session, profile=prof)
     LOG.debug('Connection: %s', conn)
     LOG.debug('Network client initialized using OpenStack SDK: %s',
               conn.network)
@@ -12,6 +12,7 @@
 #
 
 import abc
+import itertools
 import logging
 
 import openstack.exceptions
@@ -19,11 +20,290 @@ from osc_lib.command import command
 from osc_lib import exceptions
 import six
 
+from openstackclient.common import fanout
 from openstackclient.i18n import _
 
 
 LOG = logging.getLogger(__name__)
 
+# Resources requested per page by the listings that page through results
+DEFAULT_PAGE_SIZE = 500
+# Resources sent per request by bulk creates
+DEFAULT_BULK_SIZE = 100
+
+
+def iter_pages(list_f, page_size=DEFAULT_PAGE_SIZE, marker=None,
+               marker_attr='id', **query):
+    """Yield the resources of a listing page by page
+
+    Only one page is held at a time.  The SDK proxy listing methods return a
+    single page when given a limit, the next page starts after the last
+    resource of the previous one.
+
+    :param list_f: an SDK proxy listing method, e.g.
+                   ``client.security_group_rules``
+    :param page_size: the number of resources per request
+    :param marker: the ID of the resource to start after
+    :param marker_attr: the attribute holding the ID of a resource, for
+                        the resources identified by another attribute
+    :param query: the filters of the listing
+    """
+    previous_ids = set()
+    while True:
+        if marker is not None:
+            query['marker'] = marker
+        page_marker = marker
+        page_ids = set()
+        for resource in list_f(limit=page_size, **query):
+            resource_id = getattr(resource, marker_attr)
+            # A server that ignores the marker returns the same page again
+            if resource_id in previous_ids:
+                return
+            page_ids.add(resource_id)
+            marker = resource_id
+            yield resource
+        # A short page is the last one; a server that ignores the limit
+        # returns more than a page, usually everything at once
+        if len(page_ids) != page_size or marker == page_marker:
+            return
+        previous_ids = page_ids
+
+
+def add_pagination_options(parser):
+    parser.add_argument(
+        '--page-size',
+        metavar='<page-size>',
+        type=int,
+        help=_("Number of resources to request at a time; the rows are "
+               "shown as the pages arrive with the value and csv formats "
+               "(default: all at once, or %s with --limit or --marker)")
+        % DEFAULT_PAGE_SIZE,
+    )
+    parser.add_argument(
+        '--limit',
+        metavar='<limit>',
+        type=int,
+        help=_("Maximum number of resources to list"),
+    )
+    parser.add_argument(
+        '--marker',
+        metavar='<marker>',
+        help=_("List the resources after this one (ID only)"),
+    )
+
+
+def list_resources(list_f, parsed_args, default_page_size=None,
+                   marker_attr='id', **query):
+    """List resources with the pagination options of a command
+
+    Without ``--page-size``, ``--limit`` or ``--marker`` the resources are
+    listed with a single request, unless default_page_size is set.
+
+    :param list_f: an SDK proxy listing method, e.g. ``client.ports``
+    :param parsed_args: the arguments of a command that called
+                        :func:`add_pagination_options`
+    :param default_page_size: page through the resources even without
+                              pagination options
+    :param marker_attr: the attribute holding the ID of a resource
+    :param query: the filters of the listing
+    :returns: an iterable of the resources
+    """
+    page_size = getattr(parsed_args, 'page_size', None)
+    limit = getattr(parsed_args, 'limit', None)
+    marker = getattr(parsed_args, 'marker', None)
+    for option, value in (('--page-size', page_size), ('--limit', limit)):
+        if value is not None and value < 1:
+            msg = _("%(option)s must be at least 1, not %(value)s")
+            raise exceptions.CommandError(msg % {
+                'option': option,
+                'value': value,
+            })
+
+    if page_size is None and limit is None and marker is None:
+        if default_page_size is None:
+            return list_f(**query)
+        page_size = default_page_size
+    page_size = page_size or DEFAULT_PAGE_SIZE
+    if limit is not None:
+        page_size = min(page_size, limit)
+    resources = iter_pages(list_f, page_size=page_size, marker=marker,
+                           marker_attr=marker_attr, **query)
+    if limit is not None:
+        resources = itertools.islice(resources, limit)
+    return resources
+
+
+def bulk_create(client, resource_type, attrs_list,
+                batch_size=DEFAULT_BULK_SIZE):
+    """Create several resources of one type with bulk requests
+
+    Neutron creates either all of the resources of a request or none of
+    them; the requests are made one after the other and stop at the first
+    failure, whose error lists the resources created by the earlier
+    requests.  The SDK has no bulk create, so the requests are made with
+    the session of the network proxy, the same way the SDK creates a single
+    resource.
+
+    :param client: the network proxy
+    :param resource_type: an SDK resource class, e.g. ``SecurityGroupRule``
+    :param attrs_list: a list of dicts of attributes, one per resource
+    :param batch_size: the number of resources per request
+    :returns: a list of the created resources, in the order of attrs_list
+    """
+    created = []
+    for start in range(0, len(attrs_list), batch_size):
+        body = [
+            resource_type.new(**attrs)._prepare_request(
+                requires_id=False).body
+            for attrs in attrs_list[start:start + batch_size]
+        ]
+        try:
+            response = client._session.post(
+                resource_type.base_path,
+                endpoint_filter=resource_type.service,
+                json={resource_type.resources_key: body},
+                headers={'Accept': 'application/json'},
+            )
+        except Exception as e:
+            if not created:
+                raise
+            # The earlier requests were not rolled back
+            msg = _("%(e)s\n%(count)s %(resources)s were created by the "
+                    "earlier requests: %(ids)s")
+            raise exceptions.CommandError(msg % {
+                'e': e,
+                'count': len(created),
+                'resources': resource_type.resources_key,
+                'ids': ', '.join(resource.id for resource in created),
+            })
+        created.extend(
+            resource_type.existing(**data)
+            for data in response.json()[resource_type.resources_key]
+        )
+    return created
+
+
+def list_by_ids(client, resource_type, ids, fields=None,
+                batch_size=DEFAULT_BULK_SIZE):
+    """List the resources of one type with the given IDs
+
+    The SDK drops the ``id`` filter, missing from the query parameters of
+    its resources, so the listings are made with the session of the network
+    proxy.  The IDs are sent in batches to bound the length of the URL.
+
+    :param client: the network proxy
+    :param resource_type: an SDK resource class, e.g. ``Network``
+    :param ids: the IDs of the resources
+    :param fields: the fields to return, all of them by default
+    :param batch_size: the number of IDs per request
+    :returns: a list of the resources found, missing IDs are skipped
+    """
+    ids = sorted(set(ids))
+    found = []
+    for start in range(0, len(ids), batch_size):
+        params = {'id': ids[start:start + batch_size]}
+        if fields:
+            params['fields'] = list(fields)
+        response = client._session.get(
+            resource_type.base_path,
+            endpoint_filter=resource_type.service,
+            params=params,
+            headers={'Accept': 'application/json'},
+        )
+        found.extend(
+            resource_type.existing(**data)
+            for data in response.json()[resource_type.resources_key]
+        )
+    return found
+
+
+def add_count_option(parser, help_text=None):
+    if help_text is None:
+        help_text = _("Number of resources to create, in bulk requests of "
+                      "up to %s resources (default: 1). The index of each "
+                      "resource, starting at 1, replaces {index} in the "
+                      "name or is appended to it") % DEFAULT_BULK_SIZE
+    parser.add_argument(
+        '--count',
+        metavar='<count>',
+        type=int,
+        default=1,
+        help=help_text,
+    )
+
+
+def get_count(parsed_args):
+    count = getattr(parsed_args, 'count', 1)
+    if count < 1:
+        msg = _("--count must be at least 1, not %s")
+        raise exceptions.CommandError(msg % count)
+    return count
+
+
+def add_concurrency_option(parser):
+    parser.add_argument(
+        '--concurrency',
+        metavar='<concurrency>',
+        type=int,
+        default=fanout.DEFAULT_MAX_WORKERS,
+        help=_("Maximum number of requests to make at a time "
+               "(default: %s)") % fanout.DEFAULT_MAX_WORKERS,
+    )
+
+
+def get_concurrency(parsed_args):
+    concurrency = getattr(parsed_args, 'concurrency',
+                          fanout.DEFAULT_MAX_WORKERS)
+    if concurrency < 1:
+        msg = _("--concurrency must be at least 1, not %s")
+        raise exceptions.CommandError(msg % concurrency)
+    return concurrency
+
+
+def expand_names(name, count):
+    """Return the names of the resources of a bulk create
+
+    A single resource keeps the name as given.  Otherwise the index of each
+    resource, starting at 1, replaces ``{index}`` in the name or is appended
+    to it.
+    """
+    if count == 1 or name is None:
+        return [name] * count
+    if '{index}' in name:
+        return [name.replace('{index}', str(index))
+                for index in range(1, count + 1)]
+    return ['%s-%d' % (name, index) for index in range(1, count + 1)]
+
+
+class BulkCreateMixin(object):
+    """Show the resources of a create command with ``--count``
+
+    ``take_action`` returns the columns and an iterable of rows, one per
+    resource, when more than one resource was created; they are shown as a
+    list by the formatters that can, one resource after the other by the
+    others.
+    """
+
+    def produce_output(self, parsed_args, column_names, data):
+        if getattr(parsed_args, 'count', 1) <= 1:
+            return super(BulkCreateMixin, self).produce_output(
+                parsed_args, column_names, data)
+        columns, selector = self._generate_columns_and_selector(
+            parsed_args, column_names)
+        if selector:
+            # Keep the rows a generator when they are one, so they are
+            # shown as they arrive by the formatters that stream
+            data = (list(self._compress_iterable(row, selector))
+                    for row in data)
+        if hasattr(self.formatter, 'emit_list'):
+            self.formatter.emit_list(
+                columns, data, self.app.stdout, parsed_args)
+        else:
+            for row in data:
+                self.formatter.emit_one(
+                    columns, row, self.app.stdout, parsed_args)
+        return 0
+
 
 @six.add_metaclass(abc.ABCMeta)
 class NetworkAndComputeCommand(command.Command):
@@ -10,31 +10,66 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+from openstack import resource2
 import six
 
 
-# Get the OSC show command display and attribute columns for an SDK resource.
-def get_osc_show_columns_for_sdk_resource(sdk_resource, osc_column_map):
-    if getattr(sdk_resource, 'allow_get', None) is not None:
-        resource_dict = sdk_resource.to_dict(
-            body=True, headers=False, ignore_none=False)
-    else:
-        resource_dict = sdk_resource
+# The body attribute names of each SDK resource class
+_body_attrs_cache = {}
+# The display and attribute columns of each set of attribute names and
+# column map
+_columns_cache = {}
+
+
+def _get_body_attrs(resource_class):
+    """Return the names of the body attributes of an SDK resource class
+
+    These are the keys of ``to_dict(body=True, headers=False)``, which only
+    depend on the class, so they are found once without reading any value.
+    """
+    try:
+        return _body_attrs_cache[resource_class]
+    except KeyError:
+        pass
+    attrs = set()
+    for klass in resource_class.__mro__:
+        for key, value in klass.__dict__.items():
+            if isinstance(value, resource2.Body):
+                attrs.add(key)
+    attrs = frozenset(attrs)
+    _body_attrs_cache[resource_class] = attrs
+    return attrs
+
+
+def _get_columns(attrs, column_map_items):
+    key = (attrs, column_map_items)
+    try:
+        return _columns_cache[key]
+    except KeyError:
+        pass
 
     # Build the OSC column names to display for the SDK resource.
     attr_map = {}
-    display_columns = list(resource_dict.keys())
-    for sdk_attr, osc_attr in six.iteritems(osc_column_map):
+    display_columns = set(attrs)
+    for sdk_attr, osc_attr in column_map_items:
         if sdk_attr in display_columns:
             attr_map[osc_attr] = sdk_attr
-            display_columns.remove(sdk_attr)
-        if osc_attr not in display_columns:
-            display_columns.append(osc_attr)
-    sorted_display_columns = sorted(display_columns)
+            display_columns.discard(sdk_attr)
+        display_columns.add(osc_attr)
+    sorted_display_columns = tuple(sorted(display_columns))
 
     # Build the SDK attribute names for the OSC column names.
-    attr_columns = []
-    for column in sorted_display_columns:
-        new_column = attr_map[column] if column in attr_map else column
-        attr_columns.append(new_column)
-    return tuple(sorted_display_columns), tuple(attr_columns)
+    attr_columns = tuple(attr_map.get(column, column)
+                         for column in sorted_display_columns)
+    columns = (sorted_display_columns, attr_columns)
+    _columns_cache[key] = columns
+    return columns
+
+
+# Get the OSC show command display and attribute columns for an SDK resource.
+def get_osc_show_columns_for_sdk_resource(sdk_resource, osc_column_map):
+    if getattr(sdk_resource, 'allow_get', None) is not None:
+        attrs = _get_body_attrs(type(sdk_resource))
+    else:
+        attrs = frozenset(sdk_resource.keys())
+    return _get_columns(attrs, tuple(six.iteritems(osc_column_map)))
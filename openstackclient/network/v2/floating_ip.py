@@ -13,11 +13,15 @@
 
 """IP Floating action implementations"""
 
+import itertools
 import logging
 
+from concurrent import futures
 from openstack import exceptions as sdk_exceptions
 from openstack.network.v2 import floating_ip as _floating_ip
+from osc_lib import exceptions
 from osc_lib import utils
+from oslo_utils import netutils
 
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
@@ -25,6 +29,9 @@ from openstackclient.network import common
 from openstackclient.network import sdk_utils
 
 
+LOG = logging.getLogger(__name__)
+
+
 def _get_network_columns(item):
     column_map = {
         'tenant_id': 'project_id',
@@ -133,7 +140,34 @@ def _find_floating_ip(
         "No %s found for %s" % (_floating_ip.FloatingIP.__name__, name_or_id))
 
 
-class CreateFloatingIP(common.NetworkAndComputeShowOne):
+def _create_floating_ips(client, attrs, count, max_workers, failures):
+    """Yield floating IPs as they are allocated
+
+    The creates run concurrently, each one allocating a floating IP with
+    the same attributes.  A failed create is logged and added to failures
+    instead of stopping the others.
+    """
+    executor = futures.ThreadPoolExecutor(
+        max_workers=max(1, min(count, max_workers)))
+    results = []
+    try:
+        for _i in range(count):
+            results.append(executor.submit(client.create_ip, **attrs))
+        for result in futures.as_completed(results):
+            try:
+                yield result.result()
+            except Exception as e:
+                LOG.error(_("Failed to create floating IP: %s"), e)
+                failures.append(e)
+    finally:
+        # Do not start the creates left when the output is interrupted
+        for result in results:
+            result.cancel()
+        executor.shutdown(wait=True)
+
+
+class CreateFloatingIP(common.BulkCreateMixin,
+                       common.NetworkAndComputeShowOne):
     _description = _("Create floating IP")
 
     def update_parser_common(self, parser):
@@ -183,10 +217,41 @@ class CreateFloatingIP(common.NetworkAndComputeShowOne):
             help=_("Owner's project (name or ID)")
         )
         identity_common.add_project_domain_option_to_parser(parser)
+        common.add_count_option(
+            parser,
+            help_text=_("Number of floating IPs to allocate (default: 1)"),
+        )
+        common.add_concurrency_option(parser)
         return parser
 
     def take_action_network(self, client, parsed_args):
+        count = common.get_count(parsed_args)
+        if count > 1:
+            for option in ('port', 'floating_ip_address',
+                           'fixed_ip_address'):
+                if getattr(parsed_args, option):
+                    msg = _("--%s cannot be used with --count") % (
+                        option.replace('_', '-'))
+                    raise exceptions.CommandError(msg)
+        # Resolve the network and the other references once for all the
+        # floating IPs
         attrs = _get_attrs(self.app.client_manager, parsed_args)
+
+        if count > 1:
+            self._failures = []
+            objs = _create_floating_ips(
+                client, attrs, count,
+                common.get_concurrency(parsed_args), self._failures)
+            # The columns are those of the first floating IP allocated
+            first = next(objs, None)
+            if first is None:
+                msg = _("Failed to create %s floating IPs") % count
+                raise exceptions.CommandError(msg)
+            display_columns, columns = _get_network_columns(first)
+            data = (utils.get_item_properties(obj, columns)
+                    for obj in itertools.chain([first], objs))
+            return (display_columns, data)
+
         obj = client.create_ip(**attrs)
         display_columns, columns = _get_network_columns(obj)
         data = utils.get_item_properties(obj, columns)
@@ -198,6 +263,21 @@ class CreateFloatingIP(common.NetworkAndComputeShowOne):
         data = utils.get_dict_properties(obj._info, columns)
         return (columns, data)
 
+    def produce_output(self, parsed_args, column_names, data):
+        ret = super(CreateFloatingIP, self).produce_output(
+            parsed_args, column_names, data)
+        # The rows of the floating IPs allocated are shown before the
+        # failures of the others are reported
+        failures = getattr(self, '_failures', None)
+        if failures:
+            msg = _("%(num)s of %(total)s floating IPs failed to "
+                    "create.") % {
+                'num': len(failures),
+                'total': parsed_args.count,
+            }
+            raise exceptions.CommandError(msg)
+        return ret
+
 
 class CreateIPFloating(CreateFloatingIP):
     _description = _("Create floating IP")
@@ -239,14 +319,54 @@ class DeleteFloatingIP(common.NetworkAndComputeDelete):
         )
         return parser
 
+    def update_parser_network(self, parser):
+        common.add_concurrency_option(parser)
+        return parser
+
     def take_action_network(self, client, parsed_args):
-        (obj, self.ip_cache) = _find_floating_ip(
-            self.app.client_manager.sdk_connection.session,
-            self.ip_cache,
-            self.r,
-            ignore_missing=False,
-        )
-        client.delete_ip(obj)
+        """Delete all the floating IPs concurrently"""
+        session = self.app.client_manager.sdk_connection.session
+        max_workers = common.get_concurrency(parsed_args)
+        if any(netutils.is_valid_ip(ip) for ip in parsed_args.floating_ip):
+            # Floating IPs are found by address in a listing, list them
+            # once for all the addresses rather than in each worker
+            self.ip_cache = list(_floating_ip.FloatingIP.list(session))
+
+        def _delete(name_or_id):
+            (obj, _ip_cache) = _find_floating_ip(
+                session,
+                self.ip_cache,
+                name_or_id,
+                ignore_missing=False,
+            )
+            client.delete_ip(obj)
+
+        workers = max(1, min(len(parsed_args.floating_ip), max_workers))
+        with futures.ThreadPoolExecutor(max_workers=workers) as executor:
+            results = [executor.submit(_delete, ip)
+                       for ip in parsed_args.floating_ip]
+
+        ret = 0
+        for ip, result in zip(parsed_args.floating_ip, results):
+            try:
+                result.result()
+            except Exception as e:
+                msg = _("Failed to delete %(resource)s with name or ID "
+                        "'%(name_or_id)s': %(e)s") % {
+                            "resource": self.resource,
+                            "name_or_id": ip,
+                            "e": e,
+                }
+                LOG.error(msg)
+                ret += 1
+
+        if ret:
+            msg = _("%(num)s of %(total)s %(resource)ss failed to delete.") % {
+                "num": ret,
+                "total": len(parsed_args.floating_ip),
+                "resource": self.resource,
+            }
+            raise exceptions.CommandError(msg)
 
     def take_action_compute(self, client, parsed_args):
         obj = utils.find_resource(client.floating_ips, self.r)
@@ -260,7 +380,12 @@ class DeleteFloatingIP(common.NetworkAndComputeDelete):
         #                in a single command. In an interactive session
         #                each delete command will call list().
         self.ip_cache = []
-        super(DeleteFloatingIP, self).take_action(parsed_args)
+        if self.app.client_manager.is_network_endpoint_enabled():
+            # The network floating IPs are deleted all at once
+            self.take_action_network(self.app.client_manager.network,
+                                     parsed_args)
+        else:
+            super(DeleteFloatingIP, self).take_action(parsed_args)
 
 
 class DeleteIPFloating(DeleteFloatingIP):
@@ -338,6 +463,7 @@ class ListFloatingIP(common.NetworkAndComputeLister):
                    "given router (name or ID)")
         )
 
+        common.add_pagination_options(parser)
         return parser
 
     def take_action_network(self, client, parsed_args):
@@ -399,7 +525,7 @@ class ListFloatingIP(common.NetworkAndComputeLister):
                                                 ignore_missing=False)
             query['router_id'] = router.id
 
-        data = client.ips(**query)
+        data = common.list_resources(client.ips, parsed_args, **query)
 
         return (headers,
                 (utils.get_item_properties(
@@ -18,6 +18,7 @@ from osc_lib import utils
 
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
+from openstackclient.network import common
 from openstackclient.network import sdk_utils
 
 _formatters = {
@@ -55,6 +56,7 @@ class ListIPAvailability(command.Lister):
             help=_("List IP availability of given project (name or ID)"),
         )
         identity_common.add_project_domain_option_to_parser(parser)
+        common.add_pagination_options(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -86,7 +88,10 @@ class ListIPAvailability(command.Lister):
             ).id
             filters['tenant_id'] = project_id
             filters['project_id'] = project_id
-        data = client.network_ip_availabilities(**filters)
+        # IP availabilities are identified by the ID of their network
+        data = common.list_resources(client.network_ip_availabilities,
+                                     parsed_args, marker_attr='network_id',
+                                     **filters)
         return (column_headers,
                 (utils.get_item_properties(
                     s, columns,
@@ -13,6 +13,7 @@
 
 """Network action implementations"""
 
+from openstack.network.v2 import network as sdk_network
 from osc_lib.command import command
 from osc_lib import utils
 
@@ -185,7 +186,8 @@ def _get_attrs_compute(client_manager, parsed_args):
 
 # TODO(sindhu): Use the SDK resource mapped attribute names once the
 # OSC minimum requirements include SDK 1.0.
-class CreateNetwork(common.NetworkAndComputeShowOne):
+class CreateNetwork(common.BulkCreateMixin,
+                    common.NetworkAndComputeShowOne):
     _description = _("Create new network")
 
     def update_parser_common(self, parser):
@@ -285,6 +287,7 @@ class CreateNetwork(common.NetworkAndComputeShowOne):
             help=_("QoS policy to attach to this network (name or ID)")
         )
         _add_additional_network_options(parser)
+        common.add_count_option(parser)
         return parser
 
     def update_parser_compute(self, parser):
@@ -296,7 +299,21 @@ class CreateNetwork(common.NetworkAndComputeShowOne):
         return parser
 
     def take_action_network(self, client, parsed_args):
+        count = common.get_count(parsed_args)
         attrs = _get_attrs(self.app.client_manager, parsed_args)
+        if count > 1:
+            objs = common.bulk_create(
+                client,
+                sdk_network.Network,
+                [dict(attrs, name=name)
+                 for name in common.expand_names(attrs.get('name'), count)],
+            )
+            display_columns, columns = _get_network_columns(objs[0])
+            data = [utils.get_item_properties(obj, columns,
+                                              formatters=_formatters)
+                    for obj in objs]
+            return (display_columns, data)
+
         obj = client.create_network(**attrs)
         display_columns, columns = _get_network_columns(obj)
         data = utils.get_item_properties(obj, columns, formatters=_formatters)
@@ -421,6 +438,7 @@ class ListNetwork(common.NetworkAndComputeLister):
                    "or Tunnel ID for GENEVE/GRE/VXLAN networks")
         )
 
+        common.add_pagination_options(parser)
         return parser
 
     def take_action_network(self, client, parsed_args):
@@ -510,7 +528,7 @@ class ListNetwork(common.NetworkAndComputeLister):
             args['provider:segmentation_id'] = parsed_args.segmentation_id
             args['provider_segmentation_id'] = parsed_args.segmentation_id
 
-        data = client.networks(**args)
+        data = common.list_resources(client.networks, parsed_args, **args)
 
         return (column_headers,
                 (utils.get_item_properties(
@@ -0,0 +1,297 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+"""Network topology action implementations"""
+
+import collections
+import json
+import logging
+
+from openstack.network.v2 import network as sdk_network
+from openstack.network.v2 import subnet as sdk_subnet
+from osc_lib.command import command
+from osc_lib import exceptions
+from osc_lib import utils
+
+from openstackclient.common import fanout
+from openstackclient.i18n import _
+from openstackclient.identity import common as identity_common
+from openstackclient.network import common
+from openstackclient.network import sdk_utils
+
+
+LOG = logging.getLogger(__name__)
+
+# Device owners of the ports plugging a router into a subnet
+_ROUTER_INTERFACE_OWNERS = (
+    'network:router_interface',
+    'network:router_interface_distributed',
+    'network:ha_router_replicated_interface',
+)
+
+# The SDK attributes shown under another name by the show commands
+_COLUMN_MAPS = {
+    'router': {
+        'tenant_id': 'project_id',
+        'is_ha': 'ha',
+        'is_distributed': 'distributed',
+        'is_admin_state_up': 'admin_state_up',
+    },
+    'network': {
+        'tenant_id': 'project_id',
+    },
+    'subnet': {
+        'is_dhcp_enabled': 'enable_dhcp',
+        'subnet_pool_id': 'subnetpool_id',
+        'tenant_id': 'project_id',
+    },
+    'port': {
+        'binding:host_id': 'binding_host_id',
+        'binding:profile': 'binding_profile',
+        'binding:vif_details': 'binding_vif_details',
+        'binding:vif_type': 'binding_vif_type',
+        'binding:vnic_type': 'binding_vnic_type',
+        'is_admin_state_up': 'admin_state_up',
+        'is_port_security_enabled': 'port_security_enabled',
+        'security_group_ids': 'security_groups',
+        'tenant_id': 'project_id',
+    },
+    'floating_ip': {
+        'tenant_id': 'project_id',
+    },
+    'security_group': {
+        'security_group_rules': 'rules',
+        'tenant_id': 'project_id',
+    },
+}
+
+_DOT_SHAPES = {
+    'router': 'octagon',
+    'network': 'folder',
+    'subnet': 'box',
+    'port': 'ellipse',
+    'server': 'box3d',
+    'floating_ip': 'diamond',
+    'security_group': 'hexagon',
+}
+
+
+def _get_attrs(node_type, resource):
+    """Return the attributes of a node, named like the show commands"""
+    display_columns, columns = sdk_utils.get_osc_show_columns_for_sdk_resource(
+        resource, _COLUMN_MAPS[node_type])
+    return dict(
+        (column, value)
+        for column, value in zip(display_columns,
+                                 utils.get_item_properties(resource, columns))
+        # The node has its own id, name and type
+        if column not in ('id', 'name', 'type')
+    )
+
+
+class _Graph(object):
+    """Nodes and edges of a topology, in the order they were added"""
+
+    def __init__(self):
+        self.nodes = collections.OrderedDict()
+        self.edges = []
+
+    def add_node(self, node_type, node_id, name=None, **attrs):
+        """Add a node, or fill in a node added from a reference"""
+        node = self.nodes.setdefault(
+            node_id, {'id': node_id, 'type': node_type, 'name': ''})
+        if name:
+            node['name'] = name
+        node.update(attrs)
+        return node
+
+    def add_edge(self, source, target, edge_type):
+        self.edges.append({
+            'source': source,
+            'target': target,
+            'type': edge_type,
+        })
+
+    def to_dict(self):
+        return {
+            'nodes': list(self.nodes.values()),
+            'edges': self.edges,
+        }
+
+    def to_dot(self):
+        def _escape(value):
+            return value.replace('\\', '\\\\').replace('"', '\\"')
+
+        lines = ['digraph topology {']
+        for node in self.nodes.values():
+            lines.append('    "%s" [label="%s\\n%s", shape=%s];' % (
+                _escape(node['id']),
+                _escape(node['type']),
+                _escape(node['name'] or node['id']),
+                _DOT_SHAPES[node['type']],
+            ))
+        for edge in self.edges:
+            lines.append('    "%s" -> "%s" [label="%s"];' % (
+                _escape(edge['source']),
+                _escape(edge['target']),
+                _escape(edge['type']),
+            ))
+        lines.append('}')
+        return '\n'.join(lines) + '\n'
+
+
+def _build_graph(networks, subnets, ports, routers, floating_ips,
+                 security_groups):
+    """Join the resources of a project into one graph
+
+    The edges run from routers to their interfaces, from interfaces to
+    their subnets, from subnets to the other ports with an address in them
+    and from ports to the servers using them.  Networks point to their
+    subnets, floating IPs to their ports, ports to their security groups and
+    routers to the network of their external gateway.
+    """
+    graph = _Graph()
+
+    for router in routers:
+        graph.add_node('router', router.id, router.name,
+                       **_get_attrs('router', router))
+    for network in networks:
+        graph.add_node('network', network.id, network.name,
+                       **_get_attrs('network', network))
+    for subnet in subnets:
+        graph.add_node('subnet', subnet.id, subnet.name,
+                       **_get_attrs('subnet', subnet))
+        graph.add_node('network', subnet.network_id)
+        graph.add_edge(subnet.network_id, subnet.id, 'subnet')
+    for router in routers:
+        gateway = router.external_gateway_info or {}
+        if gateway.get('network_id'):
+            graph.add_node('network', gateway['network_id'])
+            graph.add_edge(router.id, gateway['network_id'], 'gateway')
+
+    for port in ports:
+        graph.add_node('port', port.id, port.name,
+                       **_get_attrs('port', port))
+        interface = (port.device_owner in _ROUTER_INTERFACE_OWNERS and
+                     port.device_id in graph.nodes)
+        if interface:
+            graph.add_edge(port.device_id, port.id, 'interface')
+        for fixed_ip in port.fixed_ips or []:
+            subnet_id = fixed_ip.get('subnet_id')
+            if not subnet_id:
+                continue
+            graph.add_node('subnet', subnet_id)
+            if interface:
+                graph.add_edge(port.id, subnet_id, 'interface')
+            else:
+                graph.add_edge(subnet_id, port.id, 'port')
+        if (port.device_id and
+                (port.device_owner or '').startswith('compute:')):
+            graph.add_node('server', port.device_id)
+            graph.add_edge(port.id, port.device_id, 'server')
+        for security_group_id in port.security_group_ids or []:
+            graph.add_node('security_group', security_group_id)
+            graph.add_edge(port.id, security_group_id, 'security_group')
+
+    for security_group in security_groups:
+        graph.add_node('security_group', security_group.id,
+                       security_group.name,
+                       **_get_attrs('security_group', security_group))
+
+    for floating_ip in floating_ips:
+        graph.add_node('floating_ip', floating_ip.id,
+                       floating_ip.floating_ip_address,
+                       **_get_attrs('floating_ip', floating_ip))
+        if floating_ip.port_id:
+            graph.add_node('port', floating_ip.port_id)
+            graph.add_edge(floating_ip.id, floating_ip.port_id,
+                           'floating_ip')
+    return graph
+
+
+class ShowNetworkTopology(command.Command):
+    _description = _("Show the network topology of a project as a graph")
+
+    def get_parser(self, prog_name):
+        parser = super(ShowNetworkTopology, self).get_parser(prog_name)
+        parser.add_argument(
+            '--project',
+            metavar='<project>',
+            help=_("Show the topology of this project (name or ID) "
+                   "(default: the current project)")
+        )
+        identity_common.add_project_domain_option_to_parser(parser)
+        parser.add_argument(
+            '--graph-format',
+            metavar='<graph-format>',
+            choices=['json', 'dot'],
+            default='json',
+            help=_("Write the graph as JSON or in the DOT language of "
+                   "Graphviz (default: json)")
+        )
+        return parser
+
+    def take_action(self, parsed_args):
+        client = self.app.client_manager.network
+
+        if parsed_args.project:
+            project_id = identity_common.find_project(
+                self.app.client_manager.identity,
+                parsed_args.project,
+                parsed_args.project_domain,
+            ).id
+        else:
+            # Token and unscoped authentication carry no project
+            project_id = getattr(
+                self.app.client_manager.auth_ref, 'project_id', None)
+            if not project_id:
+                msg = _("--project is required without a project scoped "
+                        "authentication")
+                raise exceptions.CommandError(msg)
+
+        collections_f = collections.OrderedDict([
+            ('networks', client.networks),
+            ('subnets', client.subnets),
+            ('ports', client.ports),
+            ('routers', client.routers),
+            ('floating_ips', client.ips),
+            ('security_groups', client.security_groups),
+        ])
+        resources = fanout.resolve_all(collections.OrderedDict(
+            (key, lambda list_f=list_f: list(list_f(project_id=project_id)))
+            for key, list_f in collections_f.items()
+        ))
+        graph = _build_graph(**resources)
+
+        # Name the networks and subnets of other projects, such as the
+        # external network of a router gateway
+        missing = collections.OrderedDict()
+        for resource_type, node_type in ((sdk_network.Network, 'network'),
+                                         (sdk_subnet.Subnet, 'subnet')):
+            ids = [node['id'] for node in graph.nodes.values()
+                   if node['type'] == node_type and not node['name']]
+            if ids:
+                missing[node_type] = (
+                    lambda resource_type=resource_type, ids=ids:
+                        common.list_by_ids(client, resource_type, ids,
+                                           fields=('id', 'name')))
+        for found in fanout.resolve_all(missing).values():
+            for resource in found:
+                graph.nodes[resource.id]['name'] = resource.name
+
+        if parsed_args.graph_format == 'dot':
+            self.app.stdout.write(graph.to_dot())
+        else:
+            json.dump(graph.to_dict(), self.app.stdout, indent=2,
+                      sort_keys=True)
+            self.app.stdout.write('\n')
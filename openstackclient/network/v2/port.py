@@ -14,17 +14,25 @@
 """Port action implementations"""
 
 import argparse
+import collections
 import copy
+import itertools
 import json
 import logging
 
+from openstack.network.v2 import network as sdk_network
+from openstack.network.v2 import port as sdk_port
+from openstack.network.v2 import security_group as sdk_security_group
+from openstack.network.v2 import subnet as sdk_subnet
 from osc_lib.cli import parseractions
 from osc_lib.command import command
 from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.common import fanout
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
+from openstackclient.network import common
 from openstackclient.network import sdk_utils
 
 
@@ -284,7 +292,7 @@ def _convert_address_pairs(parsed_args):
     return ops
 
 
-class CreatePort(command.ShowOne):
+class CreatePort(common.BulkCreateMixin, command.ShowOne):
     _description = _("Create a new port")
 
     def get_parser(self, prog_name):
@@ -381,10 +389,22 @@ class CreatePort(command.ShowOne):
                    "ip-address=<ip-address>[,mac-address=<mac-address>] "
                    "(repeat option to set multiple allowed-address pairs)")
         )
+        common.add_count_option(parser)
         return parser
 
     def take_action(self, parsed_args):
         client = self.app.client_manager.network
+        count = common.get_count(parsed_args)
+        if count > 1:
+            # Every port would get the same address, only the first one
+            # could be created and the bulk request would fail
+            if any('ip-address' in ip_spec
+                   for ip_spec in parsed_args.fixed_ip or []):
+                msg = _("--fixed-ip ip-address cannot be used with --count")
+                raise exceptions.CommandError(msg)
+            if parsed_args.mac_address:
+                msg = _("--mac-address cannot be used with --count")
+                raise exceptions.CommandError(msg)
         _network = client.find_network(parsed_args.network,
                                        ignore_missing=False)
         parsed_args.network = _network.id
@@ -401,6 +421,19 @@ class CreatePort(command.ShowOne):
             attrs['allowed_address_pairs'] = (
                 _convert_address_pairs(parsed_args))
 
+        if count > 1:
+            objs = common.bulk_create(
+                client,
+                sdk_port.Port,
+                [dict(attrs, name=name)
+                 for name in common.expand_names(attrs.get('name'), count)],
+            )
+            display_columns, columns = _get_columns(objs[0])
+            data = [utils.get_item_properties(obj, columns,
+                                              formatters=_formatters)
+                    for obj in objs]
+            return (display_columns, data)
+
         obj = client.create_port(**attrs)
         display_columns, columns = _get_columns(obj)
         data = utils.get_item_properties(obj, columns, formatters=_formatters)
@@ -498,13 +531,142 @@ class ListPort(command.Lister):
                    "ports: subnet=<subnet>,ip-address=<ip-address> "
                    "(repeat option to set multiple fixed IP addresses)")
         )
+        parser.add_argument(
+            '--resolve-names',
+            action='store_true',
+            default=False,
+            help=_("Show the network of each port and the names of its "
+                   "subnets and, with --long, security groups, instead of "
+                   "their IDs")
+        )
+        common.add_pagination_options(parser)
         return parser
 
-    def take_action(self, parsed_args):
+    def _get_filters(self, parsed_args):
+        """Resolve the filters naming other resources concurrently"""
         network_client = self.app.client_manager.network
         compute_client = self.app.client_manager.compute
         identity_client = self.app.client_manager.identity
 
+        lookups = collections.OrderedDict()
+        if parsed_args.router:
+            lookups['router'] = lambda: network_client.find_router(
+                parsed_args.router, ignore_missing=False)
+        if parsed_args.server:
+            lookups['server'] = lambda: utils.find_resource(
+                compute_client.servers, parsed_args.server)
+        if parsed_args.network:
+            lookups['network'] = lambda: network_client.find_network(
+                parsed_args.network, ignore_missing=False)
+        if parsed_args.project:
+            lookups['project'] = lambda: identity_common.find_project(
+                identity_client,
+                parsed_args.project,
+                parsed_args.project_domain,
+            )
+        if parsed_args.fixed_ip:
+            lookups['fixed_ip'] = lambda: _prepare_filter_fixed_ips(
+                self.app.client_manager, parsed_args)
+        resolved = fanout.resolve_all(lookups)
+
+        filters = {}
+        if parsed_args.device_owner is not None:
+            filters['device_owner'] = parsed_args.device_owner
+        if parsed_args.router:
+            filters['device_id'] = resolved['router'].id
+        if parsed_args.server:
+            filters['device_id'] = resolved['server'].id
+        if parsed_args.network:
+            filters['network_id'] = resolved['network'].id
+        if parsed_args.mac_address:
+            filters['mac_address'] = parsed_args.mac_address
+        if parsed_args.project:
+            project_id = resolved['project'].id
+            filters['tenant_id'] = project_id
+            filters['project_id'] = project_id
+        if parsed_args.fixed_ip:
+            filters['fixed_ips'] = resolved['fixed_ip']
+        return filters
+
+    def _iter_rows_with_names(self, client, ports, columns):
+        """Yield the rows of the ports with names instead of IDs
+
+        The networks, subnets and security groups a page of ports refers to
+        are listed at once, by ID, before the rows of the page are yielded.
+        Each resource is only listed once; the ID is shown for a resource
+        the user cannot see.
+        """
+        names = {
+            sdk_network.Network: {},
+            sdk_subnet.Subnet: {},
+            sdk_security_group.SecurityGroup: {},
+        }
+
+        def _name(resource_type, res_id):
+            return names[resource_type].get(res_id) or res_id
+
+        def _format_fixed_ips(fixed_ips):
+            formatted = []
+            for fixed_ip in fixed_ips or []:
+                fixed_ip = dict(fixed_ip)
+                if 'subnet_id' in fixed_ip:
+                    fixed_ip['subnet'] = _name(
+                        sdk_subnet.Subnet, fixed_ip.pop('subnet_id'))
+                formatted.append(fixed_ip)
+            return utils.format_list_of_dicts(formatted)
+
+        formatters = dict(
+            _formatters,
+            fixed_ips=_format_fixed_ips,
+            network_id=lambda network_id: _name(
+                sdk_network.Network, network_id),
+            security_group_ids=lambda security_group_ids: utils.format_list(
+                [_name(sdk_security_group.SecurityGroup, security_group_id)
+                 for security_group_id in security_group_ids or []]),
+        )
+
+        ports = iter(ports)
+        while True:
+            page = list(itertools.islice(ports, common.DEFAULT_PAGE_SIZE))
+            if not page:
+                return
+            ids = {
+                sdk_network.Network: set(),
+                sdk_subnet.Subnet: set(),
+                sdk_security_group.SecurityGroup: set(),
+            }
+            for port in page:
+                ids[sdk_network.Network].add(port.network_id)
+                ids[sdk_subnet.Subnet].update(
+                    fixed_ip.get('subnet_id')
+                    for fixed_ip in port.fixed_ips or [])
+                if 'security_group_ids' in columns:
+                    ids[sdk_security_group.SecurityGroup].update(
+                        port.security_group_ids or [])
+            lookups = collections.OrderedDict()
+            for resource_type, res_ids in ids.items():
+                # Only list the IDs not seen with an earlier page
+                missing = res_ids - set(names[resource_type]) - set([None])
+                if missing:
+                    lookups[resource_type] = (
+                        lambda resource_type=resource_type, missing=missing:
+                            common.list_by_ids(client, resource_type, missing,
+                                               fields=('id', 'name')))
+            for resource_type, found in fanout.resolve_all(lookups).items():
+                names[resource_type].update(
+                    (res.id, res.name) for res in found)
+                # Remember the IDs not found too, so they are not looked up
+                # again with the next page
+                for res_id in ids[resource_type]:
+                    names[resource_type].setdefault(res_id, None)
+
+            for port in page:
+                yield utils.get_item_properties(
+                    port, columns, formatters=formatters)
+
+    def take_action(self, parsed_args):
+        network_client = self.app.client_manager.network
+
         columns = (
             'id',
             'name',
@@ -520,39 +682,23 @@ class ListPort(command.Lister):
             'Status',
         )
 
-        filters = {}
+        if parsed_args.resolve_names:
+            columns += ('network_id',)
+            column_headers += ('Network',)
         if parsed_args.long:
             columns += ('security_group_ids', 'device_owner',)
             column_headers += ('Security Groups', 'Device Owner',)
-        if parsed_args.device_owner is not None:
-            filters['device_owner'] = parsed_args.device_owner
-        if parsed_args.router:
-            _router = network_client.find_router(parsed_args.router,
-                                                 ignore_missing=False)
-            filters['device_id'] = _router.id
-        if parsed_args.server:
-            server = utils.find_resource(compute_client.servers,
-                                         parsed_args.server)
-            filters['device_id'] = server.id
-        if parsed_args.network:
-            network = network_client.find_network(parsed_args.network,
-                                                  ignore_missing=False)
-            filters['network_id'] = network.id
-        if parsed_args.mac_address:
-            filters['mac_address'] = parsed_args.mac_address
-        if parsed_args.project:
-            project_id = identity_common.find_project(
-                identity_client,
-                parsed_args.project,
-                parsed_args.project_domain,
-            ).id
-            filters['tenant_id'] = project_id
-            filters['project_id'] = project_id
-        if parsed_args.fixed_ip:
-            filters['fixed_ips'] = _prepare_filter_fixed_ips(
-                self.app.client_manager, parsed_args)
+        filters = self._get_filters(parsed_args)
+
+        if parsed_args.resolve_names:
+            data = common.list_resources(
+                network_client.ports, parsed_args,
+                default_page_size=common.DEFAULT_PAGE_SIZE, **filters)
+            return (column_headers,
+                    self._iter_rows_with_names(network_client, data, columns))
 
-        data = network_client.ports(**filters)
+        data = common.list_resources(network_client.ports, parsed_args,
+                                     **filters)
 
         return (column_headers,
                 (utils.get_item_properties(
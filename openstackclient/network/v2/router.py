@@ -25,6 +25,7 @@ from osc_lib import utils
 
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
+from openstackclient.network import common
 from openstackclient.network import sdk_utils
 
 
@@ -294,6 +295,7 @@ class ListRouter(command.Lister):
             help=_("List routers according to their project (name or ID)")
         )
         identity_common.add_project_domain_option_to_parser(parser)
+        common.add_pagination_options(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -357,7 +359,7 @@ class ListRouter(command.Lister):
                     'Availability zones',
                 )
 
-        data = client.routers(**args)
+        data = common.list_resources(client.routers, parsed_args, **args)
         return (column_headers,
                 (utils.get_item_properties(
                     s, columns,
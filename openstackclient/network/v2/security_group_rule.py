@@ -14,6 +14,7 @@
 """Security Group Rule action implementations"""
 
 import argparse
+import collections
 import logging
 
 try:
@@ -21,11 +22,15 @@ try:
 except ImportError:
     from novaclient.v1_1 import security_group_rules as compute_secgroup_rules
 
+from openstack.network.v2 import security_group_rule as sdk_secgroup_rule
 from osc_lib.cli import parseractions
+from osc_lib.command import command
 from osc_lib import exceptions
 from osc_lib import utils
 import six
+import yaml
 
+from openstackclient.common import fanout
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
 from openstackclient.network import common
@@ -89,6 +94,166 @@ def _is_icmp_protocol(protocol):
         return False
 
 
+def _is_ipv6_protocol(protocol):
+    # NOTE(rtheis): Neutron has deprecated protocol icmpv6.
+    # However, while the OSC CLI doesn't document the protocol,
+    # the code must still handle it. In addition, handle both
+    # protocol names and numbers.
+    if (protocol.startswith('ipv6-') or
+            protocol in ['icmpv6', '41', '43', '44', '58', '59', '60']):
+        return True
+    else:
+        return False
+
+
+# The numbers of the protocol names Neutron accepts, a rule stores the
+# protocol as it was given so both forms must compare equal
+_PROTOCOL_NUMBERS = {
+    'ah': '51',
+    'dccp': '33',
+    'egp': '8',
+    'esp': '50',
+    'gre': '47',
+    'icmp': '1',
+    'icmpv6': '58',
+    'igmp': '2',
+    'ipip': '4',
+    'ipv6-encap': '41',
+    'ipv6-frag': '44',
+    'ipv6-icmp': '58',
+    'ipv6-nonxt': '59',
+    'ipv6-opts': '60',
+    'ipv6-route': '43',
+    'ospf': '89',
+    'pgm': '113',
+    'rsvp': '46',
+    'sctp': '132',
+    'tcp': '6',
+    'udp': '17',
+    'udplite': '136',
+    'vrrp': '112',
+}
+
+_ETHERTYPES = {
+    'ipv4': 'IPv4',
+    'ipv6': 'IPv6',
+}
+
+# The fields Neutron tells rules of a security group apart by
+_RULE_MATCH_KEYS = (
+    'direction',
+    'ethertype',
+    'protocol',
+    'port_range_min',
+    'port_range_max',
+    'remote_ip_prefix',
+    'remote_group_id',
+)
+_RULE_FILE_KEYS = _RULE_MATCH_KEYS + ('remote_group', 'description')
+
+
+def _normalize_rule(rule, index=None):
+    """Fill in the defaults Neutron applies to a rule
+
+    :param rule: a dict with the keys of _RULE_MATCH_KEYS and description
+    :param index: the index of the rule in the rules file, for the errors
+    :returns: a dict with every key of _RULE_MATCH_KEYS and description
+    """
+    protocol = rule.get('protocol')
+    if protocol is not None:
+        protocol = six.text_type(protocol).lower()
+    if protocol in ('', 'any'):
+        protocol = None
+
+    ethertype = rule.get('ethertype')
+    if ethertype:
+        ethertype = _ETHERTYPES.get(
+            six.text_type(ethertype).lower(), ethertype)
+    else:
+        ethertype = 'IPv4'
+        if protocol is not None and _is_ipv6_protocol(protocol):
+            ethertype = 'IPv6'
+
+    remote_ip_prefix = rule.get('remote_ip_prefix')
+    if remote_ip_prefix in ('', '0.0.0.0/0', '::/0'):
+        # Matches any address, the same as no prefix
+        remote_ip_prefix = None
+
+    normalized = {
+        'direction': rule.get('direction') or 'ingress',
+        'ethertype': ethertype,
+        'protocol': protocol,
+        'remote_ip_prefix': remote_ip_prefix,
+        'remote_group_id': rule.get('remote_group_id') or None,
+        'description': rule.get('description') or '',
+    }
+    for key in ('port_range_min', 'port_range_max'):
+        value = rule.get(key)
+        try:
+            normalized[key] = int(value) if value is not None else None
+        except (TypeError, ValueError):
+            msg = _("Rule %(index)s has an invalid %(key)s: %(value)s")
+            raise exceptions.CommandError(msg % {'index': index,
+                                                 'key': key,
+                                                 'value': value})
+    return normalized
+
+
+def _rule_match_key(rule):
+    """Return the fields of a normalized rule that tell it apart
+
+    A protocol name and its number are the same protocol.
+    """
+    key = dict(rule)
+    key['protocol'] = _PROTOCOL_NUMBERS.get(rule['protocol'],
+                                            rule['protocol'])
+    return tuple(key[field] for field in _RULE_MATCH_KEYS)
+
+
+def _load_rules_file(path):
+    """Read the rules of a security group from a YAML or JSON file
+
+    The file holds either a list of rules or a mapping with the list under
+    ``rules``.  Each rule is a mapping of Neutron security group rule
+    fields, ``remote_group`` takes a security group name or ID.
+    """
+    try:
+        with open(path) as f:
+            data = yaml.safe_load(f)
+    except (IOError, OSError, yaml.YAMLError) as e:
+        msg = _("Unable to read rules file %(path)s: %(e)s")
+        raise exceptions.CommandError(msg % {'path': path, 'e': e})
+
+    if isinstance(data, dict):
+        data = data.get('rules')
+    if data is None:
+        data = []
+    if not isinstance(data, list):
+        msg = _("Rules file %s must hold a list of rules")
+        raise exceptions.CommandError(msg % path)
+
+    for index, rule in enumerate(data):
+        if not isinstance(rule, dict):
+            msg = _("Rule %(index)s of %(path)s is not a mapping")
+            raise exceptions.CommandError(msg % {'index': index,
+                                                 'path': path})
+        unknown = sorted(set(rule) - set(_RULE_FILE_KEYS))
+        if unknown:
+            msg = _("Rule %(index)s of %(path)s has unknown keys: %(keys)s")
+            raise exceptions.CommandError(msg % {
+                'index': index,
+                'path': path,
+                'keys': ', '.join(unknown),
+            })
+        if rule.get('remote_ip_prefix') and (
+                rule.get('remote_group') or rule.get('remote_group_id')):
+            msg = _("Rule %(index)s of %(path)s has both a remote IP prefix "
+                    "and a remote group")
+            raise exceptions.CommandError(msg % {'index': index,
+                                                 'path': path})
+    return data
+
+
 # TODO(abhiraut): Use the SDK resource mapped attribute names once the
 # OSC minimum requirements include SDK 1.0.
 class CreateSecurityGroupRule(common.NetworkAndComputeShowOne):
@@ -238,15 +403,7 @@ class CreateSecurityGroupRule(common.NetworkAndComputeShowOne):
         return protocol
 
     def _is_ipv6_protocol(self, protocol):
-        # NOTE(rtheis): Neutron has deprecated protocol icmpv6.
-        # However, while the OSC CLI doesn't document the protocol,
-        # the code must still handle it. In addition, handle both
-        # protocol names and numbers.
-        if (protocol.startswith('ipv6-') or
-                protocol in ['icmpv6', '41', '43', '44', '58', '59', '60']):
-            return True
-        else:
-            return False
+        return _is_ipv6_protocol(protocol)
 
     def take_action_network(self, client, parsed_args):
         # Get the security group ID to hold the rule.
@@ -545,14 +702,12 @@ class ListSecurityGroupRule(common.NetworkAndComputeLister):
         if parsed_args.protocol is not None:
             query['protocol'] = parsed_args.protocol
 
-        rules = [
-            self._format_network_security_group_rule(r)
-            for r in client.security_group_rules(**query)
-        ]
+        # Page through the rules and format each row as it is output
+        rules = common.iter_pages(client.security_group_rules, **query)
 
         return (column_headers,
                 (utils.get_dict_properties(
-                    s, columns,
+                    self._format_network_security_group_rule(s), columns,
                 ) for s in rules))
 
     def take_action_compute(self, client, parsed_args):
@@ -565,26 +720,26 @@ class ListSecurityGroupRule(common.NetworkAndComputeLister):
             "Remote Security Group",
         )
 
-        rules_to_list = []
         if parsed_args.group is not None:
             group = utils.find_resource(
                 client.security_groups,
                 parsed_args.group,
             )
-            rules_to_list = group.rules
+            groups = [group]
         else:
             columns = columns + ('parent_group_id',)
             search = {'all_tenants': parsed_args.all_projects}
-            for group in client.security_groups.list(search_opts=search):
-                rules_to_list.extend(group.rules)
+            groups = client.security_groups.list(search_opts=search)
 
         # NOTE(rtheis): Turn the raw rules into resources.
-        rules = []
-        for rule in rules_to_list:
-            rules.append(compute_secgroup_rules.SecurityGroupRule(
+        rules = (
+            compute_secgroup_rules.SecurityGroupRule(
                 client.security_group_rules,
                 network_utils.transform_compute_security_group_rule(rule),
-            ))
+            )
+            for group in groups
+            for rule in group.rules
+        )
 
         return (column_headers,
                 (utils.get_item_properties(
@@ -631,3 +786,132 @@ class ShowSecurityGroupRule(common.NetworkAndComputeShowOne):
 
         # NOTE(rtheis): Format security group rule
         return _format_security_group_rule_show(obj)
+
+
+class ApplySecurityGroupRule(command.Lister):
+    _description = _("Make the rules of a security group match a file")
+
+    def get_parser(self, prog_name):
+        parser = super(ApplySecurityGroupRule, self).get_parser(prog_name)
+        parser.add_argument(
+            'group',
+            metavar='<group>',
+            help=_("Apply the rules to this security group (name or ID)")
+        )
+        parser.add_argument(
+            '--file',
+            metavar='<file>',
+            required=True,
+            help=_("YAML or JSON file holding the rules of the security "
+                   "group (required)")
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            default=False,
+            help=_("Show the rules that would be created and deleted "
+                   "without changing the security group")
+        )
+        return parser
+
+    def _resolve_remote_groups(self, client, rules):
+        names = set(rule['remote_group'] for rule in rules
+                    if rule.get('remote_group'))
+        lookups = dict(
+            (name, lambda name=name: client.find_security_group(
+                name, ignore_missing=False).id)
+            for name in sorted(names)
+        )
+        return fanout.resolve_all(lookups)
+
+    def take_action(self, parsed_args):
+        client = self.app.client_manager.network
+        rules = _load_rules_file(parsed_args.file)
+        security_group_id = client.find_security_group(
+            parsed_args.group, ignore_missing=False).id
+        remote_group_ids = self._resolve_remote_groups(client, rules)
+
+        desired = collections.OrderedDict()
+        for index, rule in enumerate(rules):
+            rule = dict(rule)
+            remote_group = rule.pop('remote_group', None)
+            if remote_group:
+                rule['remote_group_id'] = remote_group_ids[remote_group]
+            rule = _normalize_rule(rule, index)
+            desired.setdefault(_rule_match_key(rule), rule)
+
+        current = collections.OrderedDict()
+        for obj in common.iter_pages(client.security_group_rules,
+                                     security_group_id=security_group_id):
+            rule = _normalize_rule({
+                'direction': obj.direction,
+                'ethertype': obj.ether_type,
+                'protocol': obj.protocol,
+                'port_range_min': obj.port_range_min,
+                'port_range_max': obj.port_range_max,
+                'remote_ip_prefix': obj.remote_ip_prefix,
+                'remote_group_id': obj.remote_group_id,
+            })
+            rule['id'] = obj.id
+            current.setdefault(_rule_match_key(rule), []).append(rule)
+
+        to_create = [rule for key, rule in desired.items()
+                     if key not in current]
+        to_delete = [rule for key, rules in current.items()
+                     if key not in desired for rule in rules]
+
+        if not parsed_args.dry_run:
+            # Create before deleting so traffic allowed by both the old
+            # and the new rules is never dropped in between
+            created = common.bulk_create(
+                client,
+                sdk_secgroup_rule.SecurityGroupRule,
+                [self._get_create_attrs(security_group_id, rule)
+                 for rule in to_create],
+            )
+            for rule, obj in zip(to_create, created):
+                rule['id'] = obj.id
+            fanout.resolve_all(dict(
+                (rule['id'],
+                 lambda rule_id=rule['id']:
+                     client.delete_security_group_rule(
+                         rule_id, ignore_missing=False))
+                for rule in to_delete
+            ))
+
+        columns = (
+            'Action',
+            'ID',
+            'Direction',
+            'Ethertype',
+            'IP Protocol',
+            'Port Range',
+            'Remote IP Prefix',
+            'Remote Security Group',
+        )
+        rows = [self._get_row('create', rule) for rule in to_create]
+        rows += [self._get_row('delete', rule) for rule in to_delete]
+        return (columns, rows)
+
+    def _get_create_attrs(self, security_group_id, rule):
+        attrs = {'security_group_id': security_group_id}
+        for key in _RULE_MATCH_KEYS:
+            if rule[key] is not None:
+                attrs[key] = rule[key]
+        # The SDK calls the ethertype field ether_type
+        attrs['ether_type'] = attrs.pop('ethertype')
+        if rule['description']:
+            attrs['description'] = rule['description']
+        return attrs
+
+    def _get_row(self, action, rule):
+        return (
+            action,
+            rule.get('id', ''),
+            rule['direction'],
+            rule['ethertype'],
+            rule['protocol'],
+            _format_network_port_range(rule),
+            rule['remote_ip_prefix'],
+            rule['remote_group_id'],
+        )
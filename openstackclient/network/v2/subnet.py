@@ -16,6 +16,7 @@
 import copy
 import logging
 
+from openstack.network.v2 import subnet as sdk_subnet
 from osc_lib.cli import parseractions
 from osc_lib.command import command
 from osc_lib import exceptions
@@ -23,6 +24,7 @@ from osc_lib import utils
 
 from openstackclient.i18n import _
 from openstackclient.identity import common as identity_common
+from openstackclient.network import common
 from openstackclient.network import sdk_utils
 
 
@@ -230,7 +232,7 @@ def _get_attrs(client_manager, parsed_args, is_create=True):
 
 # TODO(abhiraut): Use the SDK resource mapped attribute names once the
 # OSC minimum requirements include SDK 1.0.
-class CreateSubnet(command.ShowOne):
+class CreateSubnet(common.BulkCreateMixin, command.ShowOne):
     _description = _("Create a subnet")
 
     def get_parser(self, prog_name):
@@ -330,11 +332,31 @@ class CreateSubnet(command.ShowOne):
             help=_("Set subnet description")
         )
         _get_common_parse_arguments(parser)
+        common.add_count_option(parser)
         return parser
 
     def take_action(self, parsed_args):
         client = self.app.client_manager.network
+        count = common.get_count(parsed_args)
+        if count > 1 and parsed_args.subnet_range is not None:
+            # The subnets would overlap, the bulk request would fail
+            msg = _("--subnet-range cannot be used with --count, allocate "
+                    "the subnets from a subnet pool instead")
+            raise exceptions.CommandError(msg)
         attrs = _get_attrs(self.app.client_manager, parsed_args)
+        if count > 1:
+            objs = common.bulk_create(
+                client,
+                sdk_subnet.Subnet,
+                [dict(attrs, name=name)
+                 for name in common.expand_names(attrs.get('name'), count)],
+            )
+            display_columns, columns = _get_columns(objs[0])
+            data = [utils.get_item_properties(obj, columns,
+                                              formatters=_formatters)
+                    for obj in objs]
+            return (display_columns, data)
+
         obj = client.create_subnet(**attrs)
         display_columns, columns = _get_columns(obj)
         data = utils.get_item_properties(obj, columns, formatters=_formatters)
@@ -448,6 +470,7 @@ class ListSubnet(command.Lister):
                    "(in CIDR notation) in output "
                    "e.g.: --subnet-range 10.10.0.0/16")
         )
+        common.add_pagination_options(parser)
         return parser
 
     def take_action(self, parsed_args):
@@ -482,7 +505,8 @@ class ListSubnet(command.Lister):
             filters['name'] = parsed_args.name
         if parsed_args.subnet_range:
             filters['cidr'] = parsed_args.subnet_range
-        data = network_client.subnets(**filters)
+        data = common.list_resources(network_client.subnets, parsed_args,
+                                     **filters)
 
         headers = ('ID', 'Name', 'Network', 'Subnet')
         columns = ('id', 'name', 'network_id', 'cidr')
@@ -16,11 +16,17 @@
 
 """Command-line interface to the OpenStack APIs"""
 
+import functools
 import locale
 import sys
+import time
 
+from cliff import lister
 from osc_lib.api import auth
+from osc_lib.command import timing
+from osc_lib import exceptions
 from osc_lib import shell
+from osc_lib import utils
 from oslo_utils import importutils
 import six
 
@@ -28,6 +34,10 @@ import openstackclient
 from openstackclient.common import client_config as cloud_config
 from openstackclient.common import clientmanager
 from openstackclient.common import commandmanager
+from openstackclient.common import fanout
+from openstackclient.common import latency
+from openstackclient.common import transport
+from openstackclient.i18n import _
 
 osprofiler_profiler = importutils.try_import("osprofiler.profiler")
 
@@ -39,14 +49,37 @@ class OpenStackShell(shell.OpenStackShell):
 
     def __init__(self):
 
-        super(OpenStackShell, self).__init__(
-            description=__doc__.strip(),
-            version=openstackclient.__version__,
-            command_manager=commandmanager.CommandManager('openstack.cli'),
-            deferred_help=True)
+        # Phases of this invocation for --timing-report
+        self.latency_profile = latency.Profile(
+            start=openstackclient.START_TIME,
+        )
+        self.latency_profile.add(
+            'import',
+            'phase',
+            openstackclient.START_TIME,
+            time.time() - openstackclient.START_TIME,
+        )
+
+        with self.latency_profile.span('plugin load'):
+            super(OpenStackShell, self).__init__(
+                description=__doc__.strip(),
+                version=openstackclient.__version__,
+                command_manager=commandmanager.CommandManager(
+                    'openstack.cli',
+                ),
+                deferred_help=True)
 
         self.api_version = {}
 
+        # Regions given as a comma-separated --os-region-name
+        self.region_names = []
+
+        # Clouds given as a comma-separated --os-cloud
+        self.cloud_names = []
+
+        # The client managers of the clouds of a multiple cloud command
+        self.cloud_client_managers = []
+
         # Assume TLS host certificate verification is enabled
         self.verify = True
 
@@ -54,6 +87,104 @@ class OpenStackShell(shell.OpenStackShell):
         parser = super(OpenStackShell, self).build_option_parser(
             description,
             version)
+        parser.add_argument(
+            '--all-regions',
+            action='store_true',
+            default=False,
+            help=_('Run a list command concurrently in every region of the '
+                   'service catalog and merge the output with a Region '
+                   'column. --os-region-name also accepts a comma-separated '
+                   'list of regions to do the same for those regions only.'),
+        )
+        parser.add_argument(
+            '--all-clouds',
+            action='store_true',
+            default=False,
+            help=_('Run a list command concurrently against every cloud in '
+                   'clouds.yaml and merge the output with a Cloud column. '
+                   '--os-cloud also accepts a comma-separated list of '
+                   'clouds to do the same for those clouds only.'),
+        )
+        parser.add_argument(
+            '--timing-report',
+            metavar='<file>',
+            help=_('Write a latency breakdown of the command to <file> '
+                   '("-" for standard output): time spent importing and '
+                   'loading plugins, reading clouds.yaml, authenticating, '
+                   'in each HTTP request (connect, TLS, time to first byte '
+                   'and body transfer) and formatting the output'),
+        )
+        parser.add_argument(
+            '--timing-report-format',
+            metavar='<format>',
+            choices=latency.REPORT_FORMATS,
+            default='json',
+            help=_('Format of --timing-report: json (default) or chrome '
+                   '(Trace Event Format for chrome://tracing)'),
+        )
+        # Transport options, merged into the cloud config by o-c-c so they
+        # override the same keys in clouds.yaml
+        parser.add_argument(
+            '--os-pool-connections',
+            metavar='<count>',
+            dest='pool_connections',
+            default=utils.env('OS_POOL_CONNECTIONS'),
+            help=_('Number of hosts to keep a connection pool for, '
+                   'default=%s (Env: OS_POOL_CONNECTIONS)') %
+            transport.DEFAULT_POOL_CONNECTIONS,
+        )
+        parser.add_argument(
+            '--os-pool-maxsize',
+            metavar='<count>',
+            dest='pool_maxsize',
+            default=utils.env('OS_POOL_MAXSIZE'),
+            help=_('Number of connections to keep open per host, '
+                   'default=%s (Env: OS_POOL_MAXSIZE)') %
+            transport.DEFAULT_POOL_MAXSIZE,
+        )
+        keepalive_group = parser.add_mutually_exclusive_group()
+        keepalive_group.add_argument(
+            '--os-keepalive',
+            action='store_true',
+            dest='keepalive',
+            default=None,
+            help=_('Set TCP keep-alive on connections (default)'),
+        )
+        keepalive_group.add_argument(
+            '--os-no-keepalive',
+            action='store_false',
+            dest='keepalive',
+            default=None,
+            help=_('Do not set TCP keep-alive on connections'),
+        )
+        parser.add_argument(
+            '--os-max-retries',
+            metavar='<count>',
+            dest='max_retries',
+            default=utils.env('OS_MAX_RETRIES'),
+            help=_('Retry requests that failed to connect up to <count> '
+                   'times, default=%s (Env: OS_MAX_RETRIES)') %
+            transport.DEFAULT_MAX_RETRIES,
+        )
+        parser.add_argument(
+            '--os-retry-backoff',
+            metavar='<seconds>',
+            dest='retry_backoff',
+            default=utils.env('OS_RETRY_BACKOFF'),
+            help=_('Backoff factor of the retries, the nth retry waits '
+                   '<seconds> * 2^(n-1), default=%s (Env: OS_RETRY_BACKOFF)')
+            % transport.DEFAULT_RETRY_BACKOFF,
+        )
+        parser.add_argument(
+            '--os-http-adapter',
+            metavar='<class>',
+            dest='http_adapter',
+            default=utils.env('OS_HTTP_ADAPTER'),
+            help=_('Dotted path of a requests transport adapter class to '
+                   'send requests with, for example an HTTP/2 adapter; the '
+                   'other transport options do not apply to it '
+                   '(Env: OS_HTTP_ADAPTER)'),
+        )
         parser = clientmanager.build_plugin_option_parser(parser)
         parser = auth.build_auth_plugins_option_parser(parser)
         return parser
@@ -68,6 +199,26 @@ class OpenStackShell(shell.OpenStackShell):
         else:
             self._auth_type = 'password'
 
+        # Split a list of regions, the first one is used for authentication
+        region_name = self.options.region_name
+        if region_name and ',' in region_name:
+            self.region_names = [
+                r.strip() for r in region_name.split(',') if r.strip()
+            ]
+            self.options.region_name = (
+                self.region_names[0] if self.region_names else None
+            )
+
+        # Split a list of clouds, the first one is used to load plugins
+        cloud = self.options.cloud
+        if cloud and ',' in cloud:
+            self.cloud_names = [
+                c.strip() for c in cloud.split(',') if c.strip()
+            ]
+            self.options.cloud = (
+                self.cloud_names[0] if self.cloud_names else None
+            )
+
     def _load_plugins(self):
         """Load plugins via stevedore
 
@@ -134,7 +285,22 @@ class OpenStackShell(shell.OpenStackShell):
             'openstack.extension')
 
     def initialize_app(self, argv):
-        super(OpenStackShell, self).initialize_app(argv)
+        with self.latency_profile.span('plugin load'):
+            super(OpenStackShell, self).initialize_app(argv)
+
+        with self.latency_profile.span('config'):
+            self._initialize_cloud_config()
+
+        # Then, re-create the client_manager with the correct arguments
+        self.client_manager = clientmanager.ClientManager(
+            cli_options=self.cloud,
+            api_version=self.api_version,
+        )
+        if self.options.timing_report:
+            self.client_manager.latency_profile = self.latency_profile
+
+    def _initialize_cloud_config(self):
+        """Load clouds.yaml and select the cloud"""
 
         # Argument precedence is really broken in multiple places
         # so we're just going to fix it here until o-c-c and osc-lib
@@ -166,12 +332,6 @@ class OpenStackShell(shell.OpenStackShell):
             validate=False,
         )
 
-        # Then, re-create the client_manager with the correct arguments
-        self.client_manager = clientmanager.ClientManager(
-            cli_options=self.cloud,
-            api_version=self.api_version,
-        )
-
     def prepare_to_run_command(self, cmd):
         """Set up auth and API versions"""
 
@@ -179,6 +339,19 @@ class OpenStackShell(shell.OpenStackShell):
         # NOTE(dtroyer): If auth is not required for a command, force fake
         #                token auth so KSA plugins are happy
 
+        if cmd.auth_required and (
+                self.options.all_clouds or len(self.cloud_names) > 1):
+            ret = self._prepare_clouds(cmd)
+        else:
+            ret = self._prepare_cloud(cmd)
+
+        if self.options.timing_report:
+            self._profile_command(cmd)
+        return ret
+
+    def _prepare_cloud(self, cmd):
+        """Set up auth for the cloud of the command"""
+
         kwargs = {}
         if not cmd.auth_required:
             # Build fake token creds to keep ksa and o-c-c hushed
@@ -188,16 +361,183 @@ class OpenStackShell(shell.OpenStackShell):
             kwargs['auth']['url'] = 'x'
 
         # Validate auth options
-        self.cloud = self.cloud_config.get_one_cloud(
-            cloud=self.options.cloud,
+        with self.latency_profile.span('config'):
+            self.cloud = self.cloud_config.get_one_cloud(
+                cloud=self.options.cloud,
+                argparse=self.options,
+                validate=True,
+                **kwargs
+            )
+        # Push the updated args into ClientManager
+        self.client_manager._cli_options = self.cloud
+
+        with self.latency_profile.span('auth'):
+            ret = super(OpenStackShell, self).prepare_to_run_command(cmd)
+
+        if cmd.auth_required and (
+                self.options.all_regions or len(self.region_names) > 1):
+            self._fan_out_regions(cmd)
+        return ret
+
+    def _prepare_clouds(self, cmd):
+        """Set up a command run against several clouds
+
+        The base class would validate and authenticate the default cloud,
+        here each cloud is validated and authenticated by its own worker
+        instead, so only the rest of its setup is done.
+        """
+
+        self.log.info(
+            'command: %s -> %s.%s',
+            getattr(cmd, 'cmd_name', '<none>'),
+            cmd.__class__.__module__,
+            cmd.__class__.__name__,
+        )
+        self._fan_out_clouds(cmd)
+
+    def _profile_command(self, cmd):
+        """Time the API calls and the output formatting of a command"""
+
+        profile = self.latency_profile
+        take_action = cmd.take_action
+        produce_output = getattr(cmd, 'produce_output', None)
+
+        def _take_action(parsed_args):
+            with profile.span('command'):
+                return take_action(parsed_args)
+
+        def _produce_output(parsed_args, column_names, data):
+            # Listers usually return a generator, so some API calls and all
+            # of the formatting happen here
+            with profile.span('format'):
+                return produce_output(parsed_args, column_names, data)
+
+        cmd.take_action = _take_action
+        if produce_output is not None:
+            cmd.produce_output = _produce_output
+
+    def clean_up(self, cmd, result, err):
+        try:
+            if self.client_manager.session is None:
+                self._clean_up_clouds(cmd, err)
+            else:
+                super(OpenStackShell, self).clean_up(cmd, result, err)
+        finally:
+            if self.options.timing_report:
+                self._write_timing_report()
+
+    def _clean_up_clouds(self, cmd, err):
+        """Clean up a command without a default session
+
+        The base class takes the --timing data from the session of the
+        default client manager, which a command run against several clouds
+        does not set up; the session of each cloud is used instead.
+        """
+
+        self.log.debug('clean_up %s: %s', cmd.__class__.__name__, err or '')
+
+        if not self.options.timing:
+            return
+
+        for client_manager in self.cloud_client_managers:
+            self.timing_data.extend(client_manager.session.get_timings())
+
+        # Use the Timing pseudo-command to generate the output
+        tcmd = timing.Timing(self, self.options)
+        tparser = tcmd.get_parser('Timing')
+
+        # If anything other than prettytable is specified, force csv
+        format = 'table'
+        if hasattr(cmd, 'formatter') \
+                and cmd.formatter != cmd._formatter_plugins['table'].obj:
+            format = 'csv'
+
+        sys.stdout.write('\n')
+        targs = tparser.parse_args(['-f', format])
+        tcmd.run(targs)
+
+    def _write_timing_report(self):
+        if self.options.timing_report == '-':
+            self.latency_profile.write(
+                self.stdout,
+                self.options.timing_report_format,
+            )
+        else:
+            with open(self.options.timing_report, 'w') as f:
+                self.latency_profile.write(
+                    f,
+                    self.options.timing_report_format,
+                )
+
+    def _get_cloud_client_manager(self, cmd, cloud_name):
+        """Return an authenticated ClientManager for one cloud"""
+
+        cloud = self.cloud_config.get_one_cloud(
+            cloud=cloud_name,
             argparse=self.options,
             validate=True,
-            **kwargs
         )
-        # Push the updated args into ClientManager
-        self.client_manager._cli_options = self.cloud
+        client_manager = clientmanager.ClientManager.isolated_class()(
+            cli_options=cloud,
+            api_version=self.api_version,
+        )
+        if self.options.timing_report:
+            client_manager.latency_profile = self.latency_profile
+        client_manager.setup_auth()
+        # Trigger the Identity client to initialize
+        client_manager.auth_ref
+        if getattr(cmd, 'required_scope', False):
+            client_manager.validate_scope()
+        # Kept for the --timing data of clean_up()
+        self.cloud_client_managers.append(client_manager)
+        return client_manager
+
+    def _fan_out_clouds(self, cmd):
+        """Run a list command against several clouds"""
+
+        if not isinstance(cmd, lister.Lister):
+            msg = _("Multiple clouds are only supported by list commands")
+            raise exceptions.CommandError(msg)
+        if self.options.all_regions or len(self.region_names) > 1:
+            msg = _("Multiple clouds can not be combined with multiple "
+                    "regions")
+            raise exceptions.CommandError(msg)
+
+        if self.options.all_clouds:
+            clouds = sorted(self.cloud_config.get_cloud_names())
+        else:
+            clouds = self.cloud_names
+
+        fanout.fan_out(
+            cmd,
+            [(c, functools.partial(self._get_cloud_client_manager, cmd, c))
+             for c in clouds],
+            'Cloud',
+        )
+
+    def _fan_out_regions(self, cmd):
+        """Run a list command in several regions"""
+
+        if not isinstance(cmd, lister.Lister):
+            msg = _("Multiple regions are only supported by list commands")
+            raise exceptions.CommandError(msg)
 
-        return super(OpenStackShell, self).prepare_to_run_command(cmd)
+        if self.options.all_regions:
+            index = self.client_manager.catalog_index
+            regions = sorted(index.regions) if index else []
+            if not regions:
+                msg = _("No regions found in the service catalog")
+                raise exceptions.CommandError(msg)
+        else:
+            regions = self.region_names
+
+        fanout.fan_out(
+            cmd,
+            [(r, functools.partial(self.client_manager.for_region, r))
+             for r in regions],
+            'Region',
+            ignore_missing=self.options.all_regions,
+        )
 
 
 def main(argv=None):
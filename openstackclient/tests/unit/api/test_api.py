@@ -38,6 +38,20 @@ class TestKeystoneSession(api_fakes.TestSession):
         ret = self.api._request('GET', '/qaz')
         self.assertEqual(api_fakes.RESP_ITEM_1, ret.json())
 
+    def test_session_request_default_session(self):
+        self.requests_mock.register_uri(
+            'GET',
+            self.BASE_URL + '/qaz',
+            json=api_fakes.RESP_ITEM_1,
+            status_code=200,
+        )
+        no_session_api = api.KeystoneSession(endpoint=self.BASE_URL)
+        for _i in range(2):
+            ret = no_session_api._request('GET', '/qaz')
+            self.assertEqual(api_fakes.RESP_ITEM_1, ret.json())
+        # One session is created for all the calls
+        self.assertIs(api._get_default_session(), api._get_default_session())
+
 
 class TestBaseAPI(api_fakes.TestSession):
 
@@ -0,0 +1,122 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import fixtures
+import mock
+from osc_lib import exceptions
+
+from openstackclient.common import cache
+from openstackclient.tests.unit import fakes
+from openstackclient.tests.unit import utils
+
+
+SCOPE = ('mycloud', 'RegionOne', 'project-id')
+
+
+class FakeManager(object):
+
+    resource_class = fakes.FakeResource
+
+    def __init__(self):
+        self.get = mock.Mock(side_effect=self._get)
+        self.find = mock.Mock(side_effect=self._find)
+
+    def _get(self, res_id):
+        if res_id != 'id-1':
+            raise exceptions.NotFound(404)
+        return fakes.FakeResource(
+            None, {'id': 'id-1', 'name': 'small'}, loaded=True)
+
+    def _find(self, **kwargs):
+        return self._get('id-1')
+
+
+class TestResourceCache(utils.TestCase):
+
+    def setUp(self):
+        super(TestResourceCache, self).setUp()
+        self.path = self.useFixture(fixtures.TempDir()).path
+        self.resource_cache = cache.ResourceCache(
+            self.path, SCOPE, {'flavor': 60, 'image': 0})
+
+    def test_persisted(self):
+        self.resource_cache.set('flavor', ['a', 'b'], {'x': 1})
+
+        resource_cache = cache.ResourceCache(
+            self.path, SCOPE, {'flavor': 60})
+        self.assertEqual({'x': 1}, resource_cache.get('flavor', 'a'))
+        self.assertEqual({'x': 1}, resource_cache.get('flavor', 'b'))
+
+        other_scope = cache.ResourceCache(
+            self.path, ('mycloud', 'RegionTwo', 'project-id'),
+            {'flavor': 60})
+        self.assertIsNone(other_scope.get('flavor', 'a'))
+
+    def test_expired(self):
+        with mock.patch.object(cache.time, 'time', return_value=1000.0):
+            self.resource_cache.set('flavor', ['a'], {'x': 1})
+        with mock.patch.object(cache.time, 'time', return_value=1059.0):
+            self.assertEqual({'x': 1}, self.resource_cache.get('flavor', 'a'))
+        with mock.patch.object(cache.time, 'time', return_value=1060.0):
+            self.assertIsNone(self.resource_cache.get('flavor', 'a'))
+
+    def test_disabled(self):
+        self.assertFalse(self.resource_cache.enabled('image'))
+        self.assertFalse(self.resource_cache.enabled('availability_zone'))
+        self.resource_cache.set('image', ['a'], {'x': 1})
+        self.assertIsNone(self.resource_cache.get('image', 'a'))
+
+    def test_get_or_fetch(self):
+        fetch_f = mock.Mock(return_value={'id-1': 'small'})
+        for _i in range(2):
+            self.assertEqual(
+                {'id-1': 'small'},
+                cache.get_or_fetch(
+                    self.resource_cache, 'flavor', 'names', fetch_f),
+            )
+        fetch_f.assert_called_once_with()
+
+    def test_get_or_fetch_no_cache(self):
+        fetch_f = mock.Mock(return_value=[])
+        cache.get_or_fetch(None, 'flavor', 'names', fetch_f)
+        cache.get_or_fetch(self.resource_cache, 'image', 'names', fetch_f)
+        self.assertEqual(2, fetch_f.call_count)
+
+    def test_find_resource(self):
+        manager = FakeManager()
+
+        res = cache.find_resource(
+            self.resource_cache, 'flavor', manager, 'small')
+        self.assertEqual('id-1', res.id)
+        calls = manager.get.call_count + manager.find.call_count
+
+        # Found again by name and by ID without any API call
+        for name_or_id in ('small', 'id-1'):
+            res = cache.find_resource(
+                self.resource_cache, 'flavor', manager, name_or_id)
+            self.assertIsInstance(res, fakes.FakeResource)
+            self.assertEqual('small', res.name)
+        self.assertEqual(
+            calls, manager.get.call_count + manager.find.call_count)
+
+    def test_get_resource_without_resource_class(self):
+        manager = mock.Mock(spec=['get'])
+        manager.get.return_value = {'id': 'id-1', 'name': 'cirros'}
+
+        cache.get_resource(self.resource_cache, 'flavor', manager, 'id-1')
+        res = cache.get_resource(
+            self.resource_cache, 'flavor', manager, 'id-1')
+
+        self.assertIsInstance(res, cache.CachedResource)
+        self.assertEqual('cirros', res.name)
+        manager.get.assert_called_once_with('id-1')
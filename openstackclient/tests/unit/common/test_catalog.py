@@ -0,0 +1,148 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+from keystoneauth1 import access
+from keystoneauth1 import exceptions as ks_exceptions
+from keystoneauth1 import fixture
+
+from openstackclient.common import catalog
+from openstackclient.tests.unit import utils
+
+
+def _v3_service_catalog():
+    token = fixture.V3Token()
+    compute = token.add_service('compute', name='nova')
+    compute.add_standard_endpoints(
+        public='https://nova.one.example.com',
+        internal='https://nova-int.one.example.com',
+        region='RegionOne',
+    )
+    compute.add_standard_endpoints(
+        public='https://nova.two.example.com',
+        region='RegionTwo',
+    )
+    image = token.add_service('image', name='glance')
+    image.add_standard_endpoints(
+        public='https://glance.one.example.com',
+        region='RegionOne',
+    )
+    return access.create(body=token).service_catalog
+
+
+def _v2_service_catalog():
+    token = fixture.V2Token()
+    compute = token.add_service('compute', name='nova')
+    compute.add_endpoint(
+        public='https://nova.one.example.com',
+        internal='https://nova-int.one.example.com',
+        region='RegionOne',
+    )
+    compute.add_endpoint(
+        public='https://nova.two.example.com',
+        region='RegionTwo',
+    )
+    return access.create(body=token).service_catalog
+
+
+class TestCatalogIndex(utils.TestCase):
+
+    def setUp(self):
+        super(TestCatalogIndex, self).setUp()
+        self.service_catalog = _v3_service_catalog()
+        self.index = catalog.CatalogIndex(self.service_catalog)
+
+    def test_service_types_and_regions(self):
+        self.assertEqual({'compute', 'image'}, self.index.service_types)
+        self.assertEqual({'RegionOne', 'RegionTwo'}, self.index.regions)
+        self.assertEqual(2, len(self.index))
+
+    def test_find_service(self):
+        self.assertEqual(
+            'compute',
+            self.index.find_service('nova')['type'],
+        )
+        self.assertEqual(
+            'glance',
+            self.index.find_service('image')['name'],
+        )
+        self.assertIsNone(self.index.find_service('volume'))
+
+    def test_url_for_region(self):
+        self.assertEqual(
+            'https://nova.two.example.com',
+            self.index.url_for('compute', region_name='RegionTwo'),
+        )
+        self.assertEqual(
+            'https://nova-int.one.example.com',
+            self.index.url_for(
+                'compute',
+                interface='internal',
+                region_name='RegionOne',
+            ),
+        )
+
+    def test_url_for_matches_service_catalog(self):
+        for region_name in (None, 'RegionOne', 'RegionTwo'):
+            for interface in ('public', 'publicURL'):
+                self.assertEqual(
+                    self.service_catalog.url_for(
+                        service_type='compute',
+                        interface=interface,
+                        region_name=region_name,
+                    ),
+                    self.index.url_for(
+                        'compute',
+                        interface=interface,
+                        region_name=region_name,
+                    ),
+                )
+
+    def test_url_for_not_found(self):
+        self.assertRaises(
+            ks_exceptions.EndpointNotFound,
+            self.index.url_for,
+            'image',
+            region_name='RegionTwo',
+        )
+        self.assertRaises(
+            ks_exceptions.EndpointNotFound,
+            self.index.url_for,
+            'volume',
+        )
+
+    def test_get_urls(self):
+        self.assertEqual(
+            ('https://nova.one.example.com', 'https://nova.two.example.com'),
+            self.index.get_urls('compute'),
+        )
+        self.assertEqual((), self.index.get_urls('compute', interface='admin'))
+
+    def test_v2_catalog(self):
+        index = catalog.CatalogIndex(_v2_service_catalog())
+        self.assertEqual(
+            'https://nova.two.example.com',
+            index.url_for('compute', region_name='RegionTwo'),
+        )
+        self.assertEqual(
+            'https://nova-int.one.example.com',
+            index.url_for('compute', interface='internalURL'),
+        )
+
+    def test_empty_catalog(self):
+        index = catalog.CatalogIndex(access.create(
+            body=fixture.V3Token()).service_catalog)
+        self.assertRaises(
+            ks_exceptions.EmptyCatalog,
+            index.url_for,
+            'compute',
+        )
@@ -15,10 +15,12 @@
 
 import copy
 
+import fixtures
 from keystoneauth1 import token_endpoint
 from osc_lib.tests import utils as osc_lib_test_utils
 
 from openstackclient.common import clientmanager
+from openstackclient.common import transport
 from openstackclient.tests.unit import fakes
 
 
@@ -67,3 +69,140 @@ class TestClientManager(osc_lib_test_utils.TestClientManager):
 
         self.assertFalse(client_manager.is_service_available('network'))
         self.assertFalse(client_manager.is_network_endpoint_enabled())
+
+    def test_client_manager_catalog_index(self):
+        # The endpoints of the fake catalog have no region
+        client_manager = self._make_clientmanager(
+            config_args={'interface': 'public', 'region_name': None},
+        )
+
+        index = client_manager.catalog_index
+        self.assertIs(index, client_manager.catalog_index)
+        self.assertTrue(client_manager.is_service_available('compute'))
+        self.assertFalse(client_manager.is_service_available('volume'))
+        self.assertEqual(
+            client_manager.auth_ref.service_catalog.url_for(
+                service_type='image',
+            ),
+            client_manager.get_endpoint_for_service_type('image'),
+        )
+
+    def test_client_manager_service_available_region(self):
+        client_manager = self._make_clientmanager(
+            config_args={'interface': 'public', 'region_name': None},
+        )
+        self.assertTrue(client_manager.is_service_available('compute'))
+
+        # The services have no endpoint in the region
+        region_manager = client_manager.for_region('RegionTwo')
+        self.assertFalse(region_manager.is_service_available('compute'))
+
+        # Nor for the interface of the fake cloud
+        client_manager = self._make_clientmanager(
+            config_args={'region_name': None},
+        )
+        self.assertFalse(client_manager.is_service_available('compute'))
+
+    def test_client_manager_catalog_index_token_endpoint(self):
+        token_auth = {
+            'url': fakes.AUTH_URL,
+            'token': fakes.AUTH_TOKEN,
+        }
+        client_manager = self._make_clientmanager(
+            auth_args=token_auth,
+            auth_plugin_name='token_endpoint',
+        )
+
+        self.assertIsNone(client_manager.catalog_index)
+        self.assertEqual(
+            fakes.AUTH_URL,
+            client_manager.get_endpoint_for_service_type('image'),
+        )
+
+    def test_client_manager_for_region(self):
+        client_manager = self._make_clientmanager()
+
+        region_manager = client_manager.for_region('RegionTwo')
+
+        self.assertEqual('RegionTwo', region_manager.region_name)
+        self.assertEqual(fakes.REGION_NAME, client_manager.region_name)
+        self.assertIs(client_manager.session, region_manager.session)
+        self.assertIs(client_manager.auth_ref, region_manager.auth_ref)
+        self.assertIsInstance(region_manager, clientmanager.ClientManager)
+        # API clients are cached per region
+        self.assertIn('compute', vars(type(region_manager)))
+
+    def test_client_manager_resource_cache_disabled(self):
+        client_manager = self._make_clientmanager()
+
+        self.assertIsNone(client_manager.resource_cache)
+
+    def test_client_manager_resource_cache(self):
+        client_manager = self._make_clientmanager()
+        path = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixtures.MockPatchObject(
+            client_manager._cli_options, 'get_cache_expiration',
+            return_value={'flavor': 60},
+        ))
+        self.useFixture(fixtures.MockPatchObject(
+            client_manager._cli_options, 'get_cache_path',
+            return_value=path,
+        ))
+
+        resource_cache = client_manager.resource_cache
+        self.assertIs(resource_cache, client_manager.resource_cache)
+        self.assertTrue(resource_cache.enabled('flavor'))
+        self.assertFalse(resource_cache.enabled('image'))
+        # Entries are kept per region
+        region_manager = client_manager.for_region('RegionTwo')
+        self.assertEqual(
+            'RegionTwo', region_manager.resource_cache.scope[1])
+
+    def test_client_manager_resource_cache_token_endpoint(self):
+        token_auth = {
+            'url': fakes.AUTH_URL,
+            'token': fakes.AUTH_TOKEN,
+        }
+        client_manager = self._make_clientmanager(
+            auth_args=token_auth,
+            auth_plugin_name='token_endpoint',
+        )
+        path = self.useFixture(fixtures.TempDir()).path
+        self.useFixture(fixtures.MockPatchObject(
+            client_manager._cli_options, 'get_cache_expiration',
+            return_value={'flavor': 60},
+        ))
+        self.useFixture(fixtures.MockPatchObject(
+            client_manager._cli_options, 'get_cache_path',
+            return_value=path,
+        ))
+
+        self.assertIsNone(client_manager.auth_ref)
+        resource_cache = client_manager.resource_cache
+        self.assertTrue(resource_cache.enabled('flavor'))
+        self.assertIsNone(resource_cache.scope[2])
+
+    def test_client_manager_shared_transport(self):
+        client_manager = self._make_clientmanager(
+            config_args={'pool_maxsize': 32},
+        )
+        client_manager._api_version.update({'image': '2', 'network': '2'})
+        self.useFixture(fixtures.MockPatchObject(
+            client_manager, 'get_endpoint_for_service_type',
+            return_value='http://glance:9292',
+        ))
+
+        adapter = client_manager.session.session.get_adapter(fakes.AUTH_URL)
+        self.assertIsInstance(adapter, transport.TransportAdapter)
+        self.assertEqual(32, adapter.poolmanager.connection_pool_kw['maxsize'])
+
+        # The image and network clients use the same requests session
+        self.assertIs(
+            client_manager.session,
+            client_manager.image.http_client.session,
+        )
+        client_manager.network
+        self.assertIs(
+            client_manager.session.session,
+            client_manager.sdk_connection.session.session,
+        )
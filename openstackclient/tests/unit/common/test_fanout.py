@@ -0,0 +1,135 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import mock
+
+from keystoneauth1 import exceptions as ks_exceptions
+from osc_lib.command import command
+from osc_lib import exceptions
+
+from openstackclient.common import fanout
+from openstackclient.tests.unit import utils
+
+
+class FakeListRegion(command.Lister):
+
+    def take_action(self, parsed_args):
+        client = self.app.client_manager.compute
+        return (
+            ('ID', 'Name'),
+            ((s['id'], s['name']) for s in client.servers.list()),
+        )
+
+
+def _client_manager(servers=None, exc=None):
+    client_manager = mock.Mock()
+    if exc:
+        client_manager.compute.servers.list.side_effect = exc
+    else:
+        client_manager.compute.servers.list.return_value = servers
+    return lambda: client_manager
+
+
+class TestResolveAll(utils.TestCase):
+
+    def test_resolve_all(self):
+        self.assertEqual(
+            {'a': 1, 'b': 2},
+            fanout.resolve_all({'a': lambda: 1, 'b': lambda: 2}),
+        )
+
+    def test_resolve_all_one_failure(self):
+        def _fail():
+            raise ks_exceptions.NotFound()
+
+        self.assertRaises(
+            ks_exceptions.NotFound,
+            fanout.resolve_all,
+            {'a': lambda: 1, 'b': _fail},
+        )
+
+    def test_resolve_all_failures(self):
+        def _fail(msg):
+            raise exceptions.CommandError(msg)
+
+        e = self.assertRaises(
+            exceptions.CommandError,
+            fanout.resolve_all,
+            {'a': lambda: _fail('no a'), 'b': lambda: _fail('no b')},
+        )
+        self.assertIn('no a', str(e))
+        self.assertIn('no b', str(e))
+
+
+class TestFanOut(utils.TestCommand):
+
+    def setUp(self):
+        super(TestFanOut, self).setUp()
+        self.cmd = FakeListRegion(self.app, None)
+        self.targets = [
+            ('RegionOne', _client_manager([{'id': '1', 'name': 'a'}])),
+            ('RegionTwo', _client_manager([
+                {'id': '2', 'name': 'b'},
+                {'id': '3', 'name': 'c'},
+            ])),
+        ]
+
+    def test_take_action(self):
+        columns, data, failures = fanout.take_action(
+            self.cmd, None, self.targets, 'Region')
+
+        self.assertEqual(('Region', 'ID', 'Name'), columns)
+        self.assertEqual([
+            ('RegionOne', '1', 'a'),
+            ('RegionTwo', '2', 'b'),
+            ('RegionTwo', '3', 'c'),
+        ], data)
+        self.assertEqual([], failures)
+
+    def test_take_action_failure(self):
+        self.targets.insert(
+            1, ('RegionBad', _client_manager(exc=Exception('boom'))))
+
+        columns, data, failures = fanout.take_action(
+            self.cmd, None, self.targets, 'Region')
+
+        self.assertEqual(('Region', 'ID', 'Name'), columns)
+        self.assertEqual(3, len(data))
+        self.assertEqual(['RegionBad'], failures)
+
+    def test_take_action_ignore_missing(self):
+        self.targets.append((
+            'RegionEmpty',
+            _client_manager(exc=ks_exceptions.EndpointNotFound()),
+        ))
+
+        columns, data, failures = fanout.take_action(
+            self.cmd, None, self.targets, 'Region', ignore_missing=True)
+
+        self.assertEqual(3, len(data))
+        self.assertEqual([], failures)
+
+    def test_fan_out_run(self):
+        self.targets.append(
+            ('RegionBad', _client_manager(exc=Exception('boom'))))
+        fanout.fan_out(self.cmd, self.targets, 'Region')
+
+        parser = self.cmd.get_parser('fake list')
+        parsed_args = parser.parse_args(['-f', 'value'])
+        result = self.cmd.run(parsed_args)
+
+        self.assertEqual(1, result)
+        self.assertEqual(
+            'RegionOne 1 a\nRegionTwo 2 b\nRegionTwo 3 c\n',
+            self.app.stdout.make_string(),
+        )
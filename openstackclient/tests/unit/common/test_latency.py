@@ -0,0 +1,110 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import json
+
+from keystoneauth1 import session
+import mock
+from requests import adapters
+import six
+
+from openstackclient.common import latency
+from openstackclient.tests.unit import utils
+
+
+class TestProfile(utils.TestCase):
+
+    def setUp(self):
+        super(TestProfile, self).setUp()
+        self.profile = latency.Profile(start=100.0)
+        self.profile.add('import', 'phase', 100.0, 0.5)
+        self.profile.add('auth', 'phase', 100.5, 1.0)
+        self.profile.add(
+            'POST http://keystone/v3/auth/tokens', 'http', 100.6, 0.8,
+            status=201, connect=0.1, tls=0.2, ttfb=0.4, transfer=0.1,
+        )
+        self.profile.add('config', 'phase', 101.5, 0.25)
+        self.profile.add('config', 'phase', 101.75, 0.25)
+
+    def test_summary(self):
+        self.assertEqual([
+            ('import', 0.5),
+            ('auth', 1.0),
+            ('config', 0.5),
+            ('http', 0.8),
+            ('total', 2.0),
+        ], self.profile.summary())
+
+    def test_span(self):
+        with self.profile.span('format'):
+            pass
+        span = self.profile.spans[-1]
+        self.assertEqual('format', span['name'])
+        self.assertEqual('phase', span['category'])
+
+    def test_to_dict(self):
+        data = self.profile.to_dict()
+        self.assertEqual(0.8, data['summary']['http'])
+        self.assertEqual(0.6, round(data['spans'][2]['start'], 6))
+        self.assertEqual(201, data['spans'][2]['args']['status'])
+
+    def test_to_chrome_trace(self):
+        trace = self.profile.to_chrome_trace()
+        event = trace['traceEvents'][1]
+        self.assertEqual('auth', event['name'])
+        self.assertEqual('X', event['ph'])
+        self.assertEqual(500000, event['ts'])
+        self.assertEqual(1000000, event['dur'])
+
+    def test_write_chrome(self):
+        stream = six.StringIO()
+        self.profile.write(stream, 'chrome')
+        self.assertEqual(
+            5,
+            len(json.loads(stream.getvalue())['traceEvents']),
+        )
+
+
+class TestTimingAdapter(utils.TestCase):
+
+    def test_send(self):
+        profile = latency.Profile()
+        adapter = latency.TimingAdapter(profile)
+        request = mock.Mock(method='GET', url='http://nova/servers')
+        response = mock.Mock(status_code=200)
+
+        with mock.patch.object(
+                adapters.HTTPAdapter, 'send', return_value=response):
+            self.assertIs(response, adapter.send(request))
+
+        span = profile.spans[0]
+        self.assertEqual('GET http://nova/servers', span['name'])
+        self.assertEqual('http', span['category'])
+        self.assertEqual(200, span['args']['status'])
+        self.assertEqual(0.0, span['args']['connect'])
+        self.assertEqual(0.0, span['args']['tls'])
+
+    def test_pool_classes(self):
+        adapter = latency.TimingAdapter(latency.Profile())
+        self.assertEqual(
+            latency._TimedHTTPSConnectionPool,
+            adapter.poolmanager.pool_classes_by_scheme['https'],
+        )
+
+    def test_instrument_session(self):
+        profile = latency.Profile()
+        sess = session.Session()
+        latency.instrument_session(sess, profile)
+        adapter = sess.session.get_adapter('https://nova/servers')
+        self.assertIsInstance(adapter, latency.TimingAdapter)
+        self.assertIs(profile, adapter.profile)
@@ -0,0 +1,108 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import socket
+
+from keystoneauth1 import session
+from osc_lib import exceptions
+from requests import adapters
+
+from openstackclient.common import transport
+from openstackclient.tests.unit import utils
+
+
+class TestTransport(utils.TestCase):
+
+    def test_get_options_default(self):
+        self.assertEqual(
+            {
+                'keepalive': True,
+                'pool_connections': transport.DEFAULT_POOL_CONNECTIONS,
+                'pool_maxsize': transport.DEFAULT_POOL_MAXSIZE,
+                'max_retries': transport.DEFAULT_MAX_RETRIES,
+                'retry_backoff': transport.DEFAULT_RETRY_BACKOFF,
+            },
+            transport.get_options({}),
+        )
+
+    def test_get_options(self):
+        self.assertEqual(
+            {
+                'keepalive': False,
+                'pool_connections': 4,
+                'pool_maxsize': 32,
+                'max_retries': 3,
+                'retry_backoff': 0.1,
+                'http_adapter': 'hyper.contrib.HTTP20Adapter',
+            },
+            transport.get_options({
+                'keepalive': 'false',
+                'pool_connections': 4,
+                'pool_maxsize': '32',
+                'max_retries': '3',
+                'retry_backoff': '0.1',
+                'http_adapter': 'hyper.contrib.HTTP20Adapter',
+            }),
+        )
+
+    def test_get_options_invalid(self):
+        for config in ({'pool_maxsize': 'lots'},
+                       {'pool_connections': '0'},
+                       {'max_retries': '-1'}):
+            self.assertRaises(
+                exceptions.CommandError,
+                transport.get_options,
+                config,
+            )
+
+    def test_retries(self):
+        adapter = transport.TransportAdapter(max_retries=3, retry_backoff=1)
+        self.assertEqual(3, adapter.max_retries.connect)
+        self.assertFalse(adapter.max_retries.read)
+        self.assertEqual(1, adapter.max_retries.backoff_factor)
+
+        adapter = transport.TransportAdapter()
+        self.assertEqual(0, adapter.max_retries.total)
+
+    def test_build_adapter(self):
+        adapter = transport.build_adapter(
+            http_adapter='requests.adapters.HTTPAdapter',
+            pool_maxsize=32,
+        )
+        self.assertIs(adapters.HTTPAdapter, type(adapter))
+
+    def test_build_adapter_invalid(self):
+        self.assertRaises(
+            exceptions.CommandError,
+            transport.build_adapter,
+            http_adapter='requests.adapters.NoSuchAdapter',
+        )
+
+    def test_configure_session(self):
+        sess = session.Session()
+        adapter = transport.configure_session(sess, pool_maxsize=32)
+
+        for url in ('https://nova/servers', 'http://glance/v2/images'):
+            self.assertIs(adapter, sess.session.get_adapter(url))
+        self.assertEqual(32, adapter.poolmanager.connection_pool_kw['maxsize'])
+        self.assertIn(
+            (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+            adapter.poolmanager.connection_pool_kw['socket_options'],
+        )
+
+    def test_no_keepalive(self):
+        adapter = transport.TransportAdapter(keepalive=False)
+        self.assertEqual(
+            [(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)],
+            adapter.poolmanager.connection_pool_kw['socket_options'],
+        )
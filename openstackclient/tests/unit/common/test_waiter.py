@@ -0,0 +1,129 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import mock
+
+from openstackclient.common import waiter
+from openstackclient.tests.unit import utils
+
+
+class NotFound(Exception):
+    pass
+
+
+def _resource(res_id, status, progress=0):
+    return mock.Mock(id=res_id, status=status, progress=progress)
+
+
+class TestWaiter(utils.TestCase):
+
+    def setUp(self):
+        super(TestWaiter, self).setUp()
+        sleep = mock.patch.object(waiter.time, 'sleep')
+        self.sleep = sleep.start()
+        self.addCleanup(sleep.stop)
+
+    def test_wait_for_status_single_uses_get(self):
+        get_f = mock.Mock(side_effect=[
+            _resource('a', 'BUILD'),
+            _resource('a', 'ACTIVE'),
+        ])
+        list_f = mock.Mock()
+
+        self.assertTrue(waiter.wait_for_status(get_f, 'a', list_f=list_f))
+        self.assertEqual(2, get_f.call_count)
+        list_f.assert_not_called()
+
+    def test_wait_for_status_multi_uses_list(self):
+        get_f = mock.Mock()
+        list_f = mock.Mock(side_effect=[
+            [_resource('a', 'BUILD'), _resource('b', 'BUILD'),
+             _resource('c', 'ACTIVE')],
+            [_resource('a', 'ACTIVE'), _resource('b', 'BUILD')],
+        ])
+        get_f.return_value = _resource('b', 'ERROR')
+
+        w = waiter.Waiter(get_f, list_f=list_f)
+        for res_id in ('a', 'b', 'c'):
+            w.add(res_id)
+        results = w.wait()
+
+        self.assertEqual({'a': True, 'b': False, 'c': True}, dict(results))
+        self.assertEqual(2, list_f.call_count)
+        # b is the only one left, it is polled on its own
+        get_f.assert_called_once_with('b')
+
+    def test_wait_for_status_missing_from_list(self):
+        get_f = mock.Mock(return_value=_resource('b', 'ACTIVE'))
+        list_f = mock.Mock(return_value=[_resource('a', 'ACTIVE')])
+
+        self.assertTrue(waiter.wait_for_status(
+            get_f, ['a', 'b'], list_f=list_f))
+        get_f.assert_called_once_with('b')
+
+    def test_wait_for_delete(self):
+        manager = mock.Mock()
+        manager.list.return_value = [_resource('a', 'DELETING')]
+        manager.get.side_effect = NotFound()
+
+        self.assertTrue(waiter.wait_for_delete(
+            manager, ['a', 'b'], exception_name=['NotFound']))
+        manager.get.assert_has_calls([mock.call('b'), mock.call('a')])
+
+    def test_wait_for_delete_error(self):
+        manager = mock.Mock()
+        manager.get.return_value = _resource('a', 'ERROR')
+
+        self.assertFalse(waiter.wait_for_delete(manager, 'a'))
+        manager.list.assert_not_called()
+
+    def test_wait_for_delete_timeout(self):
+        manager = mock.Mock()
+        manager.get.return_value = _resource('a', 'DELETING')
+
+        self.assertFalse(waiter.wait_for_delete(
+            manager, 'a', sleep_time=5, timeout=20))
+
+    def test_backoff(self):
+        get_f = mock.Mock(side_effect=[
+            _resource('a', 'BUILD'),
+            _resource('a', 'BUILD'),
+            _resource('a', 'BUILD'),
+            _resource('a', 'BUILD', progress=50),
+            _resource('a', 'ACTIVE'),
+        ])
+        w = waiter.Waiter(get_f, sleep_time=2, max_sleep_time=3, backoff=2)
+        w.add('a')
+
+        with mock.patch.object(waiter.random, 'uniform',
+                               side_effect=lambda a, b: b):
+            w.wait()
+
+        self.assertEqual(
+            [mock.call(3), mock.call(3), mock.call(3), mock.call(2)],
+            self.sleep.call_args_list,
+        )
+
+    def test_progress_callback(self):
+        callback = mock.Mock()
+        get_f = mock.Mock(side_effect=[
+            _resource('a', 'ACTIVE'),
+            _resource('b', 'BUILD', progress=50),
+            _resource('b', 'ACTIVE'),
+        ])
+        w = waiter.Waiter(get_f, callback=callback)
+        w.add('a')
+        w.add('b')
+        w.wait()
+
+        callback.assert_called_once_with(75)
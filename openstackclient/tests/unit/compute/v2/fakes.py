@@ -17,6 +17,8 @@ import copy
 import mock
 import uuid
 
+from novaclient import api_versions
+
 from openstackclient.tests.unit import fakes
 from openstackclient.tests.unit.identity.v2_0 import fakes as identity_fakes
 from openstackclient.tests.unit.image.v2 import fakes as image_fakes
@@ -208,6 +210,8 @@ class FakeComputev2Client(object):
 
         self.management_url = kwargs['endpoint']
 
+        self.api_version = api_versions.APIVersion('2.1')
+
 
 class TestComputev2(utils.TestCommand):
 
@@ -494,6 +494,32 @@ class TestFlavorList(TestFlavor):
         self.assertEqual(self.columns_long, columns)
         self.assertEqual(tuple(self.data_long), tuple(data))
 
+    def test_flavor_list_long_extra_specs_cached(self):
+        flavors = compute_fakes.FakeFlavor.create_flavors(count=3)
+        self.flavors_mock.list.return_value = flavors
+        parsed_args = self.check_parser(self.cmd, ['--long'], [])
+
+        for _i in range(2):
+            columns, data = self.cmd.take_action(parsed_args)
+            self.assertEqual(3, len(list(data)))
+
+        for f in flavors:
+            f.get_keys.assert_called_once_with()
+
+    def test_flavor_list_long_embedded_extra_specs(self):
+        flavor = compute_fakes.FakeFlavor.create_one_flavor(
+            attrs={'extra_specs': {'hw:cpu_policy': 'dedicated'}})
+        self.flavors_mock.list.return_value = [flavor]
+        parsed_args = self.check_parser(self.cmd, ['--long'], [])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(
+            u"hw:cpu_policy='dedicated'",
+            list(data)[0][-1],
+        )
+        flavor.get_keys.assert_not_called()
+
 
 class TestFlavorSet(TestFlavor):
 
@@ -15,6 +15,7 @@
 
 import copy
 
+import mock
 from novaclient import exceptions as nova_exceptions
 from osc_lib import exceptions
 
@@ -188,6 +189,75 @@ class TestHypervisorList(TestHypervisor):
         self.assertEqual(self.columns_long, columns)
         self.assertEqual(self.data_long, tuple(data))
 
+    def test_hypervisor_list_with_uptime_and_aggregates(self):
+        arglist = [
+            '--long',
+            '--with-uptime',
+            '--with-aggregates',
+        ]
+        verifylist = [
+            ('long', True),
+            ('with_uptime', True),
+            ('with_aggregates', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        aggregate = compute_fakes.FakeAggregate.create_one_aggregate(
+            attrs={'hosts': ['aaa']})
+        self.aggregates_mock.list.return_value = [aggregate]
+
+        def uptime(hypervisor_id):
+            return fakes.FakeResource(info={
+                'id': hypervisor_id,
+                'uptime': ' 01:28:24 up 3 days, 11:15,  1 user, '
+                          ' load average: 0.94, 0.62, 0.50\n',
+            }, loaded=True)
+
+        self.hypervisors_mock.uptime.side_effect = uptime
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(
+            self.columns_long + ("Uptime", "Load Average", "Aggregates"),
+            columns,
+        )
+        self.assertEqual(
+            tuple(row + ('3 days, 11:15', '0.94, 0.62, 0.50', aggregate.name)
+                  for row in self.data_long),
+            tuple(data),
+        )
+        self.aggregates_mock.list.assert_called_once_with()
+        self.hypervisors_mock.uptime.assert_has_calls(
+            [mock.call(h.id) for h in self.hypervisors], any_order=True)
+
+    def test_hypervisor_list_matching_with_aggregates(self):
+        arglist = [
+            '--matching', self.hypervisors[0].hypervisor_hostname,
+            '--with-aggregates',
+        ]
+        verifylist = [
+            ('matching', self.hypervisors[0].hypervisor_hostname),
+            ('with_aggregates', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        # Search results have no service
+        found = fakes.FakeResource(info={
+            'id': self.hypervisors[0].id,
+            'hypervisor_hostname': self.hypervisors[0].hypervisor_hostname,
+        }, loaded=True)
+        self.hypervisors_mock.search.return_value = [found]
+        self.hypervisors_mock.get.return_value = self.hypervisors[0]
+        self.aggregates_mock.list.return_value = []
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.columns + ("Aggregates",), columns)
+        self.assertEqual('', tuple(data)[0][-1])
+        self.hypervisors_mock.get.assert_called_once_with(
+            self.hypervisors[0].id)
+        self.hypervisors_mock.uptime.assert_not_called()
+
 
 class TestHypervisorShow(TestHypervisor):
 
@@ -362,3 +432,67 @@ class TestHypervisorShow(TestHypervisor):
 
         self.assertEqual(expected_columns, columns)
         self.assertEqual(expected_data, data)
+
+    def test_hypervisor_show_by_id(self):
+        self.hypervisor = compute_fakes.FakeHypervisor.create_one_hypervisor(
+            attrs={'id': 42})
+        self.hypervisors_mock.get.return_value = self.hypervisor
+        arglist = [
+            '42',
+        ]
+        verifylist = [
+            ('hypervisor', '42'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        # The uptime is fetched alongside the hypervisor, not after it
+        self.hypervisors_mock.uptime.assert_called_once_with('42')
+        self.assertIn('uptime', columns)
+
+    def test_hypervisor_show_aggregates(self):
+        aggregates = compute_fakes.FakeAggregate.create_aggregates(count=3)
+        aggregates[0].hosts = ['aaa', 'bbb']
+        aggregates[1].hosts = ['bbb']
+        aggregates[2].hosts = ['aaa']
+        self.aggregates_mock.list.return_value = aggregates
+        arglist = [
+            self.hypervisor.hypervisor_hostname,
+        ]
+        verifylist = [
+            ('hypervisor', self.hypervisor.hypervisor_hostname),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        for _i in range(2):
+            columns, data = self.cmd.take_action(parsed_args)
+            self.assertEqual(
+                [aggregates[0].name, aggregates[2].name],
+                data[columns.index('aggregates')],
+            )
+        # The host index is built once for the compute client
+        self.aggregates_mock.list.assert_called_once_with()
+        self.hypervisors_mock.uptime.assert_called_with(self.hypervisor.id)
+
+    def test_hypervisor_show_cell_aggregates(self):
+        self.hypervisor = compute_fakes.FakeHypervisor.create_one_hypervisor(
+            attrs={'service': {'id': 1, 'host': 'cell1@aaa'}})
+        self.hypervisors_mock.get.return_value = self.hypervisor
+        aggregates = compute_fakes.FakeAggregate.create_aggregates(count=2)
+        aggregates[0].name = 'cell1@agg'
+        aggregates[0].hosts = ['aaa']
+        aggregates[1].name = 'cell2@agg'
+        aggregates[1].hosts = ['aaa']
+        self.aggregates_mock.list.return_value = aggregates
+        arglist = [
+            self.hypervisor.hypervisor_hostname,
+        ]
+        verifylist = [
+            ('hypervisor', self.hypervisor.hypervisor_hostname),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(['cell1@agg'], data[columns.index('aggregates')])
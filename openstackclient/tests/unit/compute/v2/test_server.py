@@ -18,9 +18,9 @@ import mock
 from mock import call
 
 from osc_lib import exceptions
-from osc_lib import utils as common_utils
 from oslo_utils import timeutils
 
+from openstackclient.common import waiter
 from openstackclient.compute.v2 import server
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
 from openstackclient.tests.unit.image.v2 import fakes as image_fakes
@@ -613,7 +613,7 @@ class TestServerCreate(TestServer):
                           self.cmd.take_action, parsed_args)
         self.assertNotCalled(self.servers_mock.create)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
+    @mock.patch.object(waiter, 'wait_for_status', return_value=True)
     def test_server_create_with_wait_ok(self, mock_wait_for_status):
         arglist = [
             '--image', 'image1',
@@ -661,7 +661,84 @@ class TestServerCreate(TestServer):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.datalist(), data)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
+    @mock.patch.object(waiter.time, 'sleep')
+    def test_server_create_min_max_wait_reservation(self, mock_sleep):
+        servers = compute_fakes.FakeServer.create_servers(
+            attrs={
+                'status': 'ACTIVE',
+                'networks': {},
+                'OS-EXT-SRV-ATTR:reservation_id': 'r-1',
+            },
+            count=3,
+        )
+        self.servers_mock.create.return_value = servers[0]
+        self.servers_mock.get.return_value = servers[0]
+        self.servers_mock.list.return_value = servers
+
+        arglist = [
+            '--image', 'image1',
+            '--flavor', 'flavor1',
+            '--min', '2',
+            '--max', '3',
+            '--wait',
+            self.new_server.name,
+        ]
+        verifylist = [
+            ('min', 2),
+            ('max', 3),
+            ('wait', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.servers_mock.list.assert_called_with(
+            search_opts={'reservation_id': 'r-1'})
+        mock_sleep.assert_not_called()
+
+    @mock.patch.object(waiter.time, 'sleep')
+    def test_server_create_min_max_wait_fails(self, mock_sleep):
+        first, second = compute_fakes.FakeServer.create_servers(
+            attrs={
+                'status': 'ACTIVE',
+                'created': '2017-03-01T12:00:00Z',
+                'image': {'id': 'image-id'},
+                'flavor': {'id': 'flavor-id'},
+            },
+        )
+        second.status = 'ERROR'
+        other = compute_fakes.FakeServer.create_one_server(attrs={
+            'status': 'BUILD',
+            'created': '2017-02-01T12:00:00Z',
+            'image': {'id': 'image-id'},
+            'flavor': {'id': 'flavor-id'},
+        })
+        self.servers_mock.create.return_value = first
+        self.servers_mock.get.return_value = first
+        self.servers_mock.list.return_value = [first, other, second]
+
+        arglist = [
+            '--image', 'image1',
+            '--flavor', 'flavor1',
+            '--max', '2',
+            '--wait',
+            'fleet',
+        ]
+        verifylist = [
+            ('max', 2),
+            ('wait', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(SystemExit, self.cmd.take_action, parsed_args)
+
+        self.servers_mock.list.assert_called_with(search_opts={
+            'name': '^fleet',
+            'changes-since': '2017-03-01T12:00:00Z',
+        })
+        mock_sleep.assert_not_called()
+
+    @mock.patch.object(waiter, 'wait_for_status', return_value=False)
     def test_server_create_with_wait_fails(self, mock_wait_for_status):
         arglist = [
             '--image', 'image1',
@@ -826,6 +903,62 @@ class TestServerCreate(TestServer):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.datalist(), data)
 
+    def test_server_create_with_snapshot_block_device_mapping(self):
+        snapshot = volume_fakes.FakeSnapshot.create_one_snapshot()
+        snapshots_mock = self.app.client_manager.volume.volume_snapshots
+        snapshots_mock.get.return_value = snapshot
+        arglist = [
+            '--image', 'image1',
+            '--flavor', self.flavor.id,
+            '--block-device-mapping', 'vdb=%s:snapshot:1' % snapshot.name,
+            self.new_server.name,
+        ]
+        verifylist = [
+            ('block_device_mapping', ['vdb=%s:snapshot:1' % snapshot.name]),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        snapshots_mock.get.assert_called_with(snapshot.name)
+        self.assertEqual(
+            [{
+                'device_name': 'vdb',
+                'uuid': snapshot.id,
+                'destination_type': 'volume',
+                'source_type': 'snapshot',
+                'volume_size': '1',
+            }],
+            self.servers_mock.create.call_args[1]['block_device_mapping_v2'],
+        )
+
+    def test_server_create_lookup_errors_reported_together(self):
+        arglist = [
+            '--image', 'image1',
+            '--flavor', 'flavor1',
+            '--block-device-mapping', 'vdb=volume1',
+            self.new_server.name,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        def _find_resource(manager, name_or_id):
+            # The lookups run concurrently, in any order
+            if name_or_id == 'image1':
+                return self.image
+            raise exceptions.CommandError('No %s' % name_or_id)
+
+        with mock.patch.object(
+            server.utils,
+            'find_resource',
+            side_effect=_find_resource,
+        ):
+            e = self.assertRaises(exceptions.CommandError,
+                                  self.cmd.take_action, parsed_args)
+
+        self.assertIn('No flavor1', str(e))
+        self.assertIn('No volume1', str(e))
+        self.assertNotCalled(self.servers_mock.create)
+
 
 class TestServerDelete(TestServer):
 
@@ -837,6 +970,24 @@ class TestServerDelete(TestServer):
         # Get the command object to test
         self.cmd = server.DeleteServer(self.app, None)
 
+    def setup_servers_mock(self, count):
+        servers = compute_fakes.FakeServer.create_servers(count=count)
+        servers_by_id = dict((s.id, s) for s in servers)
+        deleted = set()
+
+        # The servers are looked up concurrently, in any order
+        def _get(server_id):
+            if server_id in deleted:
+                raise exceptions.NotFound(404)
+            if server_id in servers_by_id:
+                return servers_by_id[server_id]
+            raise exceptions.NotFound(404)
+
+        self.servers_mock.get.side_effect = _get
+        self.servers_mock.find.side_effect = exceptions.NotFound(404)
+        self.servers_mock.delete.side_effect = deleted.add
+        return servers
+
     def test_server_delete_no_options(self):
         servers = self.setup_servers_mock(count=1)
 
@@ -871,11 +1022,30 @@ class TestServerDelete(TestServer):
         calls = []
         for s in servers:
             calls.append(call(s.id))
-        self.servers_mock.delete.assert_has_calls(calls)
+        self.servers_mock.delete.assert_has_calls(calls, any_order=True)
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_delete', return_value=True)
-    def test_server_delete_wait_ok(self, mock_wait_for_delete):
+    def test_server_delete_multi_servers_with_exception(self):
+        servers = self.setup_servers_mock(count=2)
+
+        arglist = [servers[0].id, 'unexist_server', servers[1].id]
+        verifylist = [
+            ('server', arglist),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        try:
+            self.cmd.take_action(parsed_args)
+            self.fail('CommandError should be raised.')
+        except exceptions.CommandError as e:
+            self.assertEqual('1 of 3 servers failed to delete.', str(e))
+
+        self.servers_mock.delete.assert_has_calls(
+            [call(servers[0].id), call(servers[1].id)], any_order=True)
+        self.assertEqual(2, self.servers_mock.delete.call_count)
+
+    @mock.patch.object(waiter.time, 'sleep')
+    def test_server_delete_wait_ok(self, mock_sleep):
         servers = self.setup_servers_mock(count=1)
 
         arglist = [
@@ -883,39 +1053,65 @@ class TestServerDelete(TestServer):
         ]
         verifylist = [
             ('server', [servers[0].id]),
+            ('wait', True),
         ]
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         result = self.cmd.take_action(parsed_args)
 
         self.servers_mock.delete.assert_called_with(servers[0].id)
-        mock_wait_for_delete.assert_called_once_with(
-            self.servers_mock,
-            servers[0].id,
-            callback=server._show_progress
-        )
+        self.servers_mock.list.assert_not_called()
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_delete', return_value=False)
-    def test_server_delete_wait_fails(self, mock_wait_for_delete):
-        servers = self.setup_servers_mock(count=1)
+    @mock.patch.object(waiter.time, 'sleep')
+    def test_server_delete_multi_servers_wait(self, mock_sleep):
+        servers = self.setup_servers_mock(count=3)
+        # One server is still being deleted at the first poll
+        deleting = compute_fakes.FakeServer.create_one_server(attrs={
+            'id': servers[0].id,
+            'status': 'ACTIVE',
+        })
+        self.servers_mock.list.return_value = [deleting]
+
+        arglist = [s.id for s in servers] + ['--wait']
+        verifylist = [
+            ('server', [s.id for s in servers]),
+            ('wait', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        result = self.cmd.take_action(parsed_args)
+
+        self.servers_mock.delete.assert_has_calls(
+            [call(s.id) for s in servers], any_order=True)
+        # All the servers are polled together with one list call
+        self.servers_mock.list.assert_called_once_with()
+        self.assertEqual(1, mock_sleep.call_count)
+        self.assertIsNone(result)
+
+    @mock.patch.object(waiter.time, 'sleep')
+    def test_server_delete_wait_fails(self, mock_sleep):
+        servers = self.setup_servers_mock(count=2)
+        failed = compute_fakes.FakeServer.create_one_server(attrs={
+            'id': servers[1].id,
+            'status': 'ERROR',
+        })
+        self.servers_mock.list.return_value = [failed]
 
         arglist = [
-            servers[0].id, '--wait'
+            servers[0].id, servers[1].id, '--wait'
         ]
         verifylist = [
-            ('server', [servers[0].id]),
+            ('server', [servers[0].id, servers[1].id]),
+            ('wait', True),
         ]
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
-        self.assertRaises(SystemExit, self.cmd.take_action, parsed_args)
-
-        self.servers_mock.delete.assert_called_with(servers[0].id)
-        mock_wait_for_delete.assert_called_once_with(
-            self.servers_mock,
-            servers[0].id,
-            callback=server._show_progress
-        )
+        try:
+            self.cmd.take_action(parsed_args)
+            self.fail('CommandError should be raised.')
+        except exceptions.CommandError as e:
+            self.assertEqual('1 of 2 servers failed to delete.', str(e))
 
 
 class TestServerDumpCreate(TestServer):
@@ -1274,7 +1470,7 @@ class TestServerRebuild(TestServer):
         self.images_mock.get.assert_called_with(self.image.id)
         self.server.rebuild.assert_called_with(self.image, password)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
+    @mock.patch.object(waiter, 'wait_for_status', return_value=True)
     def test_rebuild_with_wait_ok(self, mock_wait_for_status):
         arglist = [
             '--wait',
@@ -1302,7 +1498,7 @@ class TestServerRebuild(TestServer):
         self.images_mock.get.assert_called_with(self.image.id)
         self.server.rebuild.assert_called_with(self.image, None)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
+    @mock.patch.object(waiter, 'wait_for_status', return_value=False)
     def test_rebuild_with_wait_fails(self, mock_wait_for_status):
         arglist = [
             '--wait',
@@ -1548,7 +1744,7 @@ class TestServerResize(TestServer):
         self.servers_mock.revert_resize.assert_called_with(self.server)
         self.assertIsNone(result)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
+    @mock.patch.object(waiter, 'wait_for_status', return_value=True)
     def test_server_resize_with_wait_ok(self, mock_wait_for_status):
 
         arglist = [
@@ -1588,7 +1784,7 @@ class TestServerResize(TestServer):
         self.assertNotCalled(self.servers_mock.confirm_resize)
         self.assertNotCalled(self.servers_mock.revert_resize)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
+    @mock.patch.object(waiter, 'wait_for_status', return_value=False)
     def test_server_resize_with_wait_fails(self, mock_wait_for_status):
 
         arglist = [
@@ -1872,6 +2068,8 @@ class TestServerShow(TestServer):
 
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.data, data)
+        # The server found by name is not fetched again
+        self.servers_mock.get.assert_called_once_with(self.server.name)
 
     def test_show_diagnostics(self):
         arglist = [
@@ -2144,13 +2342,7 @@ class TestServerGeneral(TestServer):
                (data_1, data_2, networks_format))
         self.assertIn(networks_format, (data_1, data_2), msg)
 
-    @mock.patch('osc_lib.utils.find_resource')
-    def test_prep_server_detail(self, find_resource):
-        # Setup mock method return value. utils.find_resource() will be called
-        # three times in _prep_server_detail():
-        # - The first time, return server info.
-        # - The second time, return image info.
-        # - The third time, return flavor info.
+    def test_prep_server_detail(self):
         _image = image_fakes.FakeImage.create_one_image()
         _flavor = compute_fakes.FakeFlavor.create_one_flavor()
         server_info = {
@@ -2161,7 +2353,9 @@ class TestServerGeneral(TestServer):
             'links': u'http://xxx.yyy.com',
         }
         _server = compute_fakes.FakeServer.create_one_server(attrs=server_info)
-        find_resource.side_effect = [_server, _image, _flavor]
+        self.servers_mock.get.return_value = _server
+        self.images_mock.get.return_value = _image
+        self.flavors_mock.get.return_value = _flavor
 
         # Prepare result data.
         info = {
@@ -2187,3 +2381,75 @@ class TestServerGeneral(TestServer):
 
         # Check the results.
         self.assertEqual(info, server_detail)
+        self.servers_mock.get.assert_called_once_with(_server.id)
+        self.images_mock.get.assert_called_once_with(_image.id)
+        self.flavors_mock.get.assert_called_once_with(_flavor.id)
+
+    def test_prep_server_detail_no_refresh(self):
+        _flavor = compute_fakes.FakeFlavor.create_one_flavor()
+        _server = compute_fakes.FakeServer.create_one_server(attrs={
+            'image': '',
+            'flavor': {u'id': _flavor.id},
+            'networks': {},
+        })
+        self.flavors_mock.get.return_value = _flavor
+
+        for _i in range(2):
+            server_detail = server._prep_server_detail(
+                self.app.client_manager.compute,
+                self.app.client_manager.image,
+                _server,
+                refresh=False,
+            )
+
+        self.assertEqual('', server_detail['image'])
+        self.assertEqual(
+            u'%s (%s)' % (_flavor.name, _flavor.id),
+            server_detail['flavor'],
+        )
+        self.servers_mock.get.assert_not_called()
+        self.images_mock.get.assert_not_called()
+        # The flavor is only looked up once
+        self.flavors_mock.get.assert_called_once_with(_flavor.id)
+
+    def test_prep_server_detail_image_without_id(self):
+        _flavor = compute_fakes.FakeFlavor.create_one_flavor()
+        _server = compute_fakes.FakeServer.create_one_server(attrs={
+            'image': {u'links': []},
+            'flavor': {u'id': _flavor.id},
+            'networks': {},
+        })
+        self.flavors_mock.get.return_value = _flavor
+
+        server_detail = server._prep_server_detail(
+            self.app.client_manager.compute,
+            self.app.client_manager.image,
+            _server,
+            refresh=False,
+        )
+
+        self.assertEqual('', server_detail['image'])
+        self.images_mock.get.assert_not_called()
+
+    def test_prep_server_detail_image_not_found(self):
+        _flavor = compute_fakes.FakeFlavor.create_one_flavor()
+        _server = compute_fakes.FakeServer.create_one_server(attrs={
+            'image': {u'id': 'deleted-image-id'},
+            'flavor': {u'id': _flavor.id},
+            'networks': {},
+        })
+        self.images_mock.get.side_effect = exceptions.NotFound(404)
+        self.flavors_mock.get.return_value = _flavor
+
+        server_detail = server._prep_server_detail(
+            self.app.client_manager.compute,
+            self.app.client_manager.image,
+            _server,
+            refresh=False,
+        )
+
+        self.assertEqual('deleted-image-id', server_detail['image'])
+        self.assertEqual(
+            u'%s (%s)' % (_flavor.name, _flavor.id),
+            server_detail['flavor'],
+        )
@@ -16,6 +16,7 @@ import mock
 from osc_lib import exceptions
 from osc_lib import utils as common_utils
 
+from openstackclient.common import waiter
 from openstackclient.compute.v2 import server_backup
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
 from openstackclient.tests.unit.image.v2 import fakes as image_fakes
@@ -170,7 +171,7 @@ class TestServerBackupCreate(TestServerBackup):
         self.assertEqual(self.image_columns(images[0]), columns)
         self.assertEqual(self.image_data(images[0]), data)
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=False)
+    @mock.patch.object(waiter, 'wait_for_status', return_value=False)
     def test_server_backup_wait_fail(self, mock_wait_for_status):
         servers = self.setup_servers_mock(count=1)
         images = image_fakes.FakeImage.create_images(
@@ -219,7 +220,7 @@ class TestServerBackupCreate(TestServerBackup):
             callback=mock.ANY
         )
 
-    @mock.patch.object(common_utils, 'wait_for_status', return_value=True)
+    @mock.patch.object(waiter, 'wait_for_status', return_value=True)
     def test_server_backup_wait_ok(self, mock_wait_for_status):
         servers = self.setup_servers_mock(count=1)
         images = image_fakes.FakeImage.create_images(
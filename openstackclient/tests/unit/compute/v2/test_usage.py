@@ -14,6 +14,8 @@
 import datetime
 import mock
 
+from novaclient import api_versions
+
 from openstackclient.compute.v2 import usage
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
 from openstackclient.tests.unit.identity.v3 import fakes as identity_fakes
@@ -103,6 +105,51 @@ class TestUsageList(TestUsage):
         self.assertEqual(self.columns, columns)
         self.assertEqual(tuple(self.data), tuple(data))
 
+    def test_usage_list_paginated(self):
+        self.app.client_manager.compute.api_version = \
+            api_versions.APIVersion('2.40')
+
+        def server_usages(*ids):
+            return [{'instance_id': i, 'hours': 1.0} for i in ids]
+
+        # The project of the first page continues on the second one
+        other_project = identity_fakes.FakeProject.create_one_project()
+        pages = [
+            [
+                compute_fakes.FakeUsage.create_one_usage(attrs={
+                    'tenant_id': self.project.id,
+                    'server_usages': server_usages('a', 'b'),
+                }),
+            ],
+            [
+                compute_fakes.FakeUsage.create_one_usage(attrs={
+                    'tenant_id': self.project.id,
+                    'server_usages': server_usages('c'),
+                }),
+                compute_fakes.FakeUsage.create_one_usage(attrs={
+                    'tenant_id': other_project.id,
+                    'server_usages': server_usages('d'),
+                }),
+            ],
+            [],
+        ]
+        self.usage_mock.list.side_effect = pages
+
+        parsed_args = self.check_parser(self.cmd, [], [])
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.columns, columns)
+        self.assertEqual((
+            (self.project.name, 3, 1024.0, 2.0, 2.0),
+            (other_project.id, 1, 512.0, 1.0, 1.0),
+        ), tuple(data))
+        start, end = self.usage_mock.list.call_args_list[0][0]
+        self.usage_mock.list.assert_has_calls([
+            mock.call(start, end, detailed=True),
+            mock.call(start, end, detailed=True, marker='b'),
+            mock.call(start, end, detailed=True, marker='d'),
+        ])
+
 
 class TestUsageShow(TestUsage):
 
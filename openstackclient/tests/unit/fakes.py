@@ -21,6 +21,8 @@ from keystoneauth1 import fixture
 import requests
 import six
 
+from openstackclient.common import catalog
+
 
 AUTH_TOKEN = "foobar"
 AUTH_URL = "http://0.0.0.0"
@@ -140,6 +142,7 @@ class FakeClientManager(object):
         self.auth_ref = None
         self.auth_plugin_name = None
         self.network_endpoint_enabled = True
+        self.resource_cache = None
 
     def get_configuration(self):
         return {
@@ -155,6 +158,12 @@ class FakeClientManager(object):
     def is_network_endpoint_enabled(self):
         return self.network_endpoint_enabled
 
+    @property
+    def catalog_index(self):
+        if not self.auth_ref:
+            return None
+        return catalog.CatalogIndex(self.auth_ref.service_catalog)
+
 
 class FakeModule(object):
 
@@ -993,3 +993,27 @@ class TestProjectShow(TestProject):
             ['children-id'],
         )
         self.assertEqual(data, datalist)
+
+    def test_project_show_name_from_auth_ref(self):
+        self.projects_mock.get.return_value = self.project
+        identity_client = self.app.client_manager.identity
+        identity_client.session.auth.get_access.return_value = \
+            identity_fakes.fake_auth_ref({
+                'id': identity_fakes.token_id,
+                'project_id': self.project.id,
+                'project_name': self.project.name,
+                'user_id': identity_fakes.user_id,
+            })
+
+        arglist = [
+            self.project.name,
+        ]
+        verifylist = [
+            ('project', self.project.name),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self.projects_mock.get.assert_called_once_with(self.project.id)
+        identity_client.tokens.get_token_data.assert_not_called()
@@ -15,6 +15,11 @@ import argparse
 import mock
 
 import openstack
+from openstack.network.v2 import security_group as sdk_security_group
+from openstack.network.v2 import security_group_rule as sdk_secgroup_rule
+from osc_lib.command import command
+import six
+
 from openstackclient.common import exceptions
 from openstackclient.network import common
 from openstackclient.tests.unit import utils
@@ -186,3 +191,337 @@ class TestNetworkAndComputeShowOne(TestNetworkAndCompute):
             m_action.side_effect = openstack.exceptions.HttpException("bar")
             self.assertRaisesRegex(exceptions.CommandError, "bar",
                                    self.cmd.take_action, mock.Mock())
+
+
+class TestIterPages(utils.TestCase):
+
+    def test_iter_pages(self):
+        resources = [mock.Mock(id=str(i)) for i in range(5)]
+        list_f = mock.Mock(side_effect=[
+            resources[:2],
+            resources[2:4],
+            resources[4:],
+        ])
+
+        self.assertEqual(
+            resources,
+            list(common.iter_pages(list_f, page_size=2, direction='ingress')),
+        )
+        list_f.assert_has_calls([
+            mock.call(limit=2, direction='ingress'),
+            mock.call(limit=2, direction='ingress', marker='1'),
+            mock.call(limit=2, direction='ingress', marker='3'),
+        ])
+
+    def test_iter_pages_not_paged(self):
+        # A server that does not page returns everything at once
+        resources = [mock.Mock(id=str(i)) for i in range(5)]
+        list_f = mock.Mock(return_value=resources)
+
+        self.assertEqual(
+            resources,
+            list(common.iter_pages(list_f, page_size=2, marker='a')),
+        )
+        list_f.assert_called_once_with(limit=2, marker='a')
+
+    def test_iter_pages_marker_ignored(self):
+        # A server that ignores the limit and the marker returns a full page
+        # every time
+        resources = [mock.Mock(id=str(i)) for i in range(5)]
+        list_f = mock.Mock(return_value=resources)
+
+        self.assertEqual(
+            resources,
+            list(common.iter_pages(list_f, page_size=5)),
+        )
+        list_f.assert_has_calls([
+            mock.call(limit=5),
+            mock.call(limit=5, marker='4'),
+        ])
+        self.assertEqual(2, list_f.call_count)
+
+    def test_iter_pages_marker_not_advanced(self):
+        resources = [mock.Mock(id=str(i)) for i in range(2)]
+        list_f = mock.Mock(side_effect=[
+            resources,
+            [],
+        ])
+
+        self.assertEqual(
+            resources,
+            list(common.iter_pages(list_f, page_size=2, marker='1')),
+        )
+        list_f.assert_called_once_with(limit=2, marker='1')
+
+
+class TestListResources(utils.TestCase):
+
+    def setUp(self):
+        super(TestListResources, self).setUp()
+        self.resources = [mock.Mock(id=str(i)) for i in range(5)]
+
+    def _parsed_args(self, page_size=None, limit=None, marker=None):
+        return argparse.Namespace(
+            page_size=page_size, limit=limit, marker=marker)
+
+    def test_list_resources_no_options(self):
+        list_f = mock.Mock(return_value=self.resources)
+
+        self.assertEqual(self.resources, list(common.list_resources(
+            list_f, self._parsed_args(), name='a')))
+        list_f.assert_called_once_with(name='a')
+
+    def test_list_resources_default_page_size(self):
+        list_f = mock.Mock(return_value=self.resources)
+
+        self.assertEqual(self.resources, list(common.list_resources(
+            list_f, self._parsed_args(), default_page_size=10)))
+        list_f.assert_called_once_with(limit=10)
+
+    def test_list_resources_page_size(self):
+        list_f = mock.Mock(side_effect=[
+            self.resources[:3],
+            self.resources[3:],
+        ])
+
+        self.assertEqual(self.resources, list(common.list_resources(
+            list_f, self._parsed_args(page_size=3), name='a')))
+        list_f.assert_has_calls([
+            mock.call(limit=3, name='a'),
+            mock.call(limit=3, name='a', marker='2'),
+        ])
+
+    def test_list_resources_limit_marker(self):
+        list_f = mock.Mock(side_effect=[
+            self.resources[:2],
+            self.resources[2:4],
+        ])
+
+        self.assertEqual(self.resources[:3], list(common.list_resources(
+            list_f, self._parsed_args(limit=3, page_size=2, marker='x'))))
+        list_f.assert_has_calls([
+            mock.call(limit=2, marker='x'),
+            mock.call(limit=2, marker='1'),
+        ])
+        self.assertEqual(2, list_f.call_count)
+
+    def test_list_resources_marker(self):
+        list_f = mock.Mock(return_value=self.resources)
+
+        list(common.list_resources(list_f, self._parsed_args(marker='x')))
+        list_f.assert_called_once_with(
+            limit=common.DEFAULT_PAGE_SIZE, marker='x')
+
+    def test_list_resources_invalid(self):
+        list_f = mock.Mock()
+
+        self.assertRaises(
+            exceptions.CommandError, common.list_resources,
+            list_f, self._parsed_args(limit=0))
+        self.assertRaises(
+            exceptions.CommandError, common.list_resources,
+            list_f, self._parsed_args(page_size=-1))
+        list_f.assert_not_called()
+
+
+class TestBulkCreate(utils.TestCase):
+
+    def test_bulk_create(self):
+        client = mock.Mock()
+        client._session.post.return_value.json.return_value = {
+            'security_group_rules': [
+                {'id': 'a', 'ethertype': 'IPv4'},
+                {'id': 'b', 'ethertype': 'IPv6'},
+            ],
+        }
+
+        rules = common.bulk_create(
+            client,
+            sdk_secgroup_rule.SecurityGroupRule,
+            [
+                {'security_group_id': 'sg', 'ether_type': 'IPv4'},
+                {'security_group_id': 'sg', 'ether_type': 'IPv6'},
+            ],
+        )
+
+        self.assertEqual(['a', 'b'], [rule.id for rule in rules])
+        self.assertEqual('IPv6', rules[1].ether_type)
+        client._session.post.assert_called_once_with(
+            '/security-group-rules',
+            endpoint_filter=sdk_secgroup_rule.SecurityGroupRule.service,
+            json={'security_group_rules': [
+                {'security_group_id': 'sg', 'ethertype': 'IPv4'},
+                {'security_group_id': 'sg', 'ethertype': 'IPv6'},
+            ]},
+            headers={'Accept': 'application/json'},
+        )
+
+    def test_bulk_create_batches(self):
+        client = mock.Mock()
+        client._session.post.return_value.json.side_effect = [
+            {'security_group_rules': [{'id': 'a'}, {'id': 'b'}]},
+            {'security_group_rules': [{'id': 'c'}]},
+        ]
+
+        rules = common.bulk_create(
+            client,
+            sdk_secgroup_rule.SecurityGroupRule,
+            [{'security_group_id': 'sg'}] * 3,
+            batch_size=2,
+        )
+
+        self.assertEqual(['a', 'b', 'c'], [rule.id for rule in rules])
+        self.assertEqual(2, client._session.post.call_count)
+        self.assertEqual(
+            [2, 1],
+            [len(c[1]['json']['security_group_rules'])
+             for c in client._session.post.call_args_list],
+        )
+
+    def test_bulk_create_batch_failed(self):
+        client = mock.Mock()
+        client._session.post.side_effect = [
+            mock.Mock(**{'json.return_value': {
+                'security_group_rules': [{'id': 'a'}, {'id': 'b'}],
+            }}),
+            openstack.exceptions.HttpException('quota exceeded'),
+        ]
+
+        e = self.assertRaises(
+            exceptions.CommandError,
+            common.bulk_create,
+            client,
+            sdk_secgroup_rule.SecurityGroupRule,
+            [{'security_group_id': 'sg'}] * 3,
+            batch_size=2,
+        )
+        self.assertIn('quota exceeded', str(e))
+        self.assertIn('2 security_group_rules were created by the earlier '
+                      'requests: a, b', str(e))
+
+    def test_bulk_create_first_batch_failed(self):
+        client = mock.Mock()
+        client._session.post.side_effect = \
+            openstack.exceptions.HttpException('quota exceeded')
+
+        self.assertRaises(
+            openstack.exceptions.HttpException,
+            common.bulk_create,
+            client,
+            sdk_secgroup_rule.SecurityGroupRule,
+            [{'security_group_id': 'sg'}] * 3,
+            batch_size=2,
+        )
+
+    def test_bulk_create_nothing(self):
+        client = mock.Mock()
+        self.assertEqual([], common.bulk_create(
+            client, sdk_secgroup_rule.SecurityGroupRule, []))
+        client._session.post.assert_not_called()
+
+
+class TestListByIds(utils.TestCase):
+
+    def test_list_by_ids(self):
+        client = mock.Mock()
+        client._session.get.return_value.json.side_effect = [
+            {'security_groups': [{'id': 'a', 'name': 'one'}]},
+            {'security_groups': [{'id': 'c', 'name': 'three'}]},
+        ]
+
+        groups = common.list_by_ids(
+            client,
+            sdk_security_group.SecurityGroup,
+            ['c', 'a', 'b', 'a'],
+            fields=('id', 'name'),
+            batch_size=2,
+        )
+
+        self.assertEqual(['one', 'three'], [group.name for group in groups])
+        client._session.get.assert_has_calls([
+            mock.call(
+                '/security-groups',
+                endpoint_filter=sdk_security_group.SecurityGroup.service,
+                params={'fields': ['id', 'name'], 'id': ['a', 'b']},
+                headers={'Accept': 'application/json'},
+            ),
+            mock.call().json(),
+            mock.call(
+                '/security-groups',
+                endpoint_filter=sdk_security_group.SecurityGroup.service,
+                params={'fields': ['id', 'name'], 'id': ['c']},
+                headers={'Accept': 'application/json'},
+            ),
+            mock.call().json(),
+        ])
+
+
+class FakeBulkShowOne(common.BulkCreateMixin, command.ShowOne):
+
+    def get_parser(self, prog_name):
+        parser = super(FakeBulkShowOne, self).get_parser(prog_name)
+        common.add_count_option(parser)
+        return parser
+
+    def take_action(self, parsed_args):
+        rows = [('id-%d' % i, 'name-%d' % i)
+                for i in range(1, parsed_args.count + 1)]
+        if parsed_args.count == 1:
+            return (('id', 'name'), rows[0])
+        return (('id', 'name'), rows)
+
+
+class TestBulkCreateMixin(utils.TestCommand):
+
+    def setUp(self):
+        super(TestBulkCreateMixin, self).setUp()
+        self.app.stdout = six.StringIO()
+        self.cmd = FakeBulkShowOne(self.app, argparse.Namespace())
+
+    def _run(self, arglist):
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+        self.cmd.run(parsed_args)
+        return self.app.stdout.getvalue()
+
+    def test_show_one(self):
+        self.assertEqual(
+            'id-1\nname-1\n', self._run(['-f', 'value']))
+
+    def test_show_list(self):
+        self.assertEqual(
+            'id-1 name-1\nid-2 name-2\n',
+            self._run(['--count', '2', '-f', 'value']))
+
+    def test_show_list_columns(self):
+        self.assertEqual(
+            'name-1\nname-2\n',
+            self._run(['--count', '2', '-f', 'value', '-c', 'name']))
+
+    def test_show_list_single_formatter(self):
+        self.assertEqual(
+            'id="id-1"\nname="name-1"\nid="id-2"\nname="name-2"\n',
+            self._run(['--count', '2', '-f', 'shell']))
+
+    def test_add_count_option_help(self):
+        parser = argparse.ArgumentParser()
+        common.add_count_option(parser, help_text='Number of things')
+        action = parser._option_string_actions['--count']
+        self.assertEqual('Number of things', action.help)
+        self.assertEqual(1, action.default)
+
+    def test_get_count(self):
+        self.assertEqual(1, common.get_count(argparse.Namespace()))
+        self.assertRaises(exceptions.CommandError, common.get_count,
+                          argparse.Namespace(count=0))
+
+
+class TestExpandNames(utils.TestCase):
+
+    def test_expand_names_single(self):
+        self.assertEqual(['n-{index}'], common.expand_names('n-{index}', 1))
+
+    def test_expand_names_appended(self):
+        self.assertEqual(['n-1', 'n-2'], common.expand_names('n', 2))
+
+    def test_expand_names_placeholder(self):
+        self.assertEqual(['a1b', 'a2b'], common.expand_names('a{index}b', 2))
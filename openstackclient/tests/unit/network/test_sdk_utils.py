@@ -10,6 +10,12 @@
 #   License for the specific language governing permissions and limitations
 #   under the License.
 
+import timeit
+
+import mock
+from openstack.network.v2 import port as sdk_port
+from testtools import content
+
 from openstackclient.network import sdk_utils
 from openstackclient.tests.unit import utils as tests_utils
 
@@ -57,3 +63,104 @@ class TestSDKUtils(tests_utils.TestCase):
             {'foo': 'foo1', 'bar': 'bar1'},
             {'foo': 'foo_map', 'new': 'bar'},
             ('bar', 'foo_map'), ('bar', 'foo'))
+
+    def test_get_osc_show_columns_for_sdk_resource_sdk(self):
+        port = sdk_port.Port.new(id='port-id', name='port-name')
+        expected = port.to_dict(body=True, headers=False, ignore_none=False)
+        column_map = {'tenant_id': 'project_id', 'name': 'port_name'}
+
+        with mock.patch.object(sdk_port.Port, 'to_dict') as to_dict:
+            display_columns, attr_columns = \
+                sdk_utils.get_osc_show_columns_for_sdk_resource(
+                    port, column_map)
+        to_dict.assert_not_called()
+
+        expected_columns = set(expected)
+        expected_columns -= set(column_map)
+        expected_columns |= set(column_map.values())
+        self.assertEqual(tuple(sorted(expected_columns)), display_columns)
+        self.assertEqual(
+            display_columns.index('port_name'), attr_columns.index('name'))
+        self.assertNotIn('tenant_id', display_columns)
+        self.assertIn('project_id', attr_columns)
+
+    def test_get_osc_show_columns_for_sdk_resource_memoized(self):
+        column_map = {'tenant_id': 'project_id'}
+        columns = sdk_utils.get_osc_show_columns_for_sdk_resource(
+            sdk_port.Port.new(id='port-1'), column_map)
+        self.assertIs(
+            columns,
+            sdk_utils.get_osc_show_columns_for_sdk_resource(
+                sdk_port.Port.new(id='port-2'), dict(column_map)),
+        )
+        self.assertIsNot(
+            columns,
+            sdk_utils.get_osc_show_columns_for_sdk_resource(
+                sdk_port.Port.new(id='port-1'), {}),
+        )
+
+
+class TestSDKUtilsBenchmark(tests_utils.TestCase):
+    """Time the column mapping of one show and of many bulk rows
+
+    The timings are attached to the test result as details and not
+    asserted, so a slow test host does not fail the run.
+    """
+
+    column_map = {
+        'binding:host_id': 'binding_host_id',
+        'binding:profile': 'binding_profile',
+        'binding:vif_details': 'binding_vif_details',
+        'binding:vif_type': 'binding_vif_type',
+        'binding:vnic_type': 'binding_vnic_type',
+        'is_admin_state_up': 'admin_state_up',
+        'is_port_security_enabled': 'port_security_enabled',
+        'security_group_ids': 'security_groups',
+        'tenant_id': 'project_id',
+    }
+
+    def setUp(self):
+        super(TestSDKUtilsBenchmark, self).setUp()
+        self.ports = [sdk_port.Port.new(id='port-%d' % i) for i in range(500)]
+
+    def _uncached(self, sdk_resource):
+        # The mapping as it was computed before it was memoized
+        resource_dict = sdk_resource.to_dict(
+            body=True, headers=False, ignore_none=False)
+        attr_map = {}
+        display_columns = list(resource_dict.keys())
+        for sdk_attr, osc_attr in self.column_map.items():
+            if sdk_attr in display_columns:
+                attr_map[osc_attr] = sdk_attr
+                display_columns.remove(sdk_attr)
+            if osc_attr not in display_columns:
+                display_columns.append(osc_attr)
+        display_columns = tuple(sorted(display_columns))
+        return display_columns, tuple(attr_map.get(column, column)
+                                      for column in display_columns)
+
+    def _cached(self, sdk_resource):
+        return sdk_utils.get_osc_show_columns_for_sdk_resource(
+            sdk_resource, self.column_map)
+
+    def _time(self, name, columns_f, resources, number):
+        seconds = min(timeit.repeat(
+            lambda: [columns_f(resource) for resource in resources],
+            number=number, repeat=3))
+        self.addDetail(name, content.text_content(
+            '%.2f us per resource' % (
+                seconds / number / len(resources) * 1e6)))
+
+    def test_benchmark_show(self):
+        port = self.ports[0]
+        self.assertEqual(self._uncached(port), self._cached(port))
+        self._time('show-uncached', self._uncached, [port], 200)
+        self._time('show-memoized', self._cached, [port], 200)
+
+    def test_benchmark_bulk_rows(self):
+        self.assertEqual(
+            [self._uncached(port) for port in self.ports],
+            [self._cached(port) for port in self.ports],
+        )
+        self._time('bulk-uncached', self._uncached, self.ports, 2)
+        self._time('bulk-memoized', self._cached, self.ports, 2)
@@ -1139,6 +1139,7 @@ class FakeSecurityGroupRule(object):
 
         # Set attributes with special mapping in OpenStack SDK.
         security_group_rule.project_id = security_group_rule_attrs['tenant_id']
+        security_group_rule.ether_type = security_group_rule_attrs['ethertype']
 
         return security_group_rule
 
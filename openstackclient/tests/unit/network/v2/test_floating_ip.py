@@ -198,6 +198,112 @@ class TestCreateFloatingIPNetwork(TestFloatingIPNetwork):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.data, data)
 
+    def test_create_count(self):
+        floating_ips = network_fakes.FakeFloatingIP.create_floating_ips(
+            attrs={'floating_network_id': self.floating_network.id},
+            count=3,
+        )
+        self.network.create_ip.side_effect = floating_ips
+        arglist = [
+            '--count', '3',
+            '--concurrency', '2',
+            self.floating_network.name,
+        ]
+        verifylist = [
+            ('count', 3),
+            ('concurrency', 2),
+            ('network', self.floating_network.name),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+        data = list(data)
+
+        # The network is resolved once for all the floating IPs
+        self.network.find_network.assert_called_once_with(
+            self.floating_network.name, ignore_missing=False)
+        self.network.create_ip.assert_has_calls(
+            [call(floating_network_id=self.floating_network.id)] * 3)
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(
+            sorted(fip.id for fip in floating_ips),
+            sorted(row[columns.index('id')] for row in data),
+        )
+
+    def test_create_count_failure(self):
+        self.network.create_ip.side_effect = [
+            self.floating_ip,
+            exceptions.CommandError('quota exceeded'),
+        ]
+        arglist = [
+            '--count', '2',
+            '--concurrency', '1',
+            '-f', 'value',
+            '-c', 'id',
+            self.floating_network.id,
+        ]
+        verifylist = [
+            ('count', 2),
+            ('concurrency', 1),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        e = self.assertRaises(
+            exceptions.CommandError, self.cmd.run, parsed_args)
+
+        self.assertEqual('1 of 2 floating IPs failed to create.', str(e))
+        # The floating IP allocated is shown before the error
+        self.assertEqual(self.floating_ip.id + '\n',
+                         self.app.stdout.make_string())
+
+    def test_create_count_all_failed(self):
+        self.network.create_ip.side_effect = exceptions.CommandError(
+            'quota exceeded')
+        arglist = [
+            '--count', '2',
+            self.floating_network.id,
+        ]
+        verifylist = [
+            ('count', 2),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        e = self.assertRaises(
+            exceptions.CommandError, self.cmd.take_action, parsed_args)
+        self.assertEqual('Failed to create 2 floating IPs', str(e))
+
+    def test_create_count_with_port(self):
+        arglist = [
+            '--count', '2',
+            '--port', self.port.id,
+            self.floating_network.id,
+        ]
+        verifylist = [
+            ('count', 2),
+            ('port', self.port.id),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(
+            exceptions.CommandError, self.cmd.take_action, parsed_args)
+        self.network.create_ip.assert_not_called()
+
+    def test_create_invalid_concurrency(self):
+        arglist = [
+            '--count', '2',
+            '--concurrency', '0',
+            self.floating_network.id,
+        ]
+        verifylist = [
+            ('count', 2),
+            ('concurrency', 0),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.assertRaises(
+            exceptions.CommandError, self.cmd.take_action, parsed_args)
+        self.network.create_ip.assert_not_called()
+
 
 class TestDeleteFloatingIPNetwork(TestFloatingIPNetwork):
 
@@ -275,12 +381,13 @@ class TestDeleteFloatingIPNetwork(TestFloatingIPNetwork):
                 ignore_missing=False,
             ),
         ]
-        find_floating_ip_mock.assert_has_calls(calls)
+        # The floating IPs are deleted concurrently, in any order
+        find_floating_ip_mock.assert_has_calls(calls, any_order=True)
 
         calls = []
         for f in self.floating_ips:
             calls.append(call(f))
-        self.network.delete_ip.assert_has_calls(calls)
+        self.network.delete_ip.assert_has_calls(calls, any_order=True)
         self.assertIsNone(result)
 
     @mock.patch(
@@ -324,6 +431,37 @@ class TestDeleteFloatingIPNetwork(TestFloatingIPNetwork):
             self.floating_ips[0]
         )
 
+    @mock.patch.object(floating_ip._floating_ip.FloatingIP, 'list')
+    @mock.patch(
+        "openstackclient.tests.unit.network.v2.test_floating_ip." +
+        "floating_ip._find_floating_ip"
+    )
+    def test_floating_ip_delete_addresses(self, find_floating_ip_mock,
+                                          list_mock):
+        list_mock.return_value = iter(self.floating_ips)
+        find_floating_ip_mock.side_effect = [
+            (self.floating_ips[0], list(self.floating_ips)),
+            (self.floating_ips[1], list(self.floating_ips)),
+        ]
+        arglist = [f.floating_ip_address for f in self.floating_ips]
+        verifylist = [
+            ('floating_ip', arglist),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        # The floating IPs are listed once for all the addresses
+        list_mock.assert_called_once_with(mock.ANY)
+        for address in arglist:
+            find_floating_ip_mock.assert_any_call(
+                mock.ANY,
+                list(self.floating_ips),
+                address,
+                ignore_missing=False,
+            )
+        self.assertEqual(2, self.network.delete_ip.call_count)
+
 
 class TestListFloatingIPNetwork(TestFloatingIPNetwork):
 
@@ -115,6 +115,33 @@ class TestListIPAvailability(TestIPAvailability):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.data, list(data))
 
+    def test_list_pages(self):
+        self.network.network_ip_availabilities.side_effect = [
+            self._ip_availability[:2],
+            self._ip_availability[2:],
+        ]
+        arglist = [
+            '--page-size', '2',
+            '--marker', 'last-seen-network-id',
+        ]
+        verifylist = [
+            ('page_size', 2),
+            ('marker', 'last-seen-network-id'),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(self.data, list(data))
+        # The next page starts after the network of the last row
+        self.network.network_ip_availabilities.assert_has_calls([
+            mock.call(ip_version=4, limit=2, marker='last-seen-network-id'),
+            mock.call(ip_version=4, limit=2,
+                      marker=self._ip_availability[1].network_id),
+        ])
+
 
 class TestShowIPAvailability(TestIPAvailability):
 
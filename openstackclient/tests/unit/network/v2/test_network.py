@@ -18,6 +18,7 @@ import random
 from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.network import common as network_common
 from openstackclient.network.v2 import network
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
 from openstackclient.tests.unit import fakes
@@ -141,6 +142,31 @@ class TestCreateNetworkIdentityV3(TestNetwork):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.data, data)
 
+    def test_create_count(self):
+        arglist = [
+            '--count', '3',
+            'net-{index}-a',
+        ]
+        verifylist = [
+            ('name', 'net-{index}-a'),
+            ('count', 3),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        with mock.patch.object(network_common, 'bulk_create',
+                               return_value=[self._network] * 3) as bulk:
+            columns, data = self.cmd.take_action(parsed_args)
+
+        bulk.assert_called_once_with(
+            self.network,
+            network.sdk_network.Network,
+            [{'admin_state_up': True, 'name': 'net-%d-a' % index}
+             for index in (1, 2, 3)],
+        )
+        self.network.create_network.assert_not_called()
+        self.assertEqual(self.columns, columns)
+        self.assertEqual([self.data] * 3, data)
+
     def test_create_all_options(self):
         arglist = [
             "--disable",
@@ -508,6 +534,32 @@ class TestListNetwork(TestNetwork):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.data, list(data))
 
+    def test_network_list_pagination(self):
+        arglist = [
+            '--page-size', '2',
+            '--limit', '3',
+            '--marker', 'last-seen-id',
+        ]
+        verifylist = [
+            ('page_size', 2),
+            ('limit', 3),
+            ('marker', 'last-seen-id'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        self.network.networks.side_effect = [
+            self._network[:2],
+            self._network[2:],
+        ]
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(self.data, list(data))
+        self.network.networks.assert_has_calls([
+            call(limit=2, marker='last-seen-id'),
+            call(limit=2, marker=self._network[1].id),
+        ])
+
     def test_list_external(self):
         arglist = [
             '--external',
@@ -0,0 +1,182 @@
+#   Licensed under the Apache License, Version 2.0 (the "License"); you may
+#   not use this file except in compliance with the License. You may obtain
+#   a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#   WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#   License for the specific language governing permissions and limitations
+#   under the License.
+#
+
+import json
+
+import fixtures
+import mock
+from osc_lib import exceptions
+
+from openstackclient.network import common as network_common
+from openstackclient.network.v2 import network_topology
+from openstackclient.tests.unit import fakes
+from openstackclient.tests.unit.identity.v3 import fakes as identity_fakes
+from openstackclient.tests.unit.network.v2 import fakes as network_fakes
+from openstackclient.tests.unit import utils as tests_utils
+
+
+class TestShowNetworkTopology(network_fakes.TestNetworkV2):
+
+    project = identity_fakes.FakeProject.create_one_project()
+    _network = network_fakes.FakeNetwork.create_one_network()
+    _subnet = network_fakes.FakeSubnet.create_one_subnet({
+        'network_id': _network.id,
+    })
+    _router = network_fakes.FakeRouter.create_one_router({
+        'external_gateway_info': {'network_id': 'public-network-id'},
+    })
+    _interface = network_fakes.FakePort.create_one_port({
+        'device_id': _router.id,
+        'device_owner': 'network:router_interface',
+        'fixed_ips': [{'ip_address': '10.0.0.1', 'subnet_id': _subnet.id}],
+        'network_id': _network.id,
+    })
+    _security_group = \
+        network_fakes.FakeSecurityGroup.create_one_security_group()
+    _server_port = network_fakes.FakePort.create_one_port({
+        'fixed_ips': [{'ip_address': '10.0.0.3', 'subnet_id': _subnet.id}],
+        'network_id': _network.id,
+        'security_groups': [_security_group.id],
+    })
+    _floating_ip = network_fakes.FakeFloatingIP.create_one_floating_ip({
+        'port_id': _server_port.id,
+    })
+
+    def setUp(self):
+        super(TestShowNetworkTopology, self).setUp()
+
+        self.network = self.app.client_manager.network
+        self.network.networks = mock.Mock(return_value=[self._network])
+        self.network.subnets = mock.Mock(return_value=[self._subnet])
+        self.network.ports = mock.Mock(
+            return_value=[self._interface, self._server_port])
+        self.network.routers = mock.Mock(return_value=[self._router])
+        self.network.ips = mock.Mock(return_value=[self._floating_ip])
+        self.network.security_groups = mock.Mock(
+            return_value=[self._security_group])
+
+        # Other tests leave a property on the class, patch it the same way
+        self.useFixture(fixtures.MockPatchObject(
+            type(self.app.client_manager), 'auth_ref',
+            new_callable=mock.PropertyMock, create=True,
+            return_value=mock.Mock(project_id=self.project.id)))
+        self.app.client_manager.identity = mock.Mock()
+        self.app.client_manager.identity.projects.get.return_value = \
+            self.project
+
+        public = fakes.FakeResource(
+            info={'id': 'public-network-id', 'name': 'public'},
+            loaded=True,
+        )
+        self.list_by_ids = self.useFixture(fixtures.MockPatchObject(
+            network_common, 'list_by_ids', return_value=[public])).mock
+
+        # Get the command object to test
+        self.cmd = network_topology.ShowNetworkTopology(
+            self.app, self.namespace)
+
+    def _assert_listed(self, project_id):
+        for list_f in (self.network.networks, self.network.subnets,
+                       self.network.ports, self.network.routers,
+                       self.network.ips, self.network.security_groups):
+            list_f.assert_called_once_with(project_id=project_id)
+
+    def test_show_json(self):
+        parsed_args = self.check_parser(self.cmd, [], [
+            ('project', None),
+            ('graph_format', 'json'),
+        ])
+
+        self.cmd.take_action(parsed_args)
+
+        self._assert_listed(self.project.id)
+        self.list_by_ids.assert_called_once_with(
+            self.network,
+            network_topology.sdk_network.Network,
+            ['public-network-id'],
+            fields=('id', 'name'),
+        )
+        graph = json.loads(self.app.stdout.make_string())
+        nodes = dict((node['id'], node) for node in graph['nodes'])
+        self.assertEqual('public', nodes['public-network-id']['name'])
+        self.assertEqual('server', nodes[self._server_port.device_id]['type'])
+        self.assertEqual(
+            self._security_group.name,
+            nodes[self._security_group.id]['name'],
+        )
+        # The nodes have the fields of the show commands
+        self.assertEqual(
+            self._server_port.fixed_ips,
+            nodes[self._server_port.id]['fixed_ips'])
+        self.assertEqual(
+            [self._security_group.id],
+            nodes[self._server_port.id]['security_groups'])
+        self.assertEqual(
+            self._router.project_id, nodes[self._router.id]['project_id'])
+        self.assertEqual('router', nodes[self._router.id]['type'])
+        edges = [(edge['source'], edge['target'], edge['type'])
+                 for edge in graph['edges']]
+        self.assertEqual([
+            (self._network.id, self._subnet.id, 'subnet'),
+            (self._router.id, 'public-network-id', 'gateway'),
+            (self._router.id, self._interface.id, 'interface'),
+            (self._interface.id, self._subnet.id, 'interface'),
+            (self._subnet.id, self._server_port.id, 'port'),
+            (self._server_port.id, self._server_port.device_id, 'server'),
+            (self._server_port.id, self._security_group.id,
+             'security_group'),
+            (self._floating_ip.id, self._server_port.id, 'floating_ip'),
+        ], edges)
+
+    def test_show_dot_project(self):
+        arglist = [
+            '--project', self.project.name,
+            '--graph-format', 'dot',
+        ]
+        verifylist = [
+            ('project', self.project.name),
+            ('graph_format', 'dot'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        self.cmd.take_action(parsed_args)
+
+        self._assert_listed(self.project.id)
+        dot = self.app.stdout.make_string()
+        self.assertTrue(dot.startswith('digraph topology {\n'))
+        self.assertIn(
+            '    "%s" -> "%s" [label="interface"];' % (
+                self._router.id, self._interface.id),
+            dot,
+        )
+        self.assertIn(
+            '    "public-network-id" [label="network\\npublic", '
+            'shape=folder];',
+            dot,
+        )
+
+    def test_show_without_project_scope(self):
+        self.useFixture(fixtures.MockPatchObject(
+            type(self.app.client_manager), 'auth_ref',
+            new_callable=mock.PropertyMock, create=True,
+            return_value=mock.Mock(project_id=None)))
+        parsed_args = self.check_parser(self.cmd, [], [('project', None)])
+
+        self.assertRaises(exceptions.CommandError,
+                          self.cmd.take_action, parsed_args)
+        self.network.networks.assert_not_called()
+
+    def test_show_invalid_format(self):
+        self.assertRaises(
+            tests_utils.ParserException, self.check_parser,
+            self.cmd, ['--graph-format', 'png'], [])
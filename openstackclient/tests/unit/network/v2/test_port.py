@@ -18,8 +18,10 @@ from mock import call
 from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.network import common as network_common
 from openstackclient.network.v2 import port
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
+from openstackclient.tests.unit import fakes
 from openstackclient.tests.unit.identity.v3 import fakes as identity_fakes
 from openstackclient.tests.unit.network.v2 import fakes as network_fakes
 from openstackclient.tests.unit import utils as tests_utils
@@ -470,6 +472,94 @@ class TestCreatePort(TestPort):
             'name': 'test-port',
         })
 
+    def test_create_count(self):
+        ports = network_fakes.FakePort.create_ports(count=2)
+        arglist = [
+            '--network', self._port.network_id,
+            '--count', '2',
+            'test-port',
+        ]
+        verifylist = [
+            ('network', self._port.network_id,),
+            ('count', 2),
+            ('name', 'test-port'),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(network_common, 'bulk_create',
+                               return_value=ports) as bulk_create:
+            columns, data = self.cmd.take_action(parsed_args)
+
+        bulk_create.assert_called_once_with(
+            self.network,
+            port.sdk_port.Port,
+            [
+                {
+                    'admin_state_up': True,
+                    'network_id': self._port.network_id,
+                    'name': 'test-port-1',
+                },
+                {
+                    'admin_state_up': True,
+                    'network_id': self._port.network_id,
+                    'name': 'test-port-2',
+                },
+            ],
+        )
+        self.network.create_port.assert_not_called()
+        ref_columns, ref_data = self._get_common_cols_data(ports[0])
+        self.assertEqual(ref_columns, columns)
+        self.assertEqual(2, len(data))
+        self.assertEqual(ref_data, data[0])
+
+    def test_create_count_invalid(self):
+        arglist = [
+            '--network', self._port.network_id,
+            '--count', '0',
+            'test-port',
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [('count', 0)])
+
+        self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                          parsed_args)
+        self.network.create_port.assert_not_called()
+
+    def test_create_count_fixed_ip_address(self):
+        arglist = [
+            '--network', self._port.network_id,
+            '--fixed-ip', 'ip-address=10.0.0.2',
+            '--count', '2',
+            'test-port',
+        ]
+        verifylist = [
+            ('fixed_ip', [{'ip-address': '10.0.0.2'}]),
+            ('count', 2),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(network_common, 'bulk_create') as bulk_create:
+            self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                              parsed_args)
+        bulk_create.assert_not_called()
+
+    def test_create_count_mac_address(self):
+        arglist = [
+            '--network', self._port.network_id,
+            '--mac-address', 'aa:aa:aa:aa:aa:aa',
+            '--count', '2',
+            'test-port',
+        ]
+        verifylist = [
+            ('mac_address', 'aa:aa:aa:aa:aa:aa'),
+            ('count', 2),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(network_common, 'bulk_create') as bulk_create:
+            self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                              parsed_args)
+        bulk_create.assert_not_called()
+
 
 class TestDeletePort(TestPort):
 
@@ -868,6 +958,144 @@ class TestListPort(TestPort):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.data, list(data))
 
+    def test_port_list_limit(self):
+        arglist = [
+            '--limit', '2',
+            '--network', 'fake-network',
+        ]
+        verifylist = [
+            ('limit', 2),
+            ('page_size', None),
+            ('marker', None),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.assertEqual(self.data[:2], list(data))
+        self.network.ports.assert_called_once_with(
+            limit=2, network_id='fake-network-id')
+
+    def test_port_list_network_and_project(self):
+        project = identity_fakes.FakeProject.create_one_project()
+        self.projects_mock.get.return_value = project
+        arglist = [
+            '--network', 'fake-network',
+            '--project', project.id,
+        ]
+        verifylist = [
+            ('network', 'fake-network'),
+            ('project', project.id),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.network.find_network.assert_called_once_with(
+            'fake-network', ignore_missing=False)
+        self.network.ports.assert_called_once_with(**{
+            'network_id': 'fake-network-id',
+            'tenant_id': project.id,
+            'project_id': project.id,
+        })
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(self.data, list(data))
+
+    def test_port_list_resolve_names(self):
+        sg = network_fakes.FakeSecurityGroup.create_one_security_group()
+        ports = network_fakes.FakePort.create_ports(
+            {'security_groups': [sg.id]}, count=3)
+        self.network.ports.return_value = ports
+
+        def _list_by_ids(client, resource_type, ids, fields=None):
+            if resource_type is port.sdk_security_group.SecurityGroup:
+                return [sg]
+            if resource_type is port.sdk_subnet.Subnet:
+                # The subnet of the last port is not visible
+                ids = sorted(ids)[:-1]
+            return [fakes.FakeResource(
+                info={'id': res_id, 'name': 'name-of-' + res_id},
+                loaded=True) for res_id in ids]
+
+        arglist = [
+            '--long',
+            '--resolve-names',
+        ]
+        verifylist = [
+            ('long', True),
+            ('resolve_names', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(network_common, 'list_by_ids',
+                               side_effect=_list_by_ids) as list_by_ids:
+            columns, data = self.cmd.take_action(parsed_args)
+            data = list(data)
+
+        self.network.ports.assert_called_once_with(
+            limit=network_common.DEFAULT_PAGE_SIZE)
+        self.assertEqual(3, list_by_ids.call_count)
+        self.assertEqual(
+            self.columns + ('Network', 'Security Groups', 'Device Owner'),
+            columns)
+        hidden_subnet = sorted(
+            prt.fixed_ips[0]['subnet_id'] for prt in ports)[-1]
+        for prt, row in zip(ports, data):
+            subnet_id = prt.fixed_ips[0]['subnet_id']
+            subnet = (subnet_id if subnet_id == hidden_subnet
+                      else 'name-of-' + subnet_id)
+            self.assertEqual((
+                prt.id,
+                prt.name,
+                prt.mac_address,
+                utils.format_list_of_dicts([{
+                    'ip_address': prt.fixed_ips[0]['ip_address'],
+                    'subnet': subnet,
+                }]),
+                prt.status,
+                'name-of-' + prt.network_id,
+                sg.name,
+                prt.device_owner,
+            ), row)
+
+    def test_port_list_resolve_names_pages(self):
+        sg = network_fakes.FakeSecurityGroup.create_one_security_group()
+        ports = network_fakes.FakePort.create_ports(
+            {'security_groups': [sg.id]}, count=4)
+        # The second page refers to a network of the first page too
+        ports[2].network_id = ports[0].network_id
+        self.network.ports.return_value = ports
+
+        def _list_by_ids(client, resource_type, ids, fields=None):
+            return [fakes.FakeResource(
+                info={'id': res_id, 'name': 'name-of-' + res_id},
+                loaded=True) for res_id in ids]
+
+        arglist = [
+            '--long',
+            '--resolve-names',
+        ]
+        verifylist = [
+            ('long', True),
+            ('resolve_names', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(network_common, 'DEFAULT_PAGE_SIZE', 2), \
+                mock.patch.object(network_common, 'list_by_ids',
+                                  side_effect=_list_by_ids) as list_by_ids:
+            columns, data = self.cmd.take_action(parsed_args)
+            data = list(data)
+
+        self.assertEqual(4, len(data))
+        # The second page only lists the network not seen with the first
+        self.assertEqual(5, list_by_ids.call_count)
+        list_by_ids.assert_any_call(
+            self.network, port.sdk_network.Network,
+            set([ports[3].network_id]), fields=('id', 'name'))
+        for prt, row in zip(ports, data):
+            self.assertEqual('name-of-' + prt.network_id, row[5])
+
 
 class TestSetPort(TestPort):
 
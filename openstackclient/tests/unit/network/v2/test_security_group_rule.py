@@ -12,11 +12,15 @@
 #
 
 import copy
+import os
+
+import fixtures
 import mock
 from mock import call
 
 from osc_lib import exceptions
 
+from openstackclient.network import common as network_common
 from openstackclient.network import utils as network_utils
 from openstackclient.network.v2 import security_group_rule
 from openstackclient.tests.unit.compute.v2 import fakes as compute_fakes
@@ -48,6 +52,251 @@ class TestSecurityGroupRuleCompute(compute_fakes.TestComputev2):
         self.compute = self.app.client_manager.compute
 
 
+class TestApplySecurityGroupRuleNetwork(TestSecurityGroupRuleNetwork):
+
+    _security_group = \
+        network_fakes.FakeSecurityGroup.create_one_security_group()
+    _remote_group = \
+        network_fakes.FakeSecurityGroup.create_one_security_group()
+
+    # Kept: ssh from anywhere
+    _ssh_rule = \
+        network_fakes.FakeSecurityGroupRule.create_one_security_group_rule({
+            'port_range_min': 22,
+            'port_range_max': 22,
+            'security_group_id': _security_group.id,
+        })
+    # Deleted: not in the file
+    _http_rule = \
+        network_fakes.FakeSecurityGroupRule.create_one_security_group_rule({
+            'port_range_min': 80,
+            'port_range_max': 80,
+            'security_group_id': _security_group.id,
+        })
+
+    _rules_file = """
+rules:
+  - protocol: TCP
+    port_range_min: 22
+    port_range_max: 22
+  - protocol: icmp
+    remote_group: %s
+    description: ping
+""" % _remote_group.name
+
+    columns = (
+        'Action',
+        'ID',
+        'Direction',
+        'Ethertype',
+        'IP Protocol',
+        'Port Range',
+        'Remote IP Prefix',
+        'Remote Security Group',
+    )
+
+    def setUp(self):
+        super(TestApplySecurityGroupRuleNetwork, self).setUp()
+
+        self.network.find_security_group = mock.Mock(
+            side_effect=lambda name_or_id, ignore_missing: {
+                self._security_group.name: self._security_group,
+                self._remote_group.name: self._remote_group,
+            }[name_or_id])
+        self.network.security_group_rules = mock.Mock(
+            return_value=[self._ssh_rule, self._http_rule])
+        self.network.delete_security_group_rule = mock.Mock(
+            return_value=None)
+
+        self.bulk_create = self.useFixture(fixtures.MockPatchObject(
+            network_common, 'bulk_create',
+            return_value=[mock.Mock(id='new-rule-id')])).mock
+
+        self.path = os.path.join(
+            self.useFixture(fixtures.TempDir()).path, 'rules.yaml')
+        with open(self.path, 'w') as f:
+            f.write(self._rules_file)
+
+        # Get the command object to test
+        self.cmd = security_group_rule.ApplySecurityGroupRule(
+            self.app, self.namespace)
+
+    def _write_rules(self, rules_file):
+        with open(self.path, 'w') as f:
+            f.write(rules_file)
+
+    def test_apply_no_options(self):
+        self.assertRaises(tests_utils.ParserException, self.check_parser,
+                          self.cmd, [self._security_group.name], [])
+
+    def test_apply(self):
+        arglist = [
+            '--file', self.path,
+            self._security_group.name,
+        ]
+        verifylist = [
+            ('file', self.path),
+            ('group', self._security_group.name),
+            ('dry_run', False),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.bulk_create.assert_called_once_with(
+            self.network,
+            security_group_rule.sdk_secgroup_rule.SecurityGroupRule,
+            [{
+                'security_group_id': self._security_group.id,
+                'direction': 'ingress',
+                'ether_type': 'IPv4',
+                'protocol': 'icmp',
+                'remote_group_id': self._remote_group.id,
+                'description': 'ping',
+            }],
+        )
+        self.network.security_group_rules.assert_called_once_with(
+            limit=network_common.DEFAULT_PAGE_SIZE,
+            security_group_id=self._security_group.id,
+        )
+        self.network.delete_security_group_rule.assert_called_once_with(
+            self._http_rule.id, ignore_missing=False)
+        self.assertEqual(self.columns, columns)
+        self.assertEqual([
+            ('create', 'new-rule-id', 'ingress', 'IPv4', 'icmp', '',
+             None, self._remote_group.id),
+            ('delete', self._http_rule.id, 'ingress', 'IPv4', 'tcp',
+             '80:80', None, None),
+        ], data)
+
+    def test_apply_dry_run(self):
+        arglist = [
+            '--file', self.path,
+            '--dry-run',
+            self._security_group.name,
+        ]
+        verifylist = [
+            ('file', self.path),
+            ('group', self._security_group.name),
+            ('dry_run', True),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.bulk_create.assert_not_called()
+        self.network.delete_security_group_rule.assert_not_called()
+        self.assertEqual(['create', 'delete'], [row[0] for row in data])
+        self.assertEqual('', data[0][1])
+
+    def test_apply_unchanged(self):
+        self._write_rules("""
+- protocol: tcp
+  port_range_min: 22
+  port_range_max: 22
+  remote_ip_prefix: 0.0.0.0/0
+- protocol: tcp
+  port_range_min: 80
+  port_range_max: 80
+""")
+        arglist = [
+            '--file', self.path,
+            self._security_group.name,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.bulk_create.assert_called_once_with(
+            self.network,
+            security_group_rule.sdk_secgroup_rule.SecurityGroupRule,
+            [],
+        )
+        self.network.delete_security_group_rule.assert_not_called()
+        self.assertEqual([], data)
+
+    def test_apply_protocol_numbers(self):
+        # Neutron keeps the protocol as given, by name or number
+        create_rule = \
+            network_fakes.FakeSecurityGroupRule.create_one_security_group_rule
+        tcp_rule = create_rule({
+            'protocol': '6',
+            'port_range_min': 22,
+            'port_range_max': 22,
+            'security_group_id': self._security_group.id,
+        })
+        icmp_rule = create_rule({
+            'protocol': '58',
+            'ethertype': 'IPv6',
+            'port_range_min': None,
+            'port_range_max': None,
+            'security_group_id': self._security_group.id,
+        })
+        self.network.security_group_rules.return_value = [
+            tcp_rule, icmp_rule]
+        self._write_rules("""
+- protocol: tcp
+  ethertype: ipv4
+  port_range_min: 22
+  port_range_max: 22
+- protocol: ipv6-icmp
+""")
+        arglist = [
+            '--file', self.path,
+            self._security_group.name,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        columns, data = self.cmd.take_action(parsed_args)
+
+        self.bulk_create.assert_called_once_with(
+            self.network,
+            security_group_rule.sdk_secgroup_rule.SecurityGroupRule,
+            [],
+        )
+        self.network.delete_security_group_rule.assert_not_called()
+        self.assertEqual([], data)
+
+    def test_apply_unknown_key(self):
+        self._write_rules("- protocol: tcp\n  port: 22\n")
+        arglist = [
+            '--file', self.path,
+            self._security_group.name,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                          parsed_args)
+        self.bulk_create.assert_not_called()
+
+    def test_apply_invalid_port(self):
+        self._write_rules("- protocol: tcp\n  port_range_min: 22\n"
+                          "- protocol: tcp\n  port_range_min: ssh\n")
+        arglist = [
+            '--file', self.path,
+            self._security_group.name,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        e = self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                              parsed_args)
+        self.assertEqual(
+            'Rule 1 has an invalid port_range_min: ssh', str(e))
+        self.bulk_create.assert_not_called()
+
+    def test_apply_remote_ip_and_group(self):
+        self._write_rules(
+            "- remote_ip_prefix: 10.0.0.0/8\n  remote_group_id: sg\n")
+        arglist = [
+            '--file', self.path,
+            self._security_group.name,
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, [])
+
+        self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                          parsed_args)
+
+
 class TestCreateSecurityGroupRuleNetwork(TestSecurityGroupRuleNetwork):
 
     project = identity_fakes.FakeProject.create_one_project()
@@ -1069,8 +1318,10 @@ class TestListSecurityGroupRuleNetwork(TestSecurityGroupRuleNetwork):
         parsed_args = self.check_parser(self.cmd, [], [])
 
         columns, data = self.cmd.take_action(parsed_args)
+        data = list(data)
 
-        self.network.security_group_rules.assert_called_once_with(**{})
+        self.network.security_group_rules.assert_called_once_with(
+            limit=network_common.DEFAULT_PAGE_SIZE)
         self.assertEqual(self.expected_columns_no_group, columns)
         self.assertEqual(self.expected_data_no_group, list(data))
 
@@ -1087,10 +1338,14 @@ class TestListSecurityGroupRuleNetwork(TestSecurityGroupRuleNetwork):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         columns, data = self.cmd.take_action(parsed_args)
+        data = list(data)
 
-        self.network.security_group_rules.assert_called_once_with(**{
-            'security_group_id': self._security_group.id,
-        })
+        self.network.security_group_rules.assert_called_once_with(
+            limit=network_common.DEFAULT_PAGE_SIZE,
+            **{
+                'security_group_id': self._security_group.id,
+            }
+        )
         self.assertEqual(self.expected_columns_with_group_and_long, columns)
         self.assertEqual(self.expected_data_with_group_and_long, list(data))
 
@@ -1105,8 +1360,10 @@ class TestListSecurityGroupRuleNetwork(TestSecurityGroupRuleNetwork):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         columns, data = self.cmd.take_action(parsed_args)
+        data = list(data)
 
-        self.network.security_group_rules.assert_called_once_with(**{})
+        self.network.security_group_rules.assert_called_once_with(
+            limit=network_common.DEFAULT_PAGE_SIZE)
         self.assertEqual(self.expected_columns_no_group, columns)
         self.assertEqual(self.expected_data_no_group, list(data))
 
@@ -1121,10 +1378,14 @@ class TestListSecurityGroupRuleNetwork(TestSecurityGroupRuleNetwork):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         columns, data = self.cmd.take_action(parsed_args)
+        data = list(data)
 
-        self.network.security_group_rules.assert_called_once_with(**{
-            'protocol': 'tcp',
-        })
+        self.network.security_group_rules.assert_called_once_with(
+            limit=network_common.DEFAULT_PAGE_SIZE,
+            **{
+                'protocol': 'tcp',
+            }
+        )
         self.assertEqual(self.expected_columns_no_group, columns)
         self.assertEqual(self.expected_data_no_group, list(data))
 
@@ -1139,10 +1400,14 @@ class TestListSecurityGroupRuleNetwork(TestSecurityGroupRuleNetwork):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         columns, data = self.cmd.take_action(parsed_args)
+        data = list(data)
 
-        self.network.security_group_rules.assert_called_once_with(**{
-            'direction': 'ingress',
-        })
+        self.network.security_group_rules.assert_called_once_with(
+            limit=network_common.DEFAULT_PAGE_SIZE,
+            **{
+                'direction': 'ingress',
+            }
+        )
         self.assertEqual(self.expected_columns_no_group, columns)
         self.assertEqual(self.expected_data_no_group, list(data))
 
@@ -1157,10 +1422,14 @@ class TestListSecurityGroupRuleNetwork(TestSecurityGroupRuleNetwork):
         parsed_args = self.check_parser(self.cmd, arglist, verifylist)
 
         columns, data = self.cmd.take_action(parsed_args)
+        data = list(data)
 
-        self.network.security_group_rules.assert_called_once_with(**{
-            'direction': 'egress',
-        })
+        self.network.security_group_rules.assert_called_once_with(
+            limit=network_common.DEFAULT_PAGE_SIZE,
+            **{
+                'direction': 'egress',
+            }
+        )
         self.assertEqual(self.expected_columns_no_group, columns)
         self.assertEqual(self.expected_data_no_group, list(data))
 
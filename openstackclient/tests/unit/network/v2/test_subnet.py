@@ -17,6 +17,7 @@ from mock import call
 from osc_lib import exceptions
 from osc_lib import utils
 
+from openstackclient.network import common as network_common
 from openstackclient.network.v2 import subnet as subnet_v2
 from openstackclient.tests.unit.identity.v3 import fakes as identity_fakes_v3
 from openstackclient.tests.unit.network.v2 import fakes as network_fakes
@@ -245,6 +246,60 @@ class TestCreateSubnet(TestSubnet):
         self.assertEqual(self.columns, columns)
         self.assertEqual(self.data, data)
 
+    def test_create_count(self):
+        self.network.create_subnet = mock.Mock()
+        self._network.id = self._subnet_from_pool.network_id
+
+        arglist = [
+            "--subnet-pool", self._subnet_from_pool.subnetpool_id,
+            "--prefix-length", '24',
+            "--network", self._subnet_from_pool.network_id,
+            "--count", '2',
+            'pool-subnet',
+        ]
+        verifylist = [
+            ('name', 'pool-subnet'),
+            ('subnet_pool', self._subnet_from_pool.subnetpool_id),
+            ('count', 2),
+        ]
+
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+        with mock.patch.object(
+                network_common, 'bulk_create',
+                return_value=[self._subnet_from_pool] * 2) as bulk_create:
+            columns, data = self.cmd.take_action(parsed_args)
+
+        self.network.create_subnet.assert_not_called()
+        client, resource_type, attrs_list = bulk_create.call_args[0]
+        self.assertIs(subnet_v2.sdk_subnet.Subnet, resource_type)
+        self.assertEqual(['pool-subnet-1', 'pool-subnet-2'],
+                         [attrs['name'] for attrs in attrs_list])
+        self.assertEqual(
+            [self._subnet_from_pool.subnetpool_id] * 2,
+            [attrs['subnetpool_id'] for attrs in attrs_list])
+        self.assertEqual(self.columns, columns)
+        self.assertEqual(2, len(data))
+
+    def test_create_count_subnet_range(self):
+        self.network.create_subnet = mock.Mock()
+        arglist = [
+            "--subnet-range", self._subnet.cidr,
+            "--network", self._subnet.network_id,
+            "--count", '2',
+            self._subnet.name,
+        ]
+        verifylist = [
+            ('subnet_range', self._subnet.cidr),
+            ('count', 2),
+        ]
+        parsed_args = self.check_parser(self.cmd, arglist, verifylist)
+
+        with mock.patch.object(network_common, 'bulk_create') as bulk_create:
+            self.assertRaises(exceptions.CommandError, self.cmd.take_action,
+                              parsed_args)
+        bulk_create.assert_not_called()
+        self.network.create_subnet.assert_not_called()
+
     def test_create_from_subnet_pool_options(self):
         # Mock SDK calls for this test.
         self.network.create_subnet = \
@@ -13,10 +13,12 @@
 #   under the License.
 #
 
+import argparse
 import mock
 import os
 import sys
 
+from osc_lib import exceptions
 from osc_lib.tests import utils as osc_lib_test_utils
 from oslo_utils import importutils
 import wrapt
@@ -437,3 +439,102 @@ class TestShellArgV(TestShell):
             # When shell.main() gets sys.argv itself it should be decoded
             shell.main()
             self.assertEqual(type(u'x'), type(self.app.call_args[0][0][0]))
+
+
+class TestShellFanOut(TestShell):
+
+    def _final_defaults(self, region_name=None, cloud=None):
+        _shell = osc_lib_test_utils.make_shell(shell_class=self.shell_class)
+        _shell.options = argparse.Namespace(
+            cloud=cloud,
+            region_name=region_name,
+            url=None,
+            token=None,
+            default_domain='default',
+        )
+        _shell._final_defaults()
+        return _shell
+
+    def test_single_region(self):
+        _shell = self._final_defaults(region_name='RegionOne')
+        self.assertEqual('RegionOne', _shell.options.region_name)
+        self.assertEqual([], _shell.region_names)
+
+    def test_region_list(self):
+        _shell = self._final_defaults(region_name='RegionOne, RegionTwo')
+        self.assertEqual('RegionOne', _shell.options.region_name)
+        self.assertEqual(['RegionOne', 'RegionTwo'], _shell.region_names)
+
+    def test_single_cloud(self):
+        _shell = self._final_defaults(cloud='megacloud')
+        self.assertEqual('megacloud', _shell.options.cloud)
+        self.assertEqual([], _shell.cloud_names)
+
+    def test_cloud_list(self):
+        _shell = self._final_defaults(cloud='megacloud,supercloud')
+        self.assertEqual('megacloud', _shell.options.cloud)
+        self.assertEqual(['megacloud', 'supercloud'], _shell.cloud_names)
+
+    def test_cloud_list_requires_lister(self):
+        _shell = self._final_defaults(cloud='megacloud,supercloud')
+        _shell.options.all_regions = False
+        _shell.options.all_clouds = False
+        cmd = mock.Mock(auth_required=True)
+        self.assertRaises(
+            exceptions.CommandError,
+            _shell.prepare_to_run_command,
+            cmd,
+        )
+
+    def test_cloud_list_timing_report(self):
+        _shell = self._final_defaults(cloud='megacloud,supercloud')
+        _shell.options.all_regions = False
+        _shell.options.all_clouds = False
+        _shell.options.timing_report = '-'
+        cmd = mock.Mock(auth_required=True)
+
+        with mock.patch.object(_shell, '_fan_out_clouds') as fan_out, \
+                mock.patch.object(_shell, '_profile_command') as profile:
+            _shell.prepare_to_run_command(cmd)
+
+        fan_out.assert_called_once_with(cmd)
+        profile.assert_called_once_with(cmd)
+
+    def test_cloud_list_timing(self):
+        _shell = self._final_defaults(cloud='megacloud,supercloud')
+        _shell.options.timing = True
+        _shell.options.timing_report = None
+        _shell.timing_data = []
+        _shell.client_manager = mock.Mock(session=None)
+        _shell.cloud_config = mock.Mock()
+        _shell.api_version = {}
+        cmd = mock.Mock(spec=['run'])
+
+        with mock.patch.object(
+                shell.clientmanager.ClientManager, 'isolated_class') as cls:
+            cls.return_value.side_effect = [
+                mock.Mock(**{'session.get_timings.return_value': [name]})
+                for name in ('megacloud', 'supercloud')
+            ]
+            for cloud in _shell.cloud_names:
+                _shell._get_cloud_client_manager(cmd, cloud)
+
+        with mock.patch.object(shell.timing, 'Timing') as timing_cmd:
+            _shell.clean_up(cmd, 0, None)
+
+        self.assertEqual(['megacloud', 'supercloud'], _shell.timing_data)
+        timing_cmd.return_value.run.assert_called_once_with(mock.ANY)
+
+    def test_clean_up_timing_report_on_error(self):
+        _shell = self._final_defaults()
+        _shell.options.timing = True
+        _shell.options.timing_report = '-'
+        _shell.client_manager = mock.Mock()
+        _shell.client_manager.session.get_timings.side_effect = \
+            AttributeError()
+
+        with mock.patch.object(_shell, '_write_timing_report') as write:
+            self.assertRaises(AttributeError, _shell.clean_up,
+                              mock.Mock(), 0, None)
+
+        write.assert_called_once_with()